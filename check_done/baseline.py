@@ -0,0 +1,128 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from check_done.output import ProjectItemCheckRecord
+from check_done.warning_checks import sentence_from_warning_reasons
+
+_BASELINE_FORMAT_VERSION = 1
+
+
+class WarningKey(NamedTuple):
+    """What identifies a warning across runs: the violated rule and the project item violating it."""
+
+    rule_id: str
+    project_item_key: str
+
+
+def project_item_key(repository_name: str, number: int) -> str:
+    return f"{repository_name}#{number}"
+
+
+def read_baseline(baseline_path: Path) -> set[WarningKey]:
+    with baseline_path.open(encoding="utf-8") as baseline_file:
+        baseline_map = json.load(baseline_file)
+    if not isinstance(baseline_map, dict) or baseline_map.get("version") != _BASELINE_FORMAT_VERSION:
+        raise ValueError(
+            f"Baseline must be a map with version {_BASELINE_FORMAT_VERSION}, "
+            f"which can be written with --update-baseline: {baseline_path}"
+        )
+    rule_ids = baseline_map["rule_ids"]
+    return {
+        WarningKey(rule_ids[rule_index], item_key)
+        for item_key, rule_indices in baseline_map["items"].items()
+        for rule_index in rule_indices
+    }
+
+
+def write_baseline(baseline_path: Path, warning_keys: set[WarningKey]):
+    """
+    Write the warnings indexed by project item, with each rule id stored only once, and one project item per line in
+    a stable order, so that changes to a baseline kept under version control are easy to review.
+    """
+    rule_ids = sorted({warning_key.rule_id for warning_key in warning_keys})
+    rule_id_to_index_map = {rule_id: rule_index for rule_index, rule_id in enumerate(rule_ids)}
+    item_key_to_rule_indices_map: dict[str, list[int]] = {}
+    for warning_key in warning_keys:
+        item_key_to_rule_indices_map.setdefault(warning_key.project_item_key, []).append(
+            rule_id_to_index_map[warning_key.rule_id]
+        )
+    item_lines = [
+        f"{json.dumps(item_key)}:{_compact_json(sorted(item_key_to_rule_indices_map[item_key]))}"
+        for item_key in sorted(item_key_to_rule_indices_map)
+    ]
+    baseline_path.parent.mkdir(parents=True, exist_ok=True)
+    with baseline_path.open("w", encoding="utf-8") as baseline_file:
+        baseline_file.write(
+            f'{{"version":{_BASELINE_FORMAT_VERSION},"rule_ids":{_compact_json(rule_ids)},"items":{{\n'
+            + ",\n".join(item_lines)
+            + "\n}}\n"
+        )
+
+
+class BaselineComparison:
+    """Compares the warnings of checked project items to the warnings in a baseline, as they are checked."""
+
+    def __init__(self, baseline_warning_keys: set[WarningKey]):
+        self.baseline_warning_keys = baseline_warning_keys
+        self.current_warning_keys: set[WarningKey] = set()
+        self.new_warning_count = 0
+
+    def new_project_item_check_records(
+        self, project_item_check_records: Iterable[ProjectItemCheckRecord]
+    ) -> Iterator[ProjectItemCheckRecord]:
+        """The records with warnings not in the baseline, reduced to only these warnings."""
+        for project_item_check_record in project_item_check_records:
+            item_key = project_item_key(project_item_check_record.repository, project_item_check_record.number)
+            new_rule_ids = []
+            new_warning_reasons = []
+            for rule_id, warning_reason in zip(
+                project_item_check_record.rule_ids, project_item_check_record.warning_reasons, strict=True
+            ):
+                warning_key = WarningKey(rule_id, item_key)
+                self.current_warning_keys.add(warning_key)
+                if warning_key not in self.baseline_warning_keys:
+                    new_rule_ids.append(rule_id)
+                    new_warning_reasons.append(warning_reason)
+            if len(new_rule_ids) >= 1:
+                self.new_warning_count += len(new_rule_ids)
+                yield project_item_check_record._replace(rule_ids=new_rule_ids, warning_reasons=new_warning_reasons)
+
+    def resolved_warning_keys(self) -> list[WarningKey]:
+        """The warnings in the baseline that were not found anymore, which is only complete after all checks."""
+        return sorted(self.baseline_warning_keys - self.current_warning_keys)
+
+
+def baseline_text_log_entries(
+    baseline_comparison: BaselineComparison, project_item_check_records: Iterable[ProjectItemCheckRecord]
+) -> Iterator[tuple[int, str]]:
+    """The log level and message for each new and each resolved warning, followed by a summary."""
+    for project_item_check_record in baseline_comparison.new_project_item_check_records(project_item_check_records):
+        yield (
+            logging.WARNING,
+            sentence_from_warning_reasons(
+                project_item_check_record.repository,
+                project_item_check_record.number,
+                project_item_check_record.title,
+                project_item_check_record.warning_reasons,
+            ),
+        )
+    resolved_warning_keys = baseline_comparison.resolved_warning_keys()
+    for resolved_warning_key in resolved_warning_keys:
+        yield (
+            logging.INFO,
+            f"Resolved since baseline: {resolved_warning_key.rule_id} - item: {resolved_warning_key.project_item_key}",
+        )
+    yield (
+        logging.INFO,
+        f"Found {baseline_comparison.new_warning_count} new and {len(resolved_warning_keys)} resolved warnings "
+        f"compared to the baseline with {len(baseline_comparison.baseline_warning_keys)} warnings.",
+    )
+
+
+def _compact_json(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
@@ -0,0 +1,188 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from check_done.config import ConfigurationInfo
+from check_done.info import ProjectMetadataInfo
+from check_done.warning_checks import TASK_CHECK_VERSION, has_uncompleted_tasks
+
+CACHE_FOLDER_ENVIRONMENT_VARIABLE_NAME = "CHECK_DONE_CACHE_FOLDER"
+PROJECT_METADATA_TIME_TO_LIVE_IN_SECONDS = 24 * 60 * 60
+_PROJECT_METADATA_CACHE_BASE_NAME = "project_metadata.json"
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_folder() -> Path:
+    environment_cache_folder = os.environ.get(CACHE_FOLDER_ENVIRONMENT_VARIABLE_NAME)
+    if environment_cache_folder:
+        return Path(environment_cache_folder)
+    cache_folder = os.environ.get("XDG_CACHE_HOME")
+    return (Path(cache_folder) if cache_folder else Path.home() / ".cache") / "check_done"
+
+
+def default_project_metadata_cache_path(cache_folder: Path | None = None) -> Path:
+    return (cache_folder or default_cache_folder()) / _PROJECT_METADATA_CACHE_BASE_NAME
+
+
+def project_metadata_cache_key(configuration_info: ConfigurationInfo) -> str:
+    owner_type = "organization" if configuration_info.is_project_owner_of_type_organization else "user"
+    project_status_names = configuration_info.project_status_name_to_check or "|".join(
+        configuration_info.project_status_rules or []
+    )
+    return (
+        f"{owner_type}/{configuration_info.project_owner_name}/{configuration_info.project_number}"
+        f"/{project_status_names}"
+    )
+
+
+class ProjectMetadataCache:
+    """
+    The metadata of projects on disk, so that runs can go straight to paging through the project items instead of
+    resolving the project id and project status options again. Entries expire after `time_to_live_in_seconds`.
+    """
+
+    def __init__(self, path: Path, time_to_live_in_seconds: float = PROJECT_METADATA_TIME_TO_LIVE_IN_SECONDS):
+        self.path = path
+        self.time_to_live_in_seconds = time_to_live_in_seconds
+
+    def project_metadata(self, key: str) -> ProjectMetadataInfo | None:
+        """The metadata cached for `key`, or `None` if there is none or it expired."""
+        entry_map = self._key_to_entry_map().get(key)
+        if not isinstance(entry_map, dict):
+            return None
+        cached_at = entry_map.get("cached_at")
+        if not isinstance(cached_at, int | float) or time.time() - cached_at > self.time_to_live_in_seconds:
+            logger.debug(f"Cached project metadata expired: {key}")
+            return None
+        try:
+            result = ProjectMetadataInfo(**entry_map.get("metadata", {}))
+        except ValidationError as error:
+            logger.debug(f"Ignoring invalid cached project metadata: {key}: {error}")
+            result = None
+        return result
+
+    def store(self, key: str, project_metadata: ProjectMetadataInfo):
+        self._update(key, {"cached_at": time.time(), "metadata": project_metadata.model_dump()})
+
+    def forget(self, key: str):
+        self._update(key, None)
+
+    def _key_to_entry_map(self) -> dict[str, Any]:
+        try:
+            with self.path.open(encoding="utf-8") as cache_file:
+                result = json.load(cache_file)
+        except FileNotFoundError:
+            result = {}
+        except (OSError, ValueError) as error:
+            logger.debug(f"Ignoring unreadable project metadata cache: {error}")
+            result = {}
+        return result if isinstance(result, dict) else {}
+
+    def _update(self, key: str, entry_map: dict[str, Any] | None):
+        key_to_entry_map = self._key_to_entry_map()
+        if entry_map is None:
+            if key_to_entry_map.pop(key, None) is None:
+                return
+        else:
+            key_to_entry_map[key] = entry_map
+        try:
+            _write_json_atomically(self.path, key_to_entry_map)
+        except OSError as error:
+            # NOTE: A check must not fail just because its results cannot be cached.
+            logger.warning(f"Cannot write project metadata cache, continuing without it: {error}")
+
+
+class TaskCheckMemo:
+    """
+    Whether the tasks of project items are uncompleted, remembered between runs by content id and a hash of the
+    HTML body, so that only the bodies that changed since the previous run need to be parsed. Parsing is by far the
+    most expensive part of checking a project item, while hashing the body takes only a fraction of that.
+
+    The memo is versioned with the checks, so that it starts empty once they change.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._content_id_to_body_hash_and_result_map: dict[str, list] = {}
+        self._used_content_id_to_body_hash_and_result_map: dict[str, list] = {}
+        self._has_changes = False
+        try:
+            with path.open(encoding="utf-8") as memo_file:
+                memo_map = json.load(memo_file)
+        except FileNotFoundError:
+            memo_map = {}
+        except (OSError, ValueError) as error:
+            logger.debug(f"Ignoring unreadable task check memo: {error}")
+            memo_map = {}
+        if isinstance(memo_map, dict) and memo_map.get("version") == TASK_CHECK_VERSION:
+            entries = memo_map.get("entries")
+            if isinstance(entries, dict):
+                self._content_id_to_body_hash_and_result_map = entries
+
+    def has_uncompleted_tasks(self, content_id: str | None, body_html: str | None) -> bool:
+        if content_id is None or body_html is None or "<input" not in body_html:
+            return has_uncompleted_tasks(body_html)  # Already fast without any parsing.
+        body_hash = hashlib.blake2b(body_html.encode("utf-8"), digest_size=16).hexdigest()
+        body_hash_and_result = self._content_id_to_body_hash_and_result_map.get(content_id)
+        if body_hash_and_result is None or body_hash_and_result[0] != body_hash:
+            body_hash_and_result = [body_hash, has_uncompleted_tasks(body_html)]
+            self._has_changes = True
+        self._used_content_id_to_body_hash_and_result_map[content_id] = body_hash_and_result
+        return body_hash_and_result[1]
+
+    def save(self, is_complete: bool):
+        """
+        Save the memo. After a complete scan, only project items checked in it are kept, so that the memo does not
+        grow with items that left the project status long ago.
+        """
+        if is_complete:
+            has_unused_entries = len(self._used_content_id_to_body_hash_and_result_map) != len(
+                self._content_id_to_body_hash_and_result_map
+            )
+            content_id_to_body_hash_and_result_map = self._used_content_id_to_body_hash_and_result_map
+        else:
+            has_unused_entries = False
+            content_id_to_body_hash_and_result_map = {
+                **self._content_id_to_body_hash_and_result_map,
+                **self._used_content_id_to_body_hash_and_result_map,
+            }
+        if not self._has_changes and not has_unused_entries:
+            return
+        try:
+            _write_json_atomically(
+                self.path, {"version": TASK_CHECK_VERSION, "entries": content_id_to_body_hash_and_result_map}
+            )
+        except OSError as error:
+            logger.warning(f"Cannot write task check memo, continuing without it: {error}")
+
+
+def default_task_check_memo_path(project_url: str, cache_folder: Path | None = None) -> Path:
+    project_url_hash = hashlib.sha256(project_url.encode("utf-8")).hexdigest()[:16]
+    return (cache_folder or default_cache_folder()) / f"task_checks-{project_url_hash}.json"
+
+
+def _write_json_atomically(path: Path, value: Any):
+    temporary_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # NOTE: Replace the file at once, so that concurrent runs never read a partially written file.
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=path.parent, prefix=f".{path.stem}-", delete=False
+        ) as temporary_file:
+            temporary_path = Path(temporary_file.name)
+            json.dump(value, temporary_file, separators=(",", ":"))
+        temporary_path.replace(path)
+    except OSError:
+        if temporary_path is not None:
+            temporary_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,187 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from check_done.cache import default_cache_folder
+from check_done.graphql import GraphQlQuery
+from check_done.info import GithubProjectItemType, StatusCheckRollupState
+from check_done.warning_checks import CompactProjectItem
+
+CHECKPOINT_FOLDER_ENVIRONMENT_VARIABLE_NAME = "CHECK_DONE_CHECKPOINT_FOLDER"
+_CHECKPOINT_FORMAT_VERSION = 1
+_COMPACT_PROJECT_ITEM_FIELD_NAMES = [field.name for field in dataclasses.fields(CompactProjectItem)]
+
+logger = logging.getLogger(__name__)
+
+
+def default_checkpoint_folder() -> Path:
+    environment_checkpoint_folder = os.environ.get(CHECKPOINT_FOLDER_ENVIRONMENT_VARIABLE_NAME)
+    return Path(environment_checkpoint_folder) if environment_checkpoint_folder else default_cache_folder()
+
+
+def default_checkpoint_path(project_url: str) -> Path:
+    project_url_hash = hashlib.sha256(project_url.encode("utf-8")).hexdigest()[:16]
+    return default_checkpoint_folder() / f"checkpoint-{project_url_hash}.jsonl"
+
+
+def checkpoint_key_map(
+    project_id: str,
+    project_status_option_id: str | Mapping[str, tuple[str, ...] | None],
+    query_name: str,
+    project_item_filter_key_map: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Everything a checkpoint depends on, so that scans only resume from checkpoints of the same project, project
+    status, query, and filter of project items. With several project statuses, these are the rule ids to check for
+    each of them.
+    """
+    result = {
+        "version": _CHECKPOINT_FORMAT_VERSION,
+        "project_id": project_id,
+        "project_status_option_id": (
+            project_status_option_id
+            if isinstance(project_status_option_id, str)
+            else {
+                option_id: list(rule_ids) if rule_ids is not None else None
+                for option_id, rule_ids in project_status_option_id.items()
+            }
+        ),
+        "query_hash": hashlib.sha256(GraphQlQuery.query_for(query_name).encode("utf-8")).hexdigest(),
+        "fields": _COMPACT_PROJECT_ITEM_FIELD_NAMES,
+    }
+    if project_item_filter_key_map is not None:
+        result["project_item_filter"] = project_item_filter_key_map
+    return result
+
+
+class ScanCheckpoint:
+    """
+    The progress of a scan of project items on disk: the key it belongs to, followed by a line for each page with its
+    end cursor and the done project items found in it. Lines are only ever appended, so the cost of a checkpoint does
+    not grow with the number of pages already scanned, and a line cut short by an interruption is simply ignored when
+    resuming.
+    """
+
+    def __init__(self, path: Path, key_map: dict[str, Any]):
+        self.path = path
+        self.key_map = key_map
+        self._checkpoint_file = None
+        self._is_broken = False
+        self._resumed_size = None
+
+    def resumed_end_cursor_and_project_items(self) -> tuple[str, list[CompactProjectItem]] | None:
+        """
+        The end cursor of the last checkpointed page and all done project items up to it, or `None` if there is no
+        checkpoint for the same key to resume from.
+        """
+        try:
+            checkpoint_lines = self.path.read_bytes().splitlines(keepends=True)
+        except FileNotFoundError:
+            logger.info("No checkpoint to resume from, scanning from the start.")
+            return None
+        except OSError as error:
+            logger.warning(f"Cannot read checkpoint, scanning from the start: {error}")
+            return None
+        if len(checkpoint_lines) == 0 or _json_map_or_none(checkpoint_lines[0]) != self.key_map:
+            logger.info("Checkpoint belongs to a different project, project status, or query, scanning from the start.")
+            return None
+        end_cursor = None
+        project_items = []
+        resumed_size = len(checkpoint_lines[0])
+        for page_line in checkpoint_lines[1:]:
+            page_map = _json_map_or_none(page_line)
+            if page_map is None:
+                break  # Written only partially when the scan was interrupted.
+            end_cursor = page_map["end_cursor"]
+            project_items.extend(
+                _compact_project_item_from_values(project_item_values) for project_item_values in page_map["items"]
+            )
+            resumed_size += len(page_line)
+        self._resumed_size = resumed_size
+        if end_cursor is None:
+            logger.info("Checkpoint has no complete page, scanning from the start.")
+            return None
+        logger.info(f"Resuming scan from checkpoint with {len(project_items)} done project items already found.")
+        return end_cursor, project_items
+
+    def start(self, is_resuming: bool = False):
+        """
+        Start a new checkpoint, or with `is_resuming` continue the one the scan was resumed from, after removing any
+        partially written page.
+        """
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if is_resuming:
+                assert self._resumed_size is not None, "resumed_end_cursor_and_project_items() must be called first"
+                self._checkpoint_file = self.path.open("r+", encoding="utf-8")
+                self._checkpoint_file.truncate(self._resumed_size)
+                self._checkpoint_file.seek(self._resumed_size)
+            else:
+                self._checkpoint_file = self.path.open("w", encoding="utf-8")
+                self._write_line(self.key_map)
+        except OSError as error:
+            self._disable(error)
+
+    def add_page(self, end_cursor: str, project_items: list[CompactProjectItem]):
+        if self._checkpoint_file is None:
+            return
+        try:
+            self._write_line(
+                {
+                    "end_cursor": end_cursor,
+                    "items": [dataclasses.astuple(project_item) for project_item in project_items],
+                }
+            )
+        except OSError as error:
+            self._disable(error)
+
+    def close(self, is_finished: bool):
+        """Close the checkpoint, and remove it if the scan is finished, so that there is nothing left to resume."""
+        if self._checkpoint_file is not None:
+            self._checkpoint_file.close()
+            self._checkpoint_file = None
+        if is_finished and not self._is_broken:
+            self.path.unlink(missing_ok=True)
+
+    def _write_line(self, line_map: dict[str, Any]):
+        self._checkpoint_file.write(json.dumps(line_map, separators=(",", ":")) + "\n")
+        self._checkpoint_file.flush()
+
+    def _disable(self, error: OSError):
+        # NOTE: A scan must not fail just because it cannot be resumed later on.
+        logger.warning(f"Cannot write checkpoint, continuing without it: {error}")
+        self._is_broken = True
+        if self._checkpoint_file is not None:
+            self._checkpoint_file.close()
+            self._checkpoint_file = None
+
+
+def _json_map_or_none(line: bytes) -> dict[str, Any] | None:
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        result = json.loads(line)
+    except ValueError:
+        result = None
+    return result if isinstance(result, dict) else None
+
+
+def _compact_project_item_from_values(project_item_values: list[Any]) -> CompactProjectItem:
+    project_item_map = dict(zip(_COMPACT_PROJECT_ITEM_FIELD_NAMES, project_item_values, strict=True))
+    project_item_map["typename"] = GithubProjectItemType(project_item_map["typename"])
+    project_item_map["repository_name"] = sys.intern(project_item_map["repository_name"])
+    if project_item_map["status_check_rollup_state"] is not None:
+        project_item_map["status_check_rollup_state"] = StatusCheckRollupState(
+            project_item_map["status_check_rollup_state"]
+        )
+    if project_item_map["checked_rule_ids"] is not None:
+        project_item_map["checked_rule_ids"] = tuple(project_item_map["checked_rule_ids"])
+    return CompactProjectItem(**project_item_map)
@@ -0,0 +1,205 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import asyncio
+import logging
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+from requests import Session
+
+from check_done.cache import (
+    ProjectMetadataCache,
+    TaskCheckMemo,
+    default_project_metadata_cache_path,
+    default_task_check_memo_path,
+)
+from check_done.config import ConfigurationInfo
+from check_done.done_project_items_info import (
+    done_project_items_of_projects,
+    github_auth_from_configuration_info,
+    iter_done_project_items_info,
+)
+from check_done.graphql import new_github_session
+from check_done.metrics import Metrics
+from check_done.output import ProjectItemCheckRecord, project_item_check_records
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectCheckResult(NamedTuple):
+    """The result of checking a project, with a record for each project item in the checked project status."""
+
+    project_url: str
+    project_item_check_records: list[ProjectItemCheckRecord]
+
+    @property
+    def warning_count(self) -> int:
+        return sum(
+            len(project_item_check_record.rule_ids) for project_item_check_record in self.project_item_check_records
+        )
+
+
+class CheckDoneClient:
+    """
+    Checks projects from within another application, keeping everything that can be reused between checks: a session
+    with its connection pool and access token for each project owner and authentication, and the cached project
+    metadata and task checks.
+
+    A client is thread safe, so a single one can be shared by all threads of an application, and checks of
+    different projects can run at the same time. All state is kept in the client, so separate clients do not affect
+    each other.
+
+    Projects to check can be passed as URL, which are then authenticated with the `personal_access_token` or the
+    `github_app_id` and `github_app_private_key` of the client, or as `ConfigurationInfo` with their own
+    authentication.
+    """
+
+    def __init__(
+        self,
+        personal_access_token: str | None = None,
+        github_app_id: str | None = None,
+        github_app_private_key: str | None = None,
+        cache_folder: Path | None = None,
+        is_caching: bool = True,
+        metrics: Metrics | None = None,
+    ):
+        self._authentication_map = {
+            name: value
+            for name, value in (
+                ("personal_access_token", personal_access_token),
+                ("github_app_id", github_app_id),
+                ("github_app_private_key", github_app_private_key),
+            )
+            if value is not None
+        }
+        self._cache_folder = cache_folder
+        self._is_caching = is_caching
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._authentication_key_to_session_map: dict[tuple[str | bool | tuple[str, ...] | None, ...], Session] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def check(
+        self, project: ConfigurationInfo | str, project_status_name_to_check: str | None = None
+    ) -> ProjectCheckResult:
+        """
+        Check the project items in the project status of `project`, which by default is the last one, or the one
+        matching `project_status_name_to_check` for a project passed as URL.
+        """
+        configuration_info = self._configuration_info(project, project_status_name_to_check)
+        project_metadata_cache = None
+        task_check_memo = None
+        if self._is_caching:
+            project_metadata_cache = ProjectMetadataCache(default_project_metadata_cache_path(self._cache_folder))
+            task_check_memo = TaskCheckMemo(
+                default_task_check_memo_path(configuration_info.project_url, self._cache_folder)
+            )
+        done_project_items = iter_done_project_items_info(
+            configuration_info,
+            self._metrics,
+            project_metadata_cache=project_metadata_cache,
+            task_check_memo=task_check_memo,
+            session=self._session(configuration_info),
+        )
+        result = ProjectCheckResult(
+            configuration_info.project_url,
+            list(project_item_check_records(configuration_info.project_url, done_project_items, self._metrics)),
+        )
+        return result
+
+    async def check_async(
+        self, project: ConfigurationInfo | str, project_status_name_to_check: str | None = None
+    ) -> ProjectCheckResult:
+        """Like `check`, but in a worker thread, so that the event loop can go on while the project is checked."""
+        return await asyncio.to_thread(self.check, project, project_status_name_to_check)
+
+    def check_all(
+        self, projects: Iterable[ConfigurationInfo | str], project_status_name_to_check: str | None = None
+    ) -> list[ProjectCheckResult]:
+        """
+        Check several projects in one run, with a result for each of them in the same order. Each issue or pull
+        request that is done in several of the projects, for example on a team board and a release board, is only
+        requested and checked once, and its warnings are reported for each of these projects.
+        """
+        configuration_infos = [self._configuration_info(project, project_status_name_to_check) for project in projects]
+        project_metadata_cache = None
+        task_check_memo = None
+        if self._is_caching:
+            project_metadata_cache = ProjectMetadataCache(default_project_metadata_cache_path(self._cache_folder))
+            # NOTE: The tasks are checked once for all projects, so remember them for this combination of projects.
+            task_check_memo = TaskCheckMemo(
+                default_task_check_memo_path(
+                    " ".join(sorted(configuration_info.project_url for configuration_info in configuration_infos)),
+                    self._cache_folder,
+                )
+            )
+        done_project_items_of_each_project = done_project_items_of_projects(
+            [(configuration_info, self._session(configuration_info)) for configuration_info in configuration_infos],
+            self._metrics,
+            project_metadata_cache,
+            task_check_memo,
+        )
+        done_project_item_to_project_item_check_record_map = {}
+        result = []
+        for configuration_info, done_project_items in zip(
+            configuration_infos, done_project_items_of_each_project, strict=True
+        ):
+            project_item_check_records_of_project = []
+            for done_project_item in done_project_items:
+                project_item_check_record = done_project_item_to_project_item_check_record_map.get(done_project_item)
+                if project_item_check_record is None:
+                    project_item_check_record = next(
+                        project_item_check_records(configuration_info.project_url, [done_project_item], self._metrics)
+                    )
+                    done_project_item_to_project_item_check_record_map[done_project_item] = project_item_check_record
+                project_item_check_records_of_project.append(
+                    project_item_check_record._replace(project=configuration_info.project_url)
+                )
+            result.append(ProjectCheckResult(configuration_info.project_url, project_item_check_records_of_project))
+        return result
+
+    async def check_all_async(
+        self, projects: Iterable[ConfigurationInfo | str], project_status_name_to_check: str | None = None
+    ) -> list[ProjectCheckResult]:
+        """Like `check_all`, but in a worker thread."""
+        return await asyncio.to_thread(self.check_all, list(projects), project_status_name_to_check)
+
+    def close(self):
+        with self._lock:
+            for session in self._authentication_key_to_session_map.values():
+                session.close()
+            self._authentication_key_to_session_map.clear()
+
+    def _configuration_info(
+        self, project: ConfigurationInfo | str, project_status_name_to_check: str | None
+    ) -> ConfigurationInfo:
+        if isinstance(project, ConfigurationInfo):
+            return project
+        configuration_map = {"project_url": project, **self._authentication_map}
+        if project_status_name_to_check is not None:
+            configuration_map["project_status_name_to_check"] = project_status_name_to_check
+        return ConfigurationInfo(**configuration_map)
+
+    def _session(self, configuration_info: ConfigurationInfo) -> Session:
+        authentication_key = (
+            configuration_info.is_project_owner_of_type_organization,
+            configuration_info.project_owner_name,
+            configuration_info.personal_access_token,
+            configuration_info.github_app_id,
+            tuple(configuration_info.additional_personal_access_tokens or []),
+            tuple(github_app.github_app_id for github_app in configuration_info.additional_github_apps or []),
+        )
+        with self._lock:
+            result = self._authentication_key_to_session_map.get(authentication_key)
+            if result is None:
+                logger.debug(f"Creating session for {configuration_info.project_owner_name}")
+                result = new_github_session(github_auth_from_configuration_info(configuration_info, self._metrics))
+                self._authentication_key_to_session_map[authentication_key] = result
+        return result
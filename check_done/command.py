@@ -1,32 +1,63 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
 import argparse
+import json
 import logging
 import sys
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 import check_done
+from check_done.cache import (
+    ProjectMetadataCache,
+    TaskCheckMemo,
+    default_project_metadata_cache_path,
+    default_task_check_memo_path,
+)
+from check_done.checkpoint import default_checkpoint_path
 from check_done.config import (
     CONFIG_BASE_NAME,
+    ConfigurationInfo,
     default_config_path,
     map_from_yaml_file_path,
     validate_configuration_info_from_yaml_map,
 )
-from check_done.done_project_items_info import done_project_items_info
-from check_done.warning_checks import warnings_for_done_project_items
+from check_done.daemon_client import check_done_via_daemon, default_daemon_socket_path, is_daemon_supported
+from check_done.done_project_items_info import github_auth_from_configuration_info, iter_done_project_items_info
+from check_done.graphql import (
+    DEFAULT_CONNECT_TIMEOUT_IN_SECONDS,
+    DEFAULT_READ_TIMEOUT_IN_SECONDS,
+    RequestTimeouts,
+    new_github_session,
+)
+from check_done.metrics import Metrics, measured_run, started_metrics_http_server
+from check_done.output import (
+    OutputFormat,
+    ScanUntilDeadline,
+    WarningLimit,
+    project_item_check_records,
+    text_log_entries,
+    write_project_item_check_records,
+)
+from check_done.warning_checks import CompactProjectItem
 
 logger = logging.getLogger(__name__)
 
 _HELP_DESCRIPTION = (
     'Check that GitHub issues and pull requests in a project board with a status of "Done" are really done.'
 )
+_DAEMON_MODE = "daemon"
+_DEFAULT_WEBHOOK_PORT = 8080
+_EXIT_CODE_NEW_WARNINGS = 3
+_EXIT_CODE_MAX_WARNINGS_REACHED = 4
+_EXIT_CODE_DEADLINE_EXCEEDED = 5
+_SERVE_MODE = "serve"
 
 
 def check_done_command(arguments=None) -> int:
     result = 1
     try:
-        execute(arguments)
-        result = 0
+        result = execute(arguments)
     except KeyboardInterrupt:
         logger.error("Interrupted as requested by user.")  # noqa: TRY400
     except Exception:
@@ -34,25 +65,254 @@ def check_done_command(arguments=None) -> int:
     return result
 
 
-def execute(arguments=None):
+def execute(arguments=None) -> int:
     parser = _argument_parser()
     args = parser.parse_args(arguments)
-    configuration_yaml_path = args.config or default_config_path()
-    yaml_map = map_from_yaml_file_path(configuration_yaml_path)
-    configuration_info = validate_configuration_info_from_yaml_map(yaml_map)
-    done_project_items = done_project_items_info(configuration_info)
-    done_project_items_count = len(done_project_items)
-    if done_project_items_count == 0:
-        logger.info("Nothing to check. Project has no items in the selected project status.")
+    is_serve = args.mode == _SERVE_MODE
+    is_daemon = args.mode == _DAEMON_MODE
+    if args.watch is not None and args.watch <= 0:
+        parser.error(f"--watch must be a positive number of seconds but is: {args.watch:g}")
+    if args.watch is not None and args.mode is not None:
+        parser.error(f"--watch cannot be combined with {args.mode}")
+    is_long_running = args.watch is not None or is_serve
+    if args.format != OutputFormat.text and (is_long_running or is_daemon):
+        parser.error(f"--format {args.format} cannot be combined with --watch, {_SERVE_MODE}, or {_DAEMON_MODE}")
+    if args.resume and (is_long_running or is_daemon):
+        parser.error(f"--resume cannot be combined with --watch, {_SERVE_MODE}, or {_DAEMON_MODE}")
+    if args.baseline is not None and (is_long_running or is_daemon):
+        parser.error(f"--baseline cannot be combined with --watch, {_SERVE_MODE}, or {_DAEMON_MODE}")
+    if args.update_baseline and args.baseline is None:
+        parser.error("--update-baseline requires --baseline")
+    if args.dry_run and (is_long_running or is_daemon or args.resume or args.baseline is not None):
+        parser.error(
+            f"--dry-run cannot be combined with --baseline, --resume, --watch, {_SERVE_MODE}, or {_DAEMON_MODE}"
+        )
+    if args.max_warnings is not None and args.max_warnings <= 0:
+        parser.error(f"--max-warnings must be a positive number but is: {args.max_warnings}")
+    if args.max_warnings is not None and (
+        is_long_running or is_daemon or args.resume or args.baseline is not None or args.dry_run
+    ):
+        parser.error(
+            f"--fail-fast and --max-warnings cannot be combined with --baseline, --dry-run, --resume, --watch, "
+            f"{_SERVE_MODE}, or {_DAEMON_MODE}"
+        )
+    for option_name, seconds in (
+        ("--connect-timeout", args.connect_timeout),
+        ("--read-timeout", args.read_timeout),
+        ("--deadline", args.deadline),
+    ):
+        if seconds is not None and seconds <= 0:
+            parser.error(f"{option_name} must be a positive number of seconds but is: {seconds:g}")
+    has_request_timeouts = (
+        args.connect_timeout is not None or args.read_timeout is not None or args.deadline is not None
+    )
+    if has_request_timeouts and (is_long_running or is_daemon or args.dry_run):
+        parser.error(
+            f"--connect-timeout, --read-timeout, and --deadline cannot be combined with --dry-run, --watch, "
+            f"{_SERVE_MODE}, or {_DAEMON_MODE}"
+        )
+    if args.deadline is not None and args.baseline is not None:
+        parser.error("--deadline cannot be combined with --baseline")
+    if args.dry_run and args.format == OutputFormat.sarif:
+        parser.error(f"--dry-run cannot be combined with --format {OutputFormat.sarif}")
+    if args.metrics_port is not None and not is_long_running:
+        parser.error(f"--metrics-port requires --watch or {_SERVE_MODE}")
+    has_metrics = args.metrics_file is not None or args.metrics_port is not None
+    if has_metrics and is_daemon:
+        parser.error(f"--metrics-file and --metrics-port cannot be combined with {_DAEMON_MODE}")
+    metrics = Metrics() if has_metrics else None
+    result = 0
+    if is_daemon:
+        # NOTE: Import the daemon only when needed, like the other long-running modes below.
+        from check_done.daemon import run_daemon
+
+        run_daemon(args.socket)
+    elif not is_long_running:
+        # NOTE: The daemon neither checkpoints its scans, compares them to a baseline, estimates them, stops them
+        #  early, limits the time of their requests, nor can be told to resolve everything again without caches, so
+        #  these require checking without it.
+        is_daemon_possible = (
+            not has_metrics
+            and not args.no_cache
+            and not args.no_daemon
+            and not args.resume
+            and args.baseline is None
+            and not args.dry_run
+            and args.max_warnings is None
+            and not has_request_timeouts
+        )
+        if is_daemon_possible and _checked_via_daemon(args.config, args.format):
+            return result
+        with measured_run(metrics, args.metrics_file):
+            configuration_info = _configuration_info(args.config)
+            if args.dry_run:
+                _dry_run(configuration_info, args, metrics)
+                return result
+            # NOTE: A check stopped at a maximum of warnings is not meant to be continued, so it has no checkpoint.
+            checkpoint_path = (
+                default_checkpoint_path(configuration_info.project_url) if args.max_warnings is None else None
+            )
+            try:
+                result = _check_done(configuration_info, args, checkpoint_path, metrics)
+            except BaseException:
+                if checkpoint_path is not None and checkpoint_path.exists():
+                    logger.info("To continue from where the check stopped, run it again with --resume.")
+                raise
+            if result == _EXIT_CODE_DEADLINE_EXCEEDED and checkpoint_path is not None and checkpoint_path.exists():
+                logger.info("To continue from where the check stopped, run it again with --resume.")
     else:
-        warnings = warnings_for_done_project_items(done_project_items)
-        if len(warnings) == 0:
-            logger.info(
-                f"All project items are correct, {done_project_items_count!s} checked in the selected project status. "
+        configuration_info = _configuration_info(args.config)
+        metrics_server = (
+            started_metrics_http_server(metrics, args.metrics_port) if args.metrics_port is not None else None
+        )
+        try:
+            # NOTE: Import the long-running modes only when needed, so that single checks start faster.
+            if is_serve:
+                from check_done.serve import serve_webhooks
+
+                serve_webhooks(configuration_info, args.port, args.host, metrics)
+            else:
+                from check_done.watch import watch_done_project_items
+
+                watch_done_project_items(configuration_info, args.watch, metrics, args.metrics_file)
+        finally:
+            if metrics_server is not None:
+                metrics_server.shutdown()
+    return result
+
+
+def _checked_via_daemon(configuration_yaml_path: Path | None, output_format: OutputFormat) -> bool:
+    return is_daemon_supported() and check_done_via_daemon(
+        default_daemon_socket_path(), configuration_yaml_path or default_config_path(), output_format, sys.stdout
+    )
+
+
+def _configuration_info(configuration_yaml_path: Path | None) -> ConfigurationInfo:
+    yaml_map = map_from_yaml_file_path(configuration_yaml_path or default_config_path())
+    return validate_configuration_info_from_yaml_map(yaml_map)
+
+
+def _check_done(
+    configuration_info: ConfigurationInfo,
+    args: argparse.Namespace,
+    checkpoint_path: Path | None,
+    metrics: Metrics | None = None,
+) -> int:
+    project_metadata_cache = None
+    task_check_memo = None
+    if not args.no_cache:
+        project_metadata_cache = ProjectMetadataCache(default_project_metadata_cache_path())
+        task_check_memo = TaskCheckMemo(default_task_check_memo_path(configuration_info.project_url))
+    request_timeouts = RequestTimeouts(
+        args.connect_timeout or DEFAULT_CONNECT_TIMEOUT_IN_SECONDS,
+        args.read_timeout or DEFAULT_READ_TIMEOUT_IN_SECONDS,
+        args.deadline,
+    )
+    with new_github_session(
+        github_auth_from_configuration_info(configuration_info, metrics, request_timeouts), request_timeouts
+    ) as session:
+        done_project_items = iter_done_project_items_info(
+            configuration_info,
+            metrics,
+            checkpoint_path,
+            args.resume,
+            project_metadata_cache,
+            task_check_memo,
+            session,
+        )
+        if args.baseline is not None:
+            return _check_done_against_baseline(
+                configuration_info, done_project_items, args.baseline, args.update_baseline, args.format, metrics
             )
+        scan_until_deadline = ScanUntilDeadline(done_project_items) if args.deadline is not None else None
+        return _check_done_items(
+            configuration_info,
+            scan_until_deadline or done_project_items,
+            args,
+            scan_until_deadline,
+            metrics,
+        )
+
+
+def _check_done_items(
+    configuration_info: ConfigurationInfo,
+    done_project_items: Iterator[CompactProjectItem] | ScanUntilDeadline,
+    args: argparse.Namespace,
+    scan_until_deadline: ScanUntilDeadline | None = None,
+    metrics: Metrics | None = None,
+) -> int:
+    warning_limit = WarningLimit(args.max_warnings) if args.max_warnings is not None else None
+    try:
+        if args.format == OutputFormat.text:
+            for level, message in text_log_entries(done_project_items, metrics, warning_limit, scan_until_deadline):
+                logger.log(level, message)
         else:
-            for warning in warnings:
-                logger.warning(warning)
+            records = project_item_check_records(configuration_info.project_url, done_project_items, metrics)
+            if warning_limit is not None:
+                records = warning_limit.limited_project_item_check_records(records)
+            write_project_item_check_records(args.format, records, sys.stdout)
+    finally:
+        # NOTE: Closing the scan right away once the warning limit is reached cancels the requests of pages that
+        #  have not been sent yet, without waiting for the ones still in flight.
+        done_project_items.close()
+    if scan_until_deadline is not None and scan_until_deadline.is_deadline_exceeded:
+        if args.format != OutputFormat.text:
+            logger.warning(
+                "Stopped checking because the deadline of the run was exceeded, so the result is incomplete."
+            )
+        result = _EXIT_CODE_DEADLINE_EXCEEDED
+    elif warning_limit is not None and warning_limit.is_reached:
+        result = _EXIT_CODE_MAX_WARNINGS_REACHED
+    else:
+        result = 0
+    return result
+
+
+def _dry_run(configuration_info: ConfigurationInfo, args: argparse.Namespace, metrics: Metrics | None = None):
+    # NOTE: Import the dry run only when needed, like the long-running modes.
+    from check_done.dry_run import dry_run_estimate, dry_run_text_log_entries
+
+    project_metadata_cache = None if args.no_cache else ProjectMetadataCache(default_project_metadata_cache_path())
+    estimate = dry_run_estimate(configuration_info, metrics, project_metadata_cache)
+    if args.format == OutputFormat.text:
+        for level, message in dry_run_text_log_entries(estimate):
+            logger.log(level, message)
+    else:
+        sys.stdout.write(json.dumps(estimate._asdict()) + "\n")
+
+
+def _check_done_against_baseline(
+    configuration_info: ConfigurationInfo,
+    done_project_items: Iterable[CompactProjectItem],
+    baseline_path: Path,
+    is_updating_baseline: bool,
+    output_format: OutputFormat,
+    metrics: Metrics | None = None,
+) -> int:
+    # NOTE: Import the baseline only when needed, like the long-running modes.
+    from check_done.baseline import BaselineComparison, baseline_text_log_entries, read_baseline, write_baseline
+
+    if is_updating_baseline and not baseline_path.exists():
+        baseline_warning_keys = set()
+    else:
+        try:
+            baseline_warning_keys = read_baseline(baseline_path)
+        except FileNotFoundError:
+            raise ValueError(f"Cannot find baseline, use --update-baseline to create it: {baseline_path}") from None
+    baseline_comparison = BaselineComparison(baseline_warning_keys)
+    records = project_item_check_records(configuration_info.project_url, done_project_items, metrics)
+    if output_format == OutputFormat.text:
+        for level, message in baseline_text_log_entries(baseline_comparison, records):
+            logger.log(level, message)
+    else:
+        write_project_item_check_records(
+            output_format, baseline_comparison.new_project_item_check_records(records), sys.stdout
+        )
+    if is_updating_baseline:
+        write_baseline(baseline_path, baseline_comparison.current_warning_keys)
+        logger.info(f"Updated baseline with {len(baseline_comparison.current_warning_keys)} warnings: {baseline_path}")
+        return 0
+    return _EXIT_CODE_NEW_WARNINGS if baseline_comparison.new_warning_count >= 1 else 0
 
 
 def _argument_parser():
@@ -66,7 +326,163 @@ def _argument_parser():
             f"default: {CONFIG_BASE_NAME}.yaml in the current working directory or any of the above."
         ),
     )
+    parser.add_argument(
+        "--format",
+        "-f",
+        type=OutputFormat,
+        choices=list(OutputFormat),
+        default=OutputFormat.text,
+        help=(
+            "Format of the result: text logs the warnings as sentences; json and jsonl write a record for each checked "
+            "project item, and sarif a result for each violated rule, to the standard output as soon as the project "
+            "item is checked; default: %(default)s."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        help=(
+            "Path to a file to write Prometheus text format metrics about the run to, "
+            "for example for the textfile collector of the node exporter."
+        ),
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help=f"Local port to serve Prometheus text format metrics on; requires --watch or {_SERVE_MODE}.",
+    )
+    parser.add_argument(
+        "--watch",
+        metavar="INTERVAL",
+        type=float,
+        help=(
+            "Keep checking every INTERVAL seconds until interrupted, "
+            "and only report warnings that appeared or were resolved since the previous check."
+        ),
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        type=Path,
+        help=(
+            "Only report warnings that are not in the baseline FILE, and log the warnings in it that were resolved. "
+            f"If there are new warnings, the exit code is {_EXIT_CODE_NEW_WARNINGS}."
+        ),
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the warnings found in the baseline FILE, so that later checks only report new warnings.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help=(
+            "Only resolve the project and estimate the pages, rate limit points, and time a check would need, "
+            "without requesting the content of any project item; with --format json or jsonl, write the estimate as "
+            "JSON."
+        ),
+    )
+    parser.add_argument(
+        "--max-warnings",
+        metavar="N",
+        type=int,
+        help=(
+            "Stop checking once N warnings were found, without requesting the remaining pages of project items, and "
+            f"exit with code {_EXIT_CODE_MAX_WARNINGS_REACHED}; for example to only find out whether a project has "
+            "warnings at all."
+        ),
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_const",
+        const=1,
+        dest="max_warnings",
+        help="Stop checking at the first warning; same as --max-warnings 1.",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        metavar="SECONDS",
+        type=float,
+        help=(
+            "Maximum time to wait for a connection to GitHub for each request; "
+            f"default: {DEFAULT_CONNECT_TIMEOUT_IN_SECONDS:g}."
+        ),
+    )
+    parser.add_argument(
+        "--read-timeout",
+        metavar="SECONDS",
+        type=float,
+        help=(
+            "Maximum time to wait for GitHub to send more of a response for each request; "
+            f"default: {DEFAULT_READ_TIMEOUT_IN_SECONDS:g}."
+        ),
+    )
+    parser.add_argument(
+        "--deadline",
+        metavar="SECONDS",
+        type=float,
+        help=(
+            "Stop sending requests after SECONDS for the whole check, report the project items checked so far, and "
+            f"exit with code {_EXIT_CODE_DEADLINE_EXCEEDED}."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Continue from where an interrupted or failed check stopped instead of starting over, provided the "
+            "project, its project status, and the query did not change in the meantime. Without a checkpoint to "
+            "continue from, check from the start."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Resolve the project and its project status options from GitHub, and check the tasks of all project items, "
+            "instead of using cached details and results."
+        ),
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help=f"Check on its own even if a daemon started with {_DAEMON_MODE} is running.",
+    )
     parser.add_argument("--version", "-v", action="version", version="%(prog)s " + check_done.__version__)
+    subparsers = parser.add_subparsers(dest="mode", metavar="MODE")
+    daemon_parser = subparsers.add_parser(
+        _DAEMON_MODE,
+        help="keep running in the background to make later checks start faster",
+        description=(
+            "Keep the configuration, connections, and authentication of checked projects between checks, and check "
+            "on behalf of later invocations of check_done that find the daemon on its socket."
+        ),
+    )
+    daemon_parser.add_argument(
+        "--socket",
+        type=Path,
+        help=(
+            "Path of the Unix domain socket to listen on; default: the environment variable CHECK_DONE_DAEMON_SOCKET, "
+            "or check_done.sock in XDG_RUNTIME_DIR, or a socket for the current user in the temporary folder. "
+            "Later invocations of check_done look for the daemon in the default path."
+        ),
+    )
+    serve_parser = subparsers.add_parser(
+        _SERVE_MODE,
+        help="receive GitHub webhooks and re-check only the affected project items",
+        description=(
+            "Check all project items once, and then receive GitHub webhooks for the events projects_v2_item, issues, "
+            "and pull_request to re-check only the affected project items. "
+            "Requires a webhook_secret in the configuration."
+        ),
+    )
+    serve_parser.add_argument(
+        "--host", default="127.0.0.1", help="Host name or address to receive webhooks on; default: %(default)s."
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=_DEFAULT_WEBHOOK_PORT, help="Port to receive webhooks on; default: %(default)s."
+    )
     return parser
 
 
@@ -12,6 +12,9 @@ from dotenv import load_dotenv
 from pydantic import Field, field_validator, model_validator
 from pydantic.dataclasses import dataclass
 
+from check_done.info import GithubProjectItemType
+from check_done.warning_checks import POSSIBLE_RULE_IDS
+
 load_dotenv()
 
 CONFIG_BASE_NAME = ".check_done"
@@ -28,6 +31,16 @@ class ProjectOwnerType(StrEnum):
     Organization = "orgs"
 
 
+@dataclass
+class GithubAppConfigurationInfo:
+    github_app_id: str
+    github_app_private_key: str
+
+    @field_validator("github_app_id", "github_app_private_key", mode="before")
+    def value_from_env(cls, value: Any | None):
+        return value_from_environment(value)
+
+
 @dataclass
 class ConfigurationInfo:
     project_url: str
@@ -39,8 +52,22 @@ class ConfigurationInfo:
     github_app_id: str | None = None
     github_app_private_key: str | None = None
 
+    # Optional, to spread the requests across several credentials with their own rate limits
+    additional_personal_access_tokens: list[str] | None = None
+    additional_github_apps: list[GithubAppConfigurationInfo] | None = None
+
     # Optional
     project_status_name_to_check: str | None = None
+    # Rule ids to check for each project status name, or None to check all rules
+    project_status_rules: dict[str, list[str] | None] | None = None
+    # Repositories and types of project items to check, or None for all of them
+    repository_names_to_include: list[str] | None = None
+    repository_names_to_exclude: list[str] | None = None
+    project_item_types_to_include: list[GithubProjectItemType] | None = None
+    project_item_types_to_exclude: list[GithubProjectItemType] | None = None
+
+    # Required for `check_done serve`
+    webhook_secret: str | None = None
 
     # Fields computed during initialization
     is_project_owner_of_type_organization: bool = Field(init=False)
@@ -53,16 +80,15 @@ class ConfigurationInfo:
         "personal_access_token",
         "github_app_id",
         "github_app_private_key",
+        "webhook_secret",
         mode="before",
     )
     def value_from_env(cls, value: Any | None):
-        stripped_value = value.strip()
-        result = (
-            resolved_environment_variables(value, fail_on_missing_envvar=False)
-            if stripped_value.startswith("${") and stripped_value.endswith("}")
-            else stripped_value
-        )
-        return result
+        return value_from_environment(value)
+
+    @field_validator("additional_personal_access_tokens", mode="before")
+    def values_from_env(cls, values: Any | None):
+        return [value_from_environment(value) for value in values] if isinstance(values, list) else values
 
     @model_validator(mode="after")
     def validate_authentication_and_set_project_details(self):
@@ -82,6 +108,28 @@ class ConfigurationInfo:
         )
         if not has_user_authentication ^ has_organizational_authentication:
             raise ValueError("A user or an organization authentication method must be configured.")
+        if has_user_authentication and self.additional_github_apps is not None:
+            raise ValueError("Projects owned by a user cannot be authenticated with additional_github_apps.")
+        if has_organizational_authentication and self.additional_personal_access_tokens is not None:
+            raise ValueError(
+                "Projects owned by an organization cannot be authenticated with additional_personal_access_tokens."
+            )
+        return self
+
+    @model_validator(mode="after")
+    def validate_project_status_rules(self):
+        if self.project_status_rules is not None:
+            if self.project_status_name_to_check is not None:
+                raise ValueError("Only one of project_status_name_to_check and project_status_rules can be configured.")
+            if len(self.project_status_rules) == 0:
+                raise ValueError("project_status_rules must include at least one project status.")
+            for project_status_name, rule_ids in self.project_status_rules.items():
+                unknown_rule_ids = sorted(set(rule_ids or []) - set(POSSIBLE_RULE_IDS))
+                if len(unknown_rule_ids) >= 1:
+                    raise ValueError(
+                        f"Rule ids for project status {project_status_name!r} must be some of {POSSIBLE_RULE_IDS} "
+                        f"but also are: {unknown_rule_ids}"
+                    )
         return self
 
 
@@ -107,6 +155,16 @@ def github_project_owner_name_and_project_number_and_is_project_owner_of_type_or
     return project_owner_name, project_number, is_project_owner_of_type_organization
 
 
+def value_from_environment(value: Any | None):
+    stripped_value = value.strip()
+    result = (
+        resolved_environment_variables(value, fail_on_missing_envvar=False)
+        if stripped_value.startswith("${") and stripped_value.endswith("}")
+        else stripped_value
+    )
+    return result
+
+
 def resolved_environment_variables(value: str, fail_on_missing_envvar=True) -> str:
     try:
         result = string.Template(value).substitute(os.environ)
@@ -0,0 +1,143 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import logging
+import threading
+import time
+from functools import partial
+
+from requests import PreparedRequest, Response
+from requests.auth import AuthBase
+
+_RATE_LIMIT_REMAINING_HEADER = "X-RateLimit-Remaining"
+_RATE_LIMIT_RESET_HEADER = "X-RateLimit-Reset"
+_RETRY_AFTER_HEADER = "Retry-After"
+_RATE_LIMITED_STATUS_CODES = (403, 429)
+# NOTE: Secondary rate limits without a "Retry-After" header should be waited out for at least a minute.
+_DEFAULT_RETRY_AFTER_IN_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+class PooledCredential:
+    """
+    A credential in a `CredentialPoolAuth` with what is known about its rate limit: the points remaining, which are
+    unknown until the first response, and the time until which it cannot be used because it was rate limited.
+    """
+
+    def __init__(self, name: str, auth: AuthBase):
+        self.name = name
+        self.auth = auth
+        self.rate_limit_remaining_points: int | None = None
+        self.rate_limit_reset_time = 0.0
+        self.request_count = 0
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.rate_limit_reset_time or (
+            self.rate_limit_remaining_points is not None and self.rate_limit_remaining_points >= 1
+        )
+
+    def available_points(self, now: float) -> float:
+        """
+        The rate limit points that are probably still available, which are all of them for a credential that has not
+        been used yet or whose rate limit window has been reset.
+        """
+        if self.rate_limit_remaining_points is None or now >= self.rate_limit_reset_time:
+            return float("inf")
+        return self.rate_limit_remaining_points
+
+
+class CredentialPoolAuth(AuthBase):
+    """
+    Authentication with several credentials, each with its own rate limit, so that together they can request more
+    than a single one. Each request uses the credential with the most remaining rate limit points according to the
+    previous responses. If a response shows that a credential was rate limited, the same request is sent again with
+    the next available credential, if any.
+
+    Credentials of GitHub apps keep renewing their installation access tokens on their own, see
+    `OrganizationAccessTokenAuth`.
+    """
+
+    def __init__(self, name_and_auth_pairs: list[tuple[str, AuthBase]]):
+        assert len(name_and_auth_pairs) >= 1
+        self._credentials = [PooledCredential(name, auth) for name, auth in name_and_auth_pairs]
+        self._lock = threading.Lock()
+
+    @property
+    def credentials(self) -> list[PooledCredential]:
+        return self._credentials
+
+    def __call__(self, request: PreparedRequest) -> PreparedRequest:
+        credential = self._next_credential(time.time())
+        result = credential.auth(request)
+        result.register_hook("response", partial(self._handle_response, credential))
+        return result
+
+    def _next_credential(self, now: float) -> PooledCredential:
+        """
+        The credential with the most available points, or if all are rate limited, the one that is reset first. Of
+        credentials with the same points, for example before their first responses, the least used one is next.
+        """
+        with self._lock:
+            available_credentials = [credential for credential in self._credentials if credential.is_available(now)]
+            if len(available_credentials) >= 1:
+                result = max(
+                    available_credentials,
+                    key=lambda credential: (credential.available_points(now), -credential.request_count),
+                )
+                if result.rate_limit_remaining_points is not None and now < result.rate_limit_reset_time:
+                    # NOTE: Each request costs at least one point, so reserve it to spread parallel requests across
+                    #  the credentials until their responses tell the actual points remaining.
+                    result.rate_limit_remaining_points -= 1
+            else:
+                result = min(self._credentials, key=lambda credential: credential.rate_limit_reset_time)
+            result.request_count += 1
+        return result
+
+    def _handle_response(self, credential: PooledCredential, response: Response, **kwargs) -> Response:
+        now = time.time()
+        is_rate_limited = self._update_rate_limit(credential, response, now)
+        if not is_rate_limited:
+            return response
+        with self._lock:
+            has_other_available_credential = any(
+                other_credential.is_available(now) for other_credential in self._credentials
+            )
+        if not has_other_available_credential:
+            logger.warning(f"All {len(self._credentials)} credentials are rate limited.")
+            return response
+        next_credential = self._next_credential(now)
+        logger.info(f"Credential {credential.name} is rate limited, continuing with credential {next_credential.name}.")
+        # NOTE: This sends the request again on the same connection, like the digest authentication of requests does
+        #  after its first response. Because hooks only run for the first response, the response to the repeated
+        #  request is handled here too.
+        response.content  # noqa: B018
+        response.close()
+        retry_request = next_credential.auth(response.request.copy())
+        retry_response = response.connection.send(retry_request, **kwargs)
+        retry_response.history.append(response)
+        retry_response.request = retry_request
+        result = self._handle_response(next_credential, retry_response, **kwargs)
+        return result
+
+    def _update_rate_limit(self, credential: PooledCredential, response: Response, now: float) -> bool:
+        """Update what is known about the rate limit of `credential` from `response`, and whether it was exceeded."""
+        remaining_points_text = response.headers.get(_RATE_LIMIT_REMAINING_HEADER)
+        reset_time_text = response.headers.get(_RATE_LIMIT_RESET_HEADER)
+        retry_after_text = response.headers.get(_RETRY_AFTER_HEADER)
+        is_rate_limited = response.status_code in _RATE_LIMITED_STATUS_CODES and (
+            remaining_points_text == "0" or retry_after_text is not None
+        )
+        with self._lock:
+            if remaining_points_text is not None and reset_time_text is not None:
+                credential.rate_limit_remaining_points = int(remaining_points_text)
+                credential.rate_limit_reset_time = float(reset_time_text)
+            if is_rate_limited:
+                if retry_after_text is not None:
+                    rate_limit_reset_time = now + float(retry_after_text)
+                elif reset_time_text is not None:
+                    rate_limit_reset_time = credential.rate_limit_reset_time
+                else:
+                    rate_limit_reset_time = now + _DEFAULT_RETRY_AFTER_IN_SECONDS
+                credential.rate_limit_remaining_points = 0
+                credential.rate_limit_reset_time = max(credential.rate_limit_reset_time, rate_limit_reset_time)
+        return is_rate_limited
@@ -0,0 +1,213 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from requests import RequestException
+
+from check_done.config import ConfigurationInfo, map_from_yaml_file_path, validate_configuration_info_from_yaml_map
+from check_done.daemon_client import (
+    EVENT_ERROR,
+    EVENT_EXIT_CODE,
+    EVENT_LOG,
+    EVENT_OUTPUT,
+    DaemonError,
+    default_daemon_socket_path,
+    is_daemon_supported,
+)
+from check_done.done_project_items_info import (
+    ProjectMetadataResolver,
+    github_auth_from_configuration_info,
+    iter_project_items_in_project_status,
+    new_closing_issue_loader,
+    project_item_filter_from_configuration_info,
+)
+from check_done.graphql import GraphQlError, new_github_session
+from check_done.organization_authentication import AuthenticationError
+from check_done.output import (
+    OutputFormat,
+    project_item_check_records,
+    text_log_entries,
+    write_project_item_check_records,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _WarmProject:
+    """
+    Everything needed to check a project that can be kept between checks: the configuration, the session with its
+    connection pool and access token, and the metadata of the project.
+    """
+
+    def __init__(self, configuration_path: Path, modified_time: int):
+        self.configuration_path = configuration_path
+        self.modified_time = modified_time
+        self.lock = threading.Lock()
+        self.configuration_info: ConfigurationInfo = validate_configuration_info_from_yaml_map(
+            map_from_yaml_file_path(configuration_path)
+        )
+        self.session = new_github_session(github_auth_from_configuration_info(self.configuration_info))
+        self._project_metadata_resolver = None
+
+    def done_project_items(self):
+        # NOTE: The project status options might change on GitHub while the daemon runs, so the project metadata are
+        #  resolved again once a project item has an unknown one, and once they expired like cached ones.
+        if self._project_metadata_resolver is None or self._project_metadata_resolver.is_expired():
+            self._project_metadata_resolver = ProjectMetadataResolver(self.session, self.configuration_info)
+        return iter_project_items_in_project_status(
+            self.session,
+            self.configuration_info.project_owner_name,
+            self._project_metadata_resolver.project_metadata.project_id,
+            self._project_metadata_resolver.project_status_option_id_to_rule_ids_map,
+            project_status_option_id_for=self._project_metadata_resolver.project_status_option_id_to_rule_ids_map_for,
+            # NOTE: Use a new loader for each check, so that closing issues closed since the previous one are noticed.
+            closing_issue_loader=new_closing_issue_loader(self.session),
+            project_item_filter=project_item_filter_from_configuration_info(self.configuration_info),
+        )
+
+    def close(self):
+        self.session.close()
+
+
+class CheckDoneDaemon:
+    """Checks done project items on behalf of clients, keeping a warm project for each configuration file."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._configuration_path_to_warm_project_map: dict[Path, _WarmProject] = {}
+
+    def check_done(
+        self, configuration_path: Path, output_format: OutputFormat, send_event: Callable[[dict[str, Any]], None]
+    ):
+        warm_project = self._warm_project(configuration_path)
+        with warm_project.lock:
+            try:
+                done_project_items = warm_project.done_project_items()
+                if output_format == OutputFormat.text:
+                    for level, message in text_log_entries(done_project_items):
+                        send_event({EVENT_LOG: [level, message]})
+                else:
+                    records = project_item_check_records(
+                        warm_project.configuration_info.project_url, done_project_items
+                    )
+                    write_project_item_check_records(output_format, records, _EventOutput(send_event))
+            except (AuthenticationError, GraphQlError, RequestException):
+                # NOTE: The project or its status might have changed, so start from scratch with the next check.
+                self._forget_warm_project(warm_project)
+                raise
+
+    def close(self):
+        with self._lock:
+            for warm_project in self._configuration_path_to_warm_project_map.values():
+                warm_project.close()
+            self._configuration_path_to_warm_project_map.clear()
+
+    def _warm_project(self, configuration_path: Path) -> _WarmProject:
+        modified_time = configuration_path.stat().st_mtime_ns
+        with self._lock:
+            result = self._configuration_path_to_warm_project_map.get(configuration_path)
+            if result is None or result.modified_time != modified_time:
+                if result is not None:
+                    result.close()
+                result = _WarmProject(configuration_path, modified_time)
+                self._configuration_path_to_warm_project_map[configuration_path] = result
+        return result
+
+    def _forget_warm_project(self, warm_project: _WarmProject):
+        with self._lock:
+            if self._configuration_path_to_warm_project_map.get(warm_project.configuration_path) is warm_project:
+                del self._configuration_path_to_warm_project_map[warm_project.configuration_path]
+        warm_project.close()
+
+
+class _EventOutput(io.TextIOBase):
+    """Text output that is sent to the client as it is written."""
+
+    def __init__(self, send_event: Callable[[dict[str, Any]], None]):
+        super().__init__()
+        self._send_event = send_event
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text != "":
+            self._send_event({EVENT_OUTPUT: text})
+        return len(text)
+
+
+def started_daemon_server(check_done_daemon: CheckDoneDaemon, socket_path: Path) -> socketserver.BaseServer:
+    """Serve clients on the Unix socket in a background thread until `shutdown()` is called on the result."""
+
+    class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def send_event(event_map: dict[str, Any]):
+                self.wfile.write(json.dumps(event_map).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+            request_line = self.rfile.readline()
+            if request_line == b"":
+                return  # Just probing whether the daemon is listening.
+            try:
+                request_map = json.loads(request_line)
+                configuration_path = Path(request_map["config_path"])
+                output_format = OutputFormat(request_map["format"])
+                check_done_daemon.check_done(configuration_path, output_format, send_event)
+            except BrokenPipeError:
+                logger.info("Client disconnected before the check was finished.")
+            except Exception as error:
+                logger.exception("Cannot check done project items for client.")
+                send_event({EVENT_ERROR: str(error)})
+                send_event({EVENT_EXIT_CODE: 1})
+            else:
+                send_event({EVENT_EXIT_CODE: 0})
+
+    if socket_path.exists():
+        if _is_daemon_listening(socket_path):
+            raise DaemonError(f"A daemon is already listening on socket: {socket_path}")
+        socket_path.unlink()  # Left over from a daemon that did not shut down cleanly.
+    # NOTE: Only the current user may connect, because the daemon uses their credentials.
+    previous_umask = os.umask(0o177)
+    try:
+        result = socketserver.ThreadingUnixStreamServer(str(socket_path), _DaemonRequestHandler)
+    finally:
+        os.umask(previous_umask)
+    result.daemon_threads = True
+    threading.Thread(target=result.serve_forever, name="check_done_daemon", daemon=True).start()
+    logger.info(f"Daemon listening on socket: {socket_path}")
+    return result
+
+
+def run_daemon(socket_path: Path | None = None):
+    """Check done project items on behalf of clients until interrupted."""
+    if not is_daemon_supported():
+        raise DaemonError("The daemon requires Unix domain sockets, which are not available on this platform.")
+    if socket_path is None:
+        socket_path = default_daemon_socket_path()
+    check_done_daemon = CheckDoneDaemon()
+    daemon_server = started_daemon_server(check_done_daemon, socket_path)
+    try:
+        threading.Event().wait()
+    finally:
+        daemon_server.shutdown()
+        daemon_server.server_close()
+        socket_path.unlink(missing_ok=True)
+        check_done_daemon.close()
+
+
+def _is_daemon_listening(socket_path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe_socket:
+        try:
+            probe_socket.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
@@ -0,0 +1,82 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import json
+import logging
+import os
+import socket
+import tempfile
+from pathlib import Path
+from typing import TextIO
+
+from check_done.output import OutputFormat
+
+DAEMON_SOCKET_ENVIRONMENT_VARIABLE_NAME = "CHECK_DONE_DAEMON_SOCKET"
+_DAEMON_SOCKET_BASE_NAME = "check_done.sock"
+EVENT_ERROR = "error"
+EVENT_EXIT_CODE = "exit_code"
+EVENT_LOG = "log"
+EVENT_OUTPUT = "output"
+
+logger = logging.getLogger(__name__)
+
+
+class DaemonError(Exception):
+    """Error raised when the daemon could not check the done project items on behalf of a client."""
+
+
+def is_daemon_supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def default_daemon_socket_path() -> Path:
+    environment_socket_path = os.environ.get(DAEMON_SOCKET_ENVIRONMENT_VARIABLE_NAME)
+    if environment_socket_path:
+        return Path(environment_socket_path)
+    # NOTE: Unlike the temporary folder, the runtime folder is private to the user, if available.
+    runtime_folder = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_folder:
+        return Path(runtime_folder) / _DAEMON_SOCKET_BASE_NAME
+    return Path(tempfile.gettempdir()) / f"check_done-{os.getuid()}.sock"
+
+
+def check_done_via_daemon(
+    socket_path: Path, configuration_path: Path, output_format: OutputFormat, target: TextIO
+) -> bool:
+    """
+    Let the daemon listening on `socket_path` check the done project items, and stream its results: log entries to
+    the logger and output to `target`. The result is `False` if no daemon is listening, so the caller can check the
+    project items on its own.
+    """
+    if not is_daemon_supported() or not socket_path.exists():
+        return False
+    client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            client_socket.connect(str(socket_path))
+        except OSError:
+            logger.debug(f"Cannot connect to daemon, checking without it: {socket_path}")
+            return False
+        request_map = {"config_path": str(configuration_path.absolute()), "format": str(output_format)}
+        client_socket.sendall(json.dumps(request_map).encode("utf-8") + b"\n")
+        with client_socket.makefile("rb") as events_file:
+            exit_code = None
+            error_message = None
+            for event_line in events_file:
+                event_map = json.loads(event_line)
+                if EVENT_LOG in event_map:
+                    level, message = event_map[EVENT_LOG]
+                    logger.log(level, message)
+                elif EVENT_OUTPUT in event_map:
+                    target.write(event_map[EVENT_OUTPUT])
+                    target.flush()
+                elif EVENT_ERROR in event_map:
+                    error_message = event_map[EVENT_ERROR]
+                elif EVENT_EXIT_CODE in event_map:
+                    exit_code = event_map[EVENT_EXIT_CODE]
+    finally:
+        client_socket.close()
+    if exit_code is None:
+        raise DaemonError(f"Daemon disconnected before the check was finished: {socket_path}")
+    if exit_code != 0:
+        raise DaemonError(f"Daemon cannot check done project items: {error_message}")
+    return True
@@ -1,68 +1,671 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
+import dataclasses
 import logging
+import time
+from collections.abc import Callable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
 
-import requests
+from requests import Session
+from requests.auth import AuthBase
 
-from check_done.config import ConfigurationInfo
-from check_done.graphql import GraphQlQuery, HttpBearerAuth, query_infos
+from check_done.cache import (
+    PROJECT_METADATA_TIME_TO_LIVE_IN_SECONDS,
+    ProjectMetadataCache,
+    TaskCheckMemo,
+    project_metadata_cache_key,
+)
+from check_done.checkpoint import ScanCheckpoint, checkpoint_key_map
+from check_done.config import ConfigurationInfo, GithubAppConfigurationInfo
+from check_done.credential_pool import CredentialPoolAuth
+from check_done.graphql import (
+    GraphQlError,
+    GraphQlQuery,
+    HttpBearerAuth,
+    NestedConnection,
+    NodeLoader,
+    RequestTimeouts,
+    complete_nested_connections,
+    new_github_session,
+    paginated_query_infos,
+    query_infos,
+    query_nodes_by_ids,
+)
 from check_done.info import (
+    ContentProjectItemNode,
+    GithubProjectItemType,
+    LinkedProjectItemInfo,
     NodeByIdInfo,
     ProjectItemInfo,
+    ProjectItemReferenceInfo,
+    ProjectMetadataInfo,
     ProjectOwnerInfo,
     ProjectV2ItemNode,
     ProjectV2Node,
     ProjectV2SingleSelectFieldNode,
 )
-from check_done.organization_authentication import resolve_organization_access_token
+from check_done.metrics import Metrics
+from check_done.organization_authentication import OrganizationAccessTokenAuth
+from check_done.warning_checks import CompactProjectItem, compact_project_item
 
 _GITHUB_PROJECT_STATUS_FIELD_NAME = "Status"
+_PROJECT_ITEM_TYPE_TO_GITHUB_PROJECT_ITEM_TYPE_MAP = {
+    "ISSUE": GithubProjectItemType.issue,
+    "PULL_REQUEST": GithubProjectItemType.pull_request,
+}
+# NOTE: The selection must match the one of the closing issues references in the project item queries.
+_CLOSING_ISSUES_REFERENCES_CONNECTION = NestedConnection(
+    type_name="PullRequest",
+    field_name="closingIssuesReferences",
+    node_selection="id number title",
+    attribute_name="closing_issues_references",
+    connection_model=LinkedProjectItemInfo,
+)
 logger = logging.getLogger(__name__)
 
 
-def done_project_items_info(configuration_info: ConfigurationInfo) -> list[ProjectItemInfo]:
-    project_owner_name = configuration_info.project_owner_name
+def done_project_items_info(
+    configuration_info: ConfigurationInfo,
+    metrics: Metrics | None = None,
+    checkpoint_path: Path | None = None,
+    is_resuming: bool = False,
+    project_metadata_cache: ProjectMetadataCache | None = None,
+    task_check_memo: TaskCheckMemo | None = None,
+) -> list[CompactProjectItem]:
+    result = list(
+        iter_done_project_items_info(
+            configuration_info, metrics, checkpoint_path, is_resuming, project_metadata_cache, task_check_memo
+        )
+    )
+    return result
 
-    is_project_owner_of_type_organization = configuration_info.is_project_owner_of_type_organization
-    if is_project_owner_of_type_organization:
-        github_app_id = configuration_info.github_app_id
-        github_app_private_key = configuration_info.github_app_private_key
-        access_token = resolve_organization_access_token(project_owner_name, github_app_id, github_app_private_key)
-    else:
-        access_token = configuration_info.personal_access_token
 
-    with requests.Session() as session:
-        session.headers = {"Accept": "application/vnd.github+json"}
-        session.auth = HttpBearerAuth(access_token)
+def iter_done_project_items_info(
+    configuration_info: ConfigurationInfo,
+    metrics: Metrics | None = None,
+    checkpoint_path: Path | None = None,
+    is_resuming: bool = False,
+    project_metadata_cache: ProjectMetadataCache | None = None,
+    task_check_memo: TaskCheckMemo | None = None,
+    session: Session | None = None,
+) -> Iterator[CompactProjectItem]:
+    """
+    The done project items, page by page as soon as each page of project items was received. Only the compact form of
+    each project item is kept, so the models of a page can be released once the next page is requested.
+
+    With a `checkpoint_path`, the progress is stored there after each page, and with `is_resuming` the scan continues
+    from the progress stored by an earlier scan that was interrupted, provided it is for the same project, project
+    status, and query.
+
+    With a `project_metadata_cache`, the project id and project status options are taken from there if possible, and
+    only resolved again once a project item has a project status option that is unknown to the cache.
+
+    With a `task_check_memo`, only the tasks of project items whose body changed since the previous scan are checked.
+
+    With repositories or project item types to include or exclude in the configuration, the project items of other
+    ones are skipped in the raw pages received, before any model is built for them.
+
+    With `project_status_rules` in the configuration, the project items of all configured project statuses are
+    collected in the same scan, each one to be checked only with the rules of its project status.
+
+    The states of the issues that done pull requests close are requested in batches, once per page.
+
+    With a `session`, its connections and authentication are used and it is kept open, so that it can be used for
+    later scans too. Otherwise, a new session is used just for this scan.
+    """
+    if session is None:
+        with new_github_session(github_auth_from_configuration_info(configuration_info, metrics)) as new_session:
+            yield from iter_done_project_items_info(
+                configuration_info,
+                metrics,
+                checkpoint_path,
+                is_resuming,
+                project_metadata_cache,
+                task_check_memo,
+                session=new_session,
+            )
+        return
+    project_metadata_resolver = ProjectMetadataResolver(session, configuration_info, metrics, project_metadata_cache)
+    initial_project_metadata = project_metadata_resolver.project_metadata
+    project_item_filter = project_item_filter_from_configuration_info(configuration_info)
+    checkpoint = (
+        ScanCheckpoint(
+            checkpoint_path,
+            checkpoint_key_map(
+                initial_project_metadata.project_id,
+                project_metadata_resolver.project_status_option_id_to_rule_ids_map,
+                GraphQlQuery.PROJECT_V2_ITEMS.name,
+                project_item_filter.key_map() if project_item_filter is not None else None,
+            ),
+        )
+        if checkpoint_path is not None
+        else None
+    )
+    try:
+        yield from iter_project_items_in_project_status(
+            session,
+            configuration_info.project_owner_name,
+            initial_project_metadata.project_id,
+            project_metadata_resolver.project_status_option_id_to_rule_ids_map,
+            metrics,
+            checkpoint,
+            is_resuming,
+            project_metadata_resolver.project_status_option_id_to_rule_ids_map_for,
+            task_check_memo,
+            new_closing_issue_loader(session, metrics),
+            project_item_filter,
+        )
+    except GraphQlError:
+        # NOTE: The cached project might not exist anymore, so resolve it again with the next check.
+        project_metadata_resolver.forget_cached()
+        raise
+
+
+def iter_project_items_in_project_status(
+    session: Session,
+    project_owner_name: str,
+    project_id: str,
+    project_status_option_id: str | Mapping[str, tuple[str, ...] | None],
+    metrics: Metrics | None = None,
+    checkpoint: ScanCheckpoint | None = None,
+    is_resuming: bool = False,
+    project_status_option_id_for: Callable[[set[str]], str | Mapping[str, tuple[str, ...] | None]] | None = None,
+    task_check_memo: TaskCheckMemo | None = None,
+    closing_issue_loader: NodeLoader | None = None,
+    project_item_filter: "ProjectItemFilter | None" = None,
+) -> Iterator[CompactProjectItem]:
+    """
+    The project items in the project status, page by page.
+
+    Instead of a single `project_status_option_id` to check with all rules, this can also be a lookup table with the
+    rule ids to check for each project status option id, as built by `project_status_option_id_to_rule_ids_map`. Each
+    project item in one of its project statuses is then found in the same pass, and checked only with its rules.
+
+    With a `closing_issue_loader`, the closing issues of all done project items in a page are requested together,
+    so that they can be checked for being closed too.
+
+    With a `project_item_filter`, project items it does not include are skipped before their models are built, and
+    the content of project item types it excludes is not even requested.
+
+    With `project_status_option_id_for`, the project status option id to check each page for is the result of calling
+    it with the project status option ids of the project items in the page, so that it can be updated if the page has
+    options that were unknown so far.
+    """
+    after = None
+    if checkpoint is not None:
+        if is_resuming:
+            resumed_end_cursor_and_project_items = checkpoint.resumed_end_cursor_and_project_items()
+            if resumed_end_cursor_and_project_items is not None:
+                after, resumed_project_items = resumed_end_cursor_and_project_items
+                yield from resumed_project_items
+        checkpoint.start(is_resuming=after is not None)
+    is_finished = False
+    try:
+        for page_query_info in paginated_query_infos(
+            NodeByIdInfo,
+            GraphQlQuery.PROJECT_V2_ITEMS.name,
+            session,
+            project_owner_name,
+            project_id,
+            metrics,
+            is_parallel=True,
+            after=after,
+            **project_item_filter_query_arguments(project_item_filter),
+        ):
+            if project_status_option_id_for is not None:
+                project_status_option_id = project_status_option_id_for(
+                    {
+                        project_item_info.field_value_by_name.option_id
+                        for project_item_info in page_query_info.nodes
+                        if project_item_info.field_value_by_name is not None
+                    }
+                )
+            done_project_item_infos_and_rule_ids = routed_project_item_infos_and_rule_ids(
+                page_query_info.nodes, project_status_option_id
+            )
+            done_project_item_infos = [
+                project_item_info for project_item_info, _ in done_project_item_infos_and_rule_ids
+            ]
+            complete_project_item_infos(session, done_project_item_infos, metrics)
+            closing_issue_id_to_is_closed_map = loaded_closing_issue_id_to_is_closed_map(
+                done_project_item_infos, closing_issue_loader
+            )
+            done_project_items = [
+                compact_project_item(project_item_info, task_check_memo, closing_issue_id_to_is_closed_map, rule_ids)
+                for project_item_info, rule_ids in done_project_item_infos_and_rule_ids
+            ]
+            if checkpoint is not None:
+                checkpoint.add_page(page_query_info.page_info.endCursor, done_project_items)
+            yield from done_project_items
+        is_finished = True
+    finally:
+        if checkpoint is not None:
+            checkpoint.close(is_finished)
+        if task_check_memo is not None:
+            # NOTE: Resumed project items were not checked with the memo, so keep their entries too.
+            task_check_memo.save(is_complete=is_finished and after is None)
+
+
+def done_project_items_of_projects(
+    configuration_info_and_session_pairs: list[tuple[ConfigurationInfo, Session]],
+    metrics: Metrics | None = None,
+    project_metadata_cache: ProjectMetadataCache | None = None,
+    task_check_memo: TaskCheckMemo | None = None,
+) -> list[list[CompactProjectItem]]:
+    """
+    The done project items of several projects, in the same order as the projects. Issues and pull requests are
+    often part of several projects, so only references to them are requested for each project, and the content of
+    each issue or pull request in one of the project statuses to check is requested and compacted only once, even
+    if it is done in several projects. Project items of the same issue or pull request are then the same
+    `CompactProjectItem`, unless their projects check them with different rules.
 
-        project_query_name = (
-            GraphQlQuery.ORGANIZATION_PROJECTS.name
-            if is_project_owner_of_type_organization
-            else GraphQlQuery.USER_PROJECTS.name
+    Content is requested with the session of the first project that has it, and only shared between projects with
+    the same session, because other sessions might not be allowed to see it.
+    """
+    # NOTE: The content of a project item is identified by its session and its id, which is the same in all projects.
+    done_project_item_key_and_rule_ids_pairs_of_projects = []
+    session_to_content_id_to_project_item_id_map: dict[Session, dict[str, str]] = {}
+    for configuration_info, session in configuration_info_and_session_pairs:
+        content_id_to_project_item_id_map = session_to_content_id_to_project_item_id_map.setdefault(session, {})
+        done_project_item_key_and_rule_ids_pairs = []
+        for project_item_reference_info, rule_ids in _done_project_item_reference_infos_and_rule_ids(
+            configuration_info, session, metrics, project_metadata_cache
+        ):
+            content_id = project_item_reference_info.content.id
+            content_id_to_project_item_id_map.setdefault(content_id, project_item_reference_info.id)
+            done_project_item_key_and_rule_ids_pairs.append(((session, content_id), rule_ids))
+        done_project_item_key_and_rule_ids_pairs_of_projects.append(done_project_item_key_and_rule_ids_pairs)
+    done_project_item_key_to_done_project_item_map: dict[tuple[Session, str], CompactProjectItem] = {}
+    for session, content_id_to_project_item_id_map in session_to_content_id_to_project_item_id_map.items():
+        content_infos = [
+            project_item_info.content
+            for project_item_info in query_nodes_by_ids(
+                GraphQlQuery.PROJECT_V2_ITEMS_BY_IDS.name,
+                session,
+                list(content_id_to_project_item_id_map.values()),
+                metrics,
+            )
+            if isinstance(project_item_info.content, ProjectItemInfo)
+        ]
+        complete_project_item_infos(session, content_infos, metrics)
+        closing_issue_id_to_is_closed_map = loaded_closing_issue_id_to_is_closed_map(
+            content_infos, new_closing_issue_loader(session, metrics)
         )
-        project_infos = query_infos(ProjectOwnerInfo, project_query_name, session, project_owner_name)
+        for content_info in content_infos:
+            done_project_item_key_to_done_project_item_map[session, content_info.id] = compact_project_item(
+                content_info, task_check_memo, closing_issue_id_to_is_closed_map
+            )
+    if task_check_memo is not None:
+        task_check_memo.save(is_complete=True)
+    result = [
+        [
+            done_project_item if rule_ids is None else dataclasses.replace(done_project_item, checked_rule_ids=rule_ids)
+            for done_project_item_key, rule_ids in done_project_item_key_and_rule_ids_pairs
+            # NOTE: Project items whose content was deleted in the meantime are skipped.
+            if (done_project_item := done_project_item_key_to_done_project_item_map.get(done_project_item_key))
+            is not None
+        ]
+        for done_project_item_key_and_rule_ids_pairs in done_project_item_key_and_rule_ids_pairs_of_projects
+    ]
+    return result
+
 
-        project_number = configuration_info.project_number
-        project_id = matching_project_id(project_infos, project_number, project_owner_name)
-        project_single_select_field_infos = query_infos(
-            NodeByIdInfo, GraphQlQuery.PROJECT_SINGLE_SELECT_FIELDS.name, session, project_owner_name, project_id
+def _done_project_item_reference_infos_and_rule_ids(
+    configuration_info: ConfigurationInfo,
+    session: Session,
+    metrics: Metrics | None = None,
+    project_metadata_cache: ProjectMetadataCache | None = None,
+) -> list[tuple[ProjectV2ItemNode, tuple[str, ...] | None]]:
+    """
+    The references to the project items of a project in one of its project statuses to check, each with the rule ids
+    to check it with.
+    """
+    project_metadata_resolver = ProjectMetadataResolver(session, configuration_info, metrics, project_metadata_cache)
+    project_item_filter = project_item_filter_from_configuration_info(configuration_info)
+    try:
+        project_item_reference_infos = [
+            project_item_reference_info
+            for page_query_info in paginated_query_infos(
+                NodeByIdInfo,
+                GraphQlQuery.PROJECT_V2_ITEM_REFERENCES.name,
+                session,
+                configuration_info.project_owner_name,
+                project_metadata_resolver.project_metadata.project_id,
+                metrics,
+                is_parallel=True,
+                **project_item_filter_query_arguments(project_item_filter),
+            )
+            for project_item_reference_info in page_query_info.nodes
+        ]
+    except GraphQlError:
+        project_metadata_resolver.forget_cached()
+        raise
+    project_status_option_id_to_rule_ids_map = project_metadata_resolver.project_status_option_id_to_rule_ids_map_for(
+        {
+            project_item_reference_info.field_value_by_name.option_id
+            for project_item_reference_info in project_item_reference_infos
+            if project_item_reference_info.field_value_by_name is not None
+        }
+    )
+    result = [
+        (
+            project_item_reference_info,
+            project_status_option_id_to_rule_ids_map[project_item_reference_info.field_value_by_name.option_id],
         )
+        for project_item_reference_info in project_item_reference_infos
+        if isinstance(project_item_reference_info.content, ProjectItemReferenceInfo)
+        and is_project_item_in_project_status(project_item_reference_info, project_status_option_id_to_rule_ids_map)
+    ]
+    return result
+
+
+def complete_project_item_infos(
+    session: Session, project_item_infos: list[ProjectItemInfo], metrics: Metrics | None = None
+):
+    """
+    Add the entries of connections in the project items that did not fit into the first page requested with them,
+    for example of pull requests closing many issues.
+    """
+    complete_nested_connections(session, project_item_infos, _CLOSING_ISSUES_REFERENCES_CONNECTION, metrics)
+
 
-        project_item_infos = query_infos(
-            NodeByIdInfo, GraphQlQuery.PROJECT_V2_ITEMS.name, session, project_owner_name, project_id
+def new_closing_issue_loader(session: Session, metrics: Metrics | None = None) -> NodeLoader:
+    return NodeLoader(GraphQlQuery.CLOSING_ISSUES_BY_IDS.name, session, metrics)
+
+
+def loaded_closing_issue_id_to_is_closed_map(
+    project_item_infos: list[ProjectItemInfo], closing_issue_loader: NodeLoader | None
+) -> dict[str, bool] | None:
+    """
+    Whether the issues referenced as closing by the project items are closed, by issue id, or `None` without a
+    `closing_issue_loader`.
+    """
+    if closing_issue_loader is None:
+        return None
+    closing_issue_ids = [
+        closing_issue.id
+        for project_item_info in project_item_infos
+        if project_item_info.closing_issues_references is not None
+        for closing_issue in project_item_info.closing_issues_references.nodes
+        if closing_issue.id is not None
+    ]
+    result = {
+        closing_issue_id: closing_issue.closed
+        for closing_issue_id, closing_issue in closing_issue_loader.node_id_to_node_map(closing_issue_ids).items()
+        if closing_issue is not None
+    }
+    return result
+
+
+class ProjectItemFilter:
+    """The repositories and types of project items to check, which can be applied before their models are built."""
+
+    def __init__(
+        self,
+        repository_names_to_include: list[str] | None = None,
+        repository_names_to_exclude: list[str] | None = None,
+        project_item_types_to_include: list[GithubProjectItemType] | None = None,
+        project_item_types_to_exclude: list[GithubProjectItemType] | None = None,
+    ):
+        self.repository_names_to_include = (
+            set(repository_names_to_include) if repository_names_to_include is not None else None
+        )
+        self.repository_names_to_exclude = set(repository_names_to_exclude or [])
+        self.project_item_types = set(project_item_types_to_include or GithubProjectItemType) - set(
+            project_item_types_to_exclude or []
         )
 
-    project_status_name_to_check = configuration_info.project_status_name_to_check
-    project_status_option_id = matching_project_status_option_id(
-        project_single_select_field_infos,
-        project_status_name_to_check,
-        project_number,
-        project_owner_name,
+    def is_included(self, project_item_type: str | None, repository_name: str | None) -> bool:
+        return (
+            project_item_type in self.project_item_types
+            and (self.repository_names_to_include is None or repository_name in self.repository_names_to_include)
+            and repository_name not in self.repository_names_to_exclude
+        )
+
+    def is_included_project_item_map(self, project_item_map: dict[str, Any]) -> bool:
+        """Whether the project item is included, judged by the raw map of its node in a response."""
+        content_map = project_item_map.get("content") or {}
+        # NOTE: The content of excluded types is not requested, so only the type of the project item itself is left.
+        project_item_type = content_map.get("__typename") or _PROJECT_ITEM_TYPE_TO_GITHUB_PROJECT_ITEM_TYPE_MAP.get(
+            project_item_map.get("type")
+        )
+        return self.is_included(project_item_type, (content_map.get("repository") or {}).get("name"))
+
+    def is_included_content(self, content_info: ProjectItemInfo) -> bool:
+        return self.is_included(content_info.typename, content_info.repository.name)
+
+    def query_variables(self) -> dict[str, bool]:
+        """The variables of the project item queries to not even request the content of excluded types."""
+        return {
+            "includeIssues": GithubProjectItemType.issue in self.project_item_types,
+            "includePullRequests": GithubProjectItemType.pull_request in self.project_item_types,
+        }
+
+    def key_map(self) -> dict[str, list[str] | None]:
+        return {
+            "repository_names_to_include": (
+                sorted(self.repository_names_to_include) if self.repository_names_to_include is not None else None
+            ),
+            "repository_names_to_exclude": sorted(self.repository_names_to_exclude),
+            "project_item_types": sorted(self.project_item_types),
+        }
+
+
+def project_item_filter_query_arguments(project_item_filter: ProjectItemFilter | None) -> dict[str, Any]:
+    """The keyword arguments of `query_infos` and `paginated_query_infos` to apply `project_item_filter`, if any."""
+    result = (
+        {
+            "other_variables": project_item_filter.query_variables(),
+            "node_map_filter": project_item_filter.is_included_project_item_map,
+        }
+        if project_item_filter is not None
+        else {}
+    )
+    return result
+
+
+def project_item_filter_from_configuration_info(configuration_info: ConfigurationInfo) -> ProjectItemFilter | None:
+    """The filter for the project items to check, or `None` if all of them are to be checked."""
+    filter_values = (
+        configuration_info.repository_names_to_include,
+        configuration_info.repository_names_to_exclude,
+        configuration_info.project_item_types_to_include,
+        configuration_info.project_item_types_to_exclude,
+    )
+    return ProjectItemFilter(*filter_values) if any(value is not None for value in filter_values) else None
+
+
+class ProjectMetadataResolver:
+    """
+    The metadata of the configured project, taken from the cache if possible, and resolved again once it turns out
+    to be outdated.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        configuration_info: ConfigurationInfo,
+        metrics: Metrics | None = None,
+        project_metadata_cache: ProjectMetadataCache | None = None,
+    ):
+        self._session = session
+        self._configuration_info = configuration_info
+        self._metrics = metrics
+        self._project_metadata_cache = project_metadata_cache
+        self._cache_key = project_metadata_cache_key(configuration_info)
+        cached_project_metadata = (
+            project_metadata_cache.project_metadata(self._cache_key) if project_metadata_cache is not None else None
+        )
+        self.is_cached = cached_project_metadata is not None
+        if self.is_cached:
+            logger.debug(f"Using cached project metadata: {self._cache_key}")
+            self._set_project_metadata(cached_project_metadata)
+        else:
+            self._resolve()
+
+    def project_status_option_id_to_rule_ids_map_for(
+        self, status_option_ids: set[str]
+    ) -> dict[str, tuple[str, ...] | None]:
+        """
+        The lookup table to route project items to their rules, resolved again first if some of `status_option_ids`
+        are unknown, because the project status options changed since the metadata were cached or resolved.
+        """
+        if not status_option_ids.issubset(self.project_metadata.status_option_ids):
+            logger.info("Project status options changed since they were resolved, resolving them again.")
+            self._resolve()
+        return self.project_status_option_id_to_rule_ids_map
+
+    def is_expired(self) -> bool:
+        """
+        Whether the metadata are older than cached metadata may be, so that a resolver kept for many scans notices
+        changes that do not add project status options too, like renaming them.
+        """
+        return time.monotonic() - self._set_time > PROJECT_METADATA_TIME_TO_LIVE_IN_SECONDS
+
+    def forget_cached(self):
+        if self.is_cached:
+            self._project_metadata_cache.forget(self._cache_key)
+
+    def _resolve(self):
+        self._set_project_metadata(project_metadata(self._session, self._configuration_info, self._metrics))
+        self.is_cached = False
+        if self._project_metadata_cache is not None:
+            self._project_metadata_cache.store(self._cache_key, self.project_metadata)
+
+    def _set_project_metadata(self, project_metadata_info: ProjectMetadataInfo):
+        # NOTE: Build the lookup table only once for all pages, and again only if the project metadata change.
+        self.project_metadata = project_metadata_info
+        self._set_time = time.monotonic()
+        self.project_status_option_id_to_rule_ids_map = project_status_option_id_to_rule_ids_map(
+            self._configuration_info, project_metadata_info
+        )
+
+
+def github_auth_from_configuration_info(
+    configuration_info: ConfigurationInfo,
+    metrics: Metrics | None = None,
+    request_timeouts: RequestTimeouts | None = None,
+) -> AuthBase:
+    """
+    The authentication for the project owner, which spreads the requests across all configured credentials if there
+    are additional ones.
+    """
+    if configuration_info.is_project_owner_of_type_organization:
+        github_apps = [
+            GithubAppConfigurationInfo(configuration_info.github_app_id, configuration_info.github_app_private_key),
+            *(configuration_info.additional_github_apps or []),
+        ]
+        name_and_auth_pairs = [
+            (
+                f"GitHub app {github_app.github_app_id}",
+                OrganizationAccessTokenAuth(
+                    configuration_info.project_owner_name,
+                    github_app.github_app_id,
+                    github_app.github_app_private_key,
+                    metrics,
+                    request_timeouts,
+                ),
+            )
+            for github_app in github_apps
+        ]
+    else:
+        personal_access_tokens = [
+            configuration_info.personal_access_token,
+            *(configuration_info.additional_personal_access_tokens or []),
+        ]
+        name_and_auth_pairs = [
+            (f"personal access token {token_index + 1}", HttpBearerAuth(personal_access_token))
+            for token_index, personal_access_token in enumerate(personal_access_tokens)
+        ]
+    result = name_and_auth_pairs[0][1] if len(name_and_auth_pairs) == 1 else CredentialPoolAuth(name_and_auth_pairs)
+    return result
+
+
+def project_id_and_project_status_option_id_to_rule_ids_map(
+    session: Session, configuration_info: ConfigurationInfo, metrics: Metrics | None = None
+) -> tuple[str, dict[str, tuple[str, ...] | None]]:
+    resolved_project_metadata = project_metadata(session, configuration_info, metrics)
+    return (
+        resolved_project_metadata.project_id,
+        project_status_option_id_to_rule_ids_map(configuration_info, resolved_project_metadata),
     )
-    result = filtered_project_item_infos_by_done_status(project_item_infos, project_status_option_id)
+
+
+def project_status_option_id_to_rule_ids_map(
+    configuration_info: ConfigurationInfo, project_metadata_info: ProjectMetadataInfo
+) -> dict[str, tuple[str, ...] | None]:
+    """
+    The lookup table to route project items to the rules to check them with by their project status option id, with
+    `None` for checking all rules. Project items with a project status not in it are not checked at all.
+    """
+    if configuration_info.project_status_rules is None:
+        return {project_metadata_info.project_status_option_id: None}
+    result = {}
+    option_id_to_project_status_name_map = {}
+    for project_status_name, rule_ids in configuration_info.project_status_rules.items():
+        option_id = project_metadata_info.project_status_name_to_option_id_map[project_status_name]
+        # NOTE: Project status names match options partially, so two of them might match the same option, and the
+        #  rules of one of them would be silently ignored.
+        other_project_status_name = option_id_to_project_status_name_map.get(option_id)
+        if other_project_status_name is not None:
+            raise ValueError(
+                f"The project statuses {other_project_status_name!r} and {project_status_name!r} in "
+                f"project_status_rules match the same project status option, so only one of them can be configured."
+            )
+        option_id_to_project_status_name_map[option_id] = project_status_name
+        result[option_id] = tuple(rule_ids) if rule_ids is not None else None
     return result
 
 
+def project_metadata(
+    session: Session, configuration_info: ConfigurationInfo, metrics: Metrics | None = None
+) -> ProjectMetadataInfo:
+    project_owner_name = configuration_info.project_owner_name
+    project_query_name = (
+        GraphQlQuery.ORGANIZATION_PROJECTS.name
+        if configuration_info.is_project_owner_of_type_organization
+        else GraphQlQuery.USER_PROJECTS.name
+    )
+    project_infos = query_infos(ProjectOwnerInfo, project_query_name, session, project_owner_name, metrics=metrics)
+
+    project_number = configuration_info.project_number
+    project_id = matching_project_id(project_infos, project_number, project_owner_name)
+    project_single_select_field_infos = query_infos(
+        NodeByIdInfo,
+        GraphQlQuery.PROJECT_SINGLE_SELECT_FIELDS.name,
+        session,
+        project_owner_name,
+        project_id,
+        metrics,
+    )
+    project_status_names_to_check = (
+        list(configuration_info.project_status_rules)
+        if configuration_info.project_status_rules is not None
+        else [configuration_info.project_status_name_to_check]
+    )
+    project_status_name_to_option_id_map = {
+        project_status_name: matching_project_status_option_id(
+            project_single_select_field_infos, project_status_name, project_number, project_owner_name
+        )
+        for project_status_name in project_status_names_to_check
+    }
+    status_option_ids = [
+        status_option.id
+        for field_info in project_single_select_field_infos
+        if field_info.name == _GITHUB_PROJECT_STATUS_FIELD_NAME
+        for status_option in field_info.options
+    ]
+    return ProjectMetadataInfo(
+        project_id=project_id,
+        project_status_option_id=next(iter(project_status_name_to_option_id_map.values())),
+        status_option_ids=status_option_ids,
+        project_status_name_to_option_id_map=(
+            project_status_name_to_option_id_map if configuration_info.project_status_rules is not None else {}
+        ),
+    )
+
+
 def matching_project_id(project_infos: list[ProjectV2Node], project_number: int, project_owner_name: str) -> str:
     try:
         return next(str(project_info.id) for project_info in project_infos if project_info.number == project_number)
@@ -117,12 +720,54 @@ def filtered_project_item_infos_by_done_status(
     project_item_infos: list[ProjectV2ItemNode],
     project_status_option_id: str,
 ) -> list[ProjectItemInfo]:
-    result = []
-    for project_item_info in project_item_infos:
-        has_project_status_option = (
-            project_item_info.field_value_by_name is not None
-            and project_item_info.field_value_by_name.option_id == project_status_option_id
+    return [
+        project_item_info
+        for project_item_info, _ in routed_project_item_infos_and_rule_ids(project_item_infos, project_status_option_id)
+    ]
+
+
+def routed_project_item_infos_and_rule_ids(
+    project_item_infos: list[ProjectV2ItemNode],
+    project_status_option_id: str | Mapping[str, tuple[str, ...] | None],
+) -> list[tuple[ProjectItemInfo, tuple[str, ...] | None]]:
+    """
+    The content of the project items in one of the project statuses to check, each with the rule ids to check it
+    with, or `None` for all rules.
+    """
+    project_status_option_id_to_rule_ids_map = _project_status_option_id_to_rule_ids_map(project_status_option_id)
+    return [
+        (
+            project_item_info.content,
+            project_status_option_id_to_rule_ids_map[project_item_info.field_value_by_name.option_id],
         )
-        if has_project_status_option:
-            result.append(project_item_info.content)
-    return result
+        for project_item_info in project_item_infos
+        if project_item_info.field_value_by_name is not None
+        and project_item_info.field_value_by_name.option_id in project_status_option_id_to_rule_ids_map
+    ]
+
+
+def is_project_item_in_project_status(
+    project_item_info: ProjectV2ItemNode | ContentProjectItemNode,
+    project_status_option_id: str | Mapping[str, tuple[str, ...] | None],
+) -> bool:
+    return (
+        project_item_info.field_value_by_name is not None
+        and project_item_info.field_value_by_name.option_id
+        in _project_status_option_id_to_rule_ids_map(project_status_option_id)
+    )
+
+
+def rule_ids_for_project_item(
+    project_item_info: ProjectV2ItemNode | ContentProjectItemNode,
+    project_status_option_id: str | Mapping[str, tuple[str, ...] | None],
+) -> tuple[str, ...] | None:
+    """The rule ids to check a project item in one of the project statuses to check with, or `None` for all rules."""
+    return _project_status_option_id_to_rule_ids_map(project_status_option_id)[
+        project_item_info.field_value_by_name.option_id
+    ]
+
+
+def _project_status_option_id_to_rule_ids_map(
+    project_status_option_id: str | Mapping[str, tuple[str, ...] | None],
+) -> Mapping[str, tuple[str, ...] | None]:
+    return {project_status_option_id: None} if isinstance(project_status_option_id, str) else project_status_option_id
@@ -0,0 +1,103 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import logging
+import math
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from check_done.cache import ProjectMetadataCache, project_metadata_cache_key
+from check_done.config import ConfigurationInfo
+from check_done.done_project_items_info import github_auth_from_configuration_info, project_metadata
+from check_done.graphql import MAX_PARALLEL_PAGE_REQUESTS, GraphQlQuery, PageSizer, new_github_session, query_info
+from check_done.info import DryRunInfo, ProjectItemCountInfo
+from check_done.metrics import Metrics
+
+# NOTE: This is a rough average for pages of typical project items, which is good enough to plan runs.
+_ESTIMATED_SECONDS_PER_PAGE_ENTRY = 0.02
+
+logger = logging.getLogger(__name__)
+
+
+class DryRunEstimate(NamedTuple):
+    """What a check of a project would need, estimated without requesting the content of any project item."""
+
+    project_url: str
+    project_item_count: int
+    page_size: int
+    page_count: int
+    api_cost_points_per_page: int
+    api_cost_points: int
+    rate_limit_remaining_points: int
+    estimated_duration_in_seconds: float
+
+
+def dry_run_estimate(
+    configuration_info: ConfigurationInfo,
+    metrics: Metrics | None = None,
+    project_metadata_cache: ProjectMetadataCache | None = None,
+) -> DryRunEstimate:
+    """
+    The estimated work of checking the configured project: the number of project items is requested with a query
+    that does not include any of them, and the rate limit points of each page of project items with GitHub's
+    `rateLimit(dryRun: true)`, which only computes the cost of a query without running it.
+    """
+    with new_github_session(github_auth_from_configuration_info(configuration_info, metrics)) as session:
+        cache_key = project_metadata_cache_key(configuration_info)
+        resolved_project_metadata = (
+            project_metadata_cache.project_metadata(cache_key) if project_metadata_cache is not None else None
+        )
+        if resolved_project_metadata is None:
+            resolved_project_metadata = project_metadata(session, configuration_info, metrics)
+            if project_metadata_cache is not None:
+                project_metadata_cache.store(cache_key, resolved_project_metadata)
+        project_id = resolved_project_metadata.project_id
+        project_item_count = query_info(
+            ProjectItemCountInfo,
+            GraphQlQuery.PROJECT_V2_ITEM_COUNT.name,
+            session,
+            {"projectId": project_id},
+            metrics,
+        ).node.items.total_count
+        page_size = PageSizer(GraphQlQuery.PROJECT_V2_ITEMS.name).page_size
+        # NOTE: Without metrics, so that the cost of the dry run is not counted as spent.
+        page_rate_limit_info = query_info(
+            DryRunInfo,
+            GraphQlQuery.PROJECT_V2_ITEMS.name,
+            session,
+            {"projectId": project_id, "maxEntriesPerPage": page_size, "dryRun": True},
+        ).rate_limit
+    page_count = max(math.ceil(project_item_count / page_size), 1)
+    # NOTE: The first page is needed to plan the others, which are then requested in parallel.
+    sequential_page_count = 1 + math.ceil((page_count - 1) / MAX_PARALLEL_PAGE_REQUESTS)
+    result = DryRunEstimate(
+        project_url=configuration_info.project_url,
+        project_item_count=project_item_count,
+        page_size=page_size,
+        page_count=page_count,
+        api_cost_points_per_page=page_rate_limit_info.cost,
+        api_cost_points=page_count * page_rate_limit_info.cost,
+        rate_limit_remaining_points=page_rate_limit_info.remaining,
+        estimated_duration_in_seconds=round(sequential_page_count * page_size * _ESTIMATED_SECONDS_PER_PAGE_ENTRY, 1),
+    )
+    return result
+
+
+def dry_run_text_log_entries(estimate: DryRunEstimate) -> Iterator[tuple[int, str]]:
+    yield (
+        logging.INFO,
+        f"Checking {estimate.project_item_count} project items would need {estimate.page_count} "
+        f"pages of {estimate.page_size} project items, costing about {estimate.api_cost_points} "
+        f"rate limit points ({estimate.api_cost_points_per_page} per page) "
+        f"and taking about {estimate.estimated_duration_in_seconds:g} seconds.",
+    )
+    if estimate.api_cost_points > estimate.rate_limit_remaining_points:
+        yield (
+            logging.WARNING,
+            f"Only {estimate.rate_limit_remaining_points} rate limit points remain in the current window, "
+            "so the check would fail before it is complete.",
+        )
+    else:
+        yield (
+            logging.INFO,
+            f"{estimate.rate_limit_remaining_points} rate limit points remain in the current window.",
+        )
@@ -1,28 +1,140 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
+import base64
+import codecs
+import json
+import logging
 import re
+import time
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 from pydantic import BaseModel
-from requests import HTTPError, Response, Session
+from requests import ConnectionError as RequestsConnectionError
+from requests import HTTPError, PreparedRequest, ReadTimeout, Response, Session, Timeout
+from requests.adapters import HTTPAdapter
 from requests.auth import AuthBase
+from urllib3.exceptions import ReadTimeoutError
 
 from check_done.info import (
+    NodesByIdsInfo,
     QueryInfo,
+    RateLimitInfo,
+    validated_nodes,
 )
+from check_done.metrics import MetricName, Metrics
 
 GRAPHQL_ENDPOINT = "https://api.github.com/graphql"
 _MAX_ENTRIES_PER_PAGE = 100
+_MIN_ENTRIES_PER_PAGE = 5
+_QUICK_PAGE_DURATION_IN_SECONDS = 2.0
+_QUICK_PAGE_COUNT_TO_GROW = 3
+_SLOW_PAGE_DURATION_IN_SECONDS = 10.0
+_MAX_PAGE_RESPONSE_SIZE_IN_BYTES = 5 * 1024 * 1024
+# NOTE: GitHub answers with these if a query took too long, which mostly happens with too many large nodes per page.
+_PAGE_TOO_LARGE_HTTP_STATUS_CODES = {502, 504}
+MAX_PARALLEL_PAGE_REQUESTS = 4
+_MAX_NESTED_CONNECTIONS_PER_QUERY = 50
+_STREAMED_RESPONSE_CHUNK_SIZE_IN_BYTES = 64 * 1024
+DEFAULT_CONNECT_TIMEOUT_IN_SECONDS = 10.0
+DEFAULT_READ_TIMEOUT_IN_SECONDS = 60.0
+_CONNECTION_NODES_START_REGEX = re.compile(r'"nodes"\s*:\s*\[')
+_NODE_SEPARATOR_REGEX = re.compile(r"[\s,]*")
+_NESTING_OR_STRING_START_REGEX = re.compile(r'[{}\[\]"]')
+_SCALAR_NODE_END_REGEX = re.compile(r"[\s,\]]")
+# NOTE: The content of a string up to its end, or up to a backslash at the end of the text received so far.
+_STRING_CONTENT_REGEX = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
 _PATH_TO_QUERIES = Path(__file__).parent / "queries"
 
+logger = logging.getLogger(__name__)
+
 
 class GraphQlError(Exception):
     pass
 
 
+class DeadlineExceededError(Exception):
+    """
+    Error raised instead of sending a request after the deadline of the run was exceeded, or if a request timed out
+    because its timeouts were reduced to end at the deadline.
+    """
+
+
+class RequestTimeouts:
+    """
+    The timeouts of each request, so that a stuck connection fails the request instead of blocking forever, and
+    optionally a deadline for all requests of a run, after which no more requests are sent. The timeouts of requests
+    sent shortly before the deadline are reduced so that they end at the deadline.
+    """
+
+    def __init__(
+        self,
+        connect_timeout_in_seconds: float = DEFAULT_CONNECT_TIMEOUT_IN_SECONDS,
+        read_timeout_in_seconds: float = DEFAULT_READ_TIMEOUT_IN_SECONDS,
+        deadline_in_seconds: float | None = None,
+    ):
+        self.connect_timeout_in_seconds = connect_timeout_in_seconds
+        self.read_timeout_in_seconds = read_timeout_in_seconds
+        self.deadline_in_seconds = deadline_in_seconds
+        self._deadline_time = time.monotonic() + deadline_in_seconds if deadline_in_seconds is not None else None
+
+    def timeout(self) -> tuple[float, float]:
+        """The connect and read timeout for a request to be sent now."""
+        if self._deadline_time is None:
+            return self.connect_timeout_in_seconds, self.read_timeout_in_seconds
+        remaining_seconds = self._deadline_time - time.monotonic()
+        if remaining_seconds <= 0:
+            raise self._deadline_exceeded_error()
+        return (
+            min(self.connect_timeout_in_seconds, remaining_seconds),
+            min(self.read_timeout_in_seconds, remaining_seconds),
+        )
+
+    def raise_if_deadline_exceeded(self, timeout_error: Exception):
+        """
+        Raise a `DeadlineExceededError` instead of `timeout_error` if the deadline has passed, because then the
+        request timed out due to the deadline, and not because it was slow.
+        """
+        if self._deadline_time is not None and time.monotonic() >= self._deadline_time:
+            raise self._deadline_exceeded_error() from timeout_error
+
+    def _deadline_exceeded_error(self) -> DeadlineExceededError:
+        return DeadlineExceededError(f"Deadline of {self.deadline_in_seconds:g} seconds exceeded.")
+
+
+class _TimeoutHttpAdapter(HTTPAdapter):
+    def __init__(self, request_timeouts: RequestTimeouts):
+        super().__init__()
+        self.request_timeouts = request_timeouts
+
+    def send(self, request: PreparedRequest, timeout=None, **kwargs) -> Response:
+        # NOTE: Requests without a timeout of their own get the one of the run, which also enforces its deadline.
+        if timeout is None:
+            timeout = self.request_timeouts.timeout()
+        try:
+            return super().send(request, timeout=timeout, **kwargs)
+        except Timeout as error:
+            self.request_timeouts.raise_if_deadline_exceeded(error)
+            raise
+
+
+def _raise_if_deadline_exceeded(session: Session, timeout_error: Exception):
+    adapter = session.get_adapter(GRAPHQL_ENDPOINT)
+    if isinstance(adapter, _TimeoutHttpAdapter):
+        adapter.request_timeouts.raise_if_deadline_exceeded(timeout_error)
+
+
+def mount_request_timeouts(session: Session, request_timeouts: RequestTimeouts | None = None):
+    """Apply `request_timeouts`, or the default timeouts, to all requests of `session`."""
+    adapter = _TimeoutHttpAdapter(request_timeouts or RequestTimeouts())
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
 class HttpBearerAuth(AuthBase):
     # Source:
     # <https://stackoverflow.com/questions/29931671/making-an-api-call-in-python-with-an-api-that-requires-a-bearer-token>
@@ -34,6 +146,14 @@ class HttpBearerAuth(AuthBase):
         return request
 
 
+def new_github_session(auth: AuthBase, request_timeouts: RequestTimeouts | None = None) -> Session:
+    result = Session()
+    result.headers = {"Accept": "application/vnd.github+json"}
+    result.auth = auth
+    mount_request_timeouts(result, request_timeouts)
+    return result
+
+
 @lru_cache
 def minimized_graphql(graphql_query: str) -> str:
     single_spaced_query = re.sub(r"\s+", " ", graphql_query)
@@ -44,6 +164,7 @@ def minimized_graphql(graphql_query: str) -> str:
     return result
 
 
+@lru_cache
 def _graphql_query(item_name: str) -> str:
     query_path = _PATH_TO_QUERIES / f"{item_name}.graphql"
     with query_path.open(encoding="utf-8") as query_file:
@@ -52,16 +173,87 @@ def _graphql_query(item_name: str) -> str:
 
 
 class GraphQlQuery(Enum):
-    ORGANIZATION_PROJECTS = _graphql_query("organization_projects")
-    USER_PROJECTS = _graphql_query("user_projects")
-    PROJECT_SINGLE_SELECT_FIELDS = _graphql_query("project_single_select_fields")
-    PROJECT_V2_ITEMS = _graphql_query("project_v2_items")
+    # NOTE: The values are the names of the query files, which are only read and minimized once they are needed,
+    #  so that runs do not pay for queries of modes they do not use.
+    ORGANIZATION_PROJECTS = "organization_projects"
+    USER_PROJECTS = "user_projects"
+    PROJECT_SINGLE_SELECT_FIELDS = "project_single_select_fields"
+    PROJECT_V2_ITEMS = "project_v2_items"
+    PROJECT_V2_ITEM_REFERENCES = "project_v2_item_references"
+    PROJECT_V2_ITEMS_BY_IDS = "project_v2_items_by_ids"
+    PROJECT_ITEM_CONTENT_BY_ID = "project_item_content_by_id"
+    CLOSING_ISSUES_BY_IDS = "closing_issues_by_ids"
+    PULL_REQUESTS_BY_COMMIT = "pull_requests_by_commit"
+    PROJECT_V2_ITEM_COUNT = "project_v2_item_count"
 
     @staticmethod
     def query_for(name: str):
         assert name is not None
         assert name.upper() == name
-        return GraphQlQuery[name].value
+        return _graphql_query(GraphQlQuery[name].value)
+
+
+class PageSizer:
+    """
+    The number of entries to request per page of a paginated query, adapted to how GitHub copes with the pages so
+    far: halved after a page timed out, took long, or was very large, and doubled again after a few quick pages, up to
+    the maximum GitHub allows. This way, projects with huge items are still checked with smaller pages instead of
+    failing, while the pages of other projects stay at the maximum size.
+    """
+
+    def __init__(self, query_name: str, metrics: Metrics | None = None):
+        self._query_name = query_name
+        self._metrics = metrics
+        self._quick_page_count = 0
+        self.page_size = _MAX_ENTRIES_PER_PAGE
+        self._record()
+
+    def shrink(self) -> bool:
+        """Halve the page size, and tell whether this was possible at all."""
+        if self.page_size <= _MIN_ENTRIES_PER_PAGE:
+            return False
+        self._quick_page_count = 0
+        self.page_size = max(self.page_size // 2, _MIN_ENTRIES_PER_PAGE)
+        self._record()
+        return True
+
+    def add_page(self, duration_in_seconds: float, response_size_in_bytes: int):
+        if duration_in_seconds >= _SLOW_PAGE_DURATION_IN_SECONDS or (
+            response_size_in_bytes >= _MAX_PAGE_RESPONSE_SIZE_IN_BYTES
+        ):
+            logger.debug(
+                f"Page of {self._query_name} with {self.page_size} entries took {duration_in_seconds:.1f} seconds "
+                f"for {response_size_in_bytes} bytes, requesting smaller pages."
+            )
+            self.shrink()
+        elif duration_in_seconds < _QUICK_PAGE_DURATION_IN_SECONDS and self.page_size < _MAX_ENTRIES_PER_PAGE:
+            self._quick_page_count += 1
+            if self._quick_page_count >= _QUICK_PAGE_COUNT_TO_GROW:
+                self._quick_page_count = 0
+                self.page_size = min(self.page_size * 2, _MAX_ENTRIES_PER_PAGE)
+                self._record()
+        else:
+            self._quick_page_count = 0
+
+    def _record(self):
+        logger.debug(f"Requesting pages of {self._query_name} with {self.page_size} entries.")
+        if self._metrics is not None:
+            self._metrics.set(MetricName.PAGE_SIZE, self.page_size, query=self._query_name.lower())
+
+
+def is_page_too_large_error(error: Exception) -> bool:
+    """Whether `error` indicates that a page might succeed with fewer entries."""
+    if isinstance(error, Timeout):
+        return True
+    if not isinstance(error, GraphQlError):
+        return False
+    cause = error.__cause__
+    result = (
+        isinstance(cause, HTTPError)
+        and cause.response is not None
+        and cause.response.status_code in _PAGE_TOO_LARGE_HTTP_STATUS_CODES
+    ) or "timeout" in str(error).lower()
+    return result
 
 
 def query_infos(
@@ -70,31 +262,642 @@ def query_infos(
     session: Session,
     project_owner_name: str,
     project_id: str | None = None,
+    metrics: Metrics | None = None,
+    is_parallel: bool = False,
+    other_variables: Mapping[str, Any] | None = None,
+    node_map_filter: Callable[[dict[str, Any]], bool] | None = None,
 ) -> list:
     result = []
-    variables = {"login": project_owner_name, "maxEntriesPerPage": _MAX_ENTRIES_PER_PAGE}
+    for nodes_info in query_info_pages(
+        base_model,
+        query_name,
+        session,
+        project_owner_name,
+        project_id,
+        metrics,
+        is_parallel,
+        other_variables,
+        node_map_filter,
+    ):
+        result.extend(nodes_info)
+    return result
+
+
+def query_info_pages(
+    base_model: type[BaseModel],
+    query_name: str,
+    session: Session,
+    project_owner_name: str,
+    project_id: str | None = None,
+    metrics: Metrics | None = None,
+    is_parallel: bool = False,
+    other_variables: Mapping[str, Any] | None = None,
+    node_map_filter: Callable[[dict[str, Any]], bool] | None = None,
+) -> Iterator[list]:
+    """
+    The nodes of a paginated query, one page at a time as soon as it was received, so that callers can process the
+    first nodes while later pages are still to be requested.
+
+    With `is_parallel`, the pages after the first one are requested in parallel using cursors derived from their
+    offset, which only works for connections with offset based cursors like the items of a project and a
+    `totalCount`. If the cursors turn out to be different, the remaining pages are requested one after another.
+
+    The `other_variables` and `node_map_filter` are the same as for `paginated_query_infos`.
+    """
+    for page_query_info in paginated_query_infos(
+        base_model,
+        query_name,
+        session,
+        project_owner_name,
+        project_id,
+        metrics,
+        is_parallel,
+        other_variables=other_variables,
+        node_map_filter=node_map_filter,
+    ):
+        yield page_query_info.nodes
+
+
+def paginated_query_infos(
+    base_model: type[BaseModel],
+    query_name: str,
+    session: Session,
+    project_owner_name: str,
+    project_id: str | None = None,
+    metrics: Metrics | None = None,
+    is_parallel: bool = False,
+    after: str | None = None,
+    other_variables: Mapping[str, Any] | None = None,
+    node_map_filter: Callable[[dict[str, Any]], bool] | None = None,
+) -> Iterator[QueryInfo]:
+    """
+    Like `query_info_pages`, but with the page info of each page, so that callers can continue later on from its
+    `endCursor` by passing it as `after`.
+
+    With `other_variables`, these are passed to the query in addition to the ones for the project and pagination.
+    With a `node_map_filter`, only the nodes of each page whose raw map it returns `True` for are validated and
+    included, so that skipped nodes cost hardly more than their transfer.
+    """
+    variables = {"login": project_owner_name, **(other_variables or {})}
     if project_id is not None:
         variables["projectId"] = project_id
-    after = None
-    has_more_pages = True
-    while has_more_pages:
-        query = GraphQlQuery.query_for(query_name)
-        if after is not None:
-            variables["after"] = after
-        json_payload_map = {
-            "variables": variables,
-            "query": query,
-        }
+    page_sizer = PageSizer(query_name, metrics)
+    query_info = _adaptively_sized_query_page_info(
+        base_model,
+        query_name,
+        session,
+        variables if after is None else {**variables, "after": after},
+        page_sizer,
+        metrics,
+        node_map_filter,
+    )
+    yield query_info
+    if is_parallel and query_info.page_info.hasNextPage:
+        query_info = yield from _parallel_remaining_query_infos(
+            base_model, query_name, session, variables, query_info, page_sizer, metrics, node_map_filter
+        )
+    while query_info.page_info.hasNextPage:
+        query_info = _adaptively_sized_query_page_info(
+            base_model,
+            query_name,
+            session,
+            {**variables, "after": query_info.page_info.endCursor},
+            page_sizer,
+            metrics,
+            node_map_filter,
+        )
+        yield query_info
+
+
+def _parallel_remaining_query_infos(
+    base_model: type[BaseModel],
+    query_name: str,
+    session: Session,
+    variables: dict[str, Any],
+    first_query_info: QueryInfo,
+    page_sizer: PageSizer,
+    metrics: Metrics | None = None,
+    node_map_filter: Callable[[dict[str, Any]], bool] | None = None,
+) -> Generator[QueryInfo, None, QueryInfo]:
+    """
+    Yield the pages after `first_query_info` requested in parallel with the current size of `page_sizer`, and return
+    the info of the last page with consistent cursors, so that the caller can continue from there one page after
+    another if needed, for example with smaller pages after one of the parallel pages was too large, slow, or failed.
+    """
+    result = first_query_info
+    page_size = page_sizer.page_size
+    total_count = first_query_info.total_count
+    offset_and_is_padded_cursor = _offset_and_is_padded_of_cursor(first_query_info.page_info.endCursor)
+    if total_count is None or offset_and_is_padded_cursor is None:
+        logger.debug(f"Cannot derive cursors for parallel requests of {query_name}, requesting one page after another.")
+        return result
+    first_page_end_offset, is_padded_cursor = offset_and_is_padded_cursor
+    page_offsets = range(first_page_end_offset, total_count, page_size)
+    executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_PAGE_REQUESTS, thread_name_prefix="check_done_pages")
+    is_closed_early = False
+    try:
+        page_offset_and_query_info_futures = [
+            (
+                page_offset,
+                executor.submit(
+                    _measured_query_page_info,
+                    base_model,
+                    query_name,
+                    session,
+                    {
+                        **variables,
+                        "after": _offset_cursor(page_offset, is_padded_cursor),
+                        "maxEntriesPerPage": page_size,
+                    },
+                    metrics,
+                    node_map_filter,
+                ),
+            )
+            for page_offset in page_offsets
+        ]
+        for page_offset, query_info_future in page_offset_and_query_info_futures:
+            if result.page_info.endCursor != _offset_cursor(page_offset, is_padded_cursor):
+                # NOTE: This happens if the items changed while they were requested, for example.
+                logger.debug(
+                    f"Derived cursor of {query_name} at offset {page_offset} does not match, "
+                    "requesting the remaining pages one after another."
+                )
+                break
+            try:
+                page_query_info, duration_in_seconds, response_size_in_bytes = query_info_future.result()
+            except (GraphQlError, Timeout) as error:
+                if not is_page_too_large_error(error) or not page_sizer.shrink():
+                    raise
+                logger.info(
+                    f"Page of {query_name} with {page_size} entries failed, requesting the remaining pages one after "
+                    f"another with {page_sizer.page_size} entries: {error}"
+                )
+                break
+            page_sizer.add_page(duration_in_seconds, response_size_in_bytes)
+            result = page_query_info
+            yield result
+            if not result.page_info.hasNextPage:
+                break
+            if page_sizer.page_size < page_size:
+                logger.info(
+                    f"Page of {query_name} with {page_size} entries was slow or large, requesting the remaining pages "
+                    f"one after another with {page_sizer.page_size} entries."
+                )
+                break
+    except GeneratorExit:
+        is_closed_early = True
+        raise
+    finally:
+        # NOTE: A caller that stops early, for example once enough warnings were found, must not wait for the pages
+        #  still in flight, whose results it does not need anymore.
+        executor.shutdown(wait=not is_closed_early, cancel_futures=True)
+    return result
+
+
+def _offset_cursor(offset: int, is_padded: bool) -> str:
+    result = base64.b64encode(str(offset).encode("ascii")).decode("ascii")
+    if not is_padded:
+        result = result.rstrip("=")
+    return result
+
+
+def _offset_and_is_padded_of_cursor(cursor: str | None) -> tuple[int, bool] | None:
+    """
+    The offset a cursor is the base64 encoding of and whether it is padded, or `None` if it is no offset based cursor
+    at all.
+    """
+    if cursor is None:
+        return None
+    try:
+        offset_text = base64.b64decode(cursor + "=" * (-len(cursor) % 4), validate=True).decode("ascii")
+    except ValueError:
+        return None
+    if not offset_text.isdigit():
+        return None
+    offset = int(offset_text)
+    result = None
+    for is_padded in (True, False):
+        if cursor == _offset_cursor(offset, is_padded):
+            result = offset, is_padded
+            break
+    return result
+
+
+def _measured_query_page_info(
+    base_model: type[BaseModel],
+    query_name: str,
+    session: Session,
+    variables: dict[str, Any],
+    metrics: Metrics | None = None,
+    node_map_filter: Callable[[dict[str, Any]], bool] | None = None,
+) -> tuple[QueryInfo, float, int]:
+    """A page of a query, with the seconds it took and the size of its response, so it can be added to a `PageSizer`."""
+    start_time = time.monotonic()
+    response_info, response_size_in_bytes = _query_info_and_response_size(
+        base_model, query_name, session, variables, metrics, node_map_filter, is_streaming=True
+    )
+    return query_info_from_response_info(response_info), time.monotonic() - start_time, response_size_in_bytes
+
+
+def _adaptively_sized_query_page_info(
+    base_model: type[BaseModel],
+    query_name: str,
+    session: Session,
+    variables: dict[str, Any],
+    page_sizer: PageSizer,
+    metrics: Metrics | None = None,
+    node_map_filter: Callable[[dict[str, Any]], bool] | None = None,
+) -> QueryInfo:
+    """
+    The page of a query with the size of `page_sizer`, which is requested again with a smaller size as long as it
+    fails with an error that smaller pages might avoid.
+    """
+    while True:
+        page_size = page_sizer.page_size
+        start_time = time.monotonic()
+        try:
+            response_info, response_size_in_bytes = _query_info_and_response_size(
+                base_model,
+                query_name,
+                session,
+                {**variables, "maxEntriesPerPage": page_size},
+                metrics,
+                node_map_filter,
+                is_streaming=True,
+            )
+        except (GraphQlError, Timeout) as error:
+            if not is_page_too_large_error(error) or not page_sizer.shrink():
+                raise
+            logger.info(
+                f"Page of {query_name} with {page_size} entries failed, "
+                f"requesting it again with {page_sizer.page_size} entries: {error}"
+            )
+            continue
+        page_sizer.add_page(time.monotonic() - start_time, response_size_in_bytes)
+        return query_info_from_response_info(response_info)
+
+
+def query_nodes_by_ids(query_name: str, session: Session, node_ids: list[str], metrics: Metrics | None = None) -> list:
+    """
+    The nodes for the IDs, requested in chunks of the maximum page size. Nodes that do not exist (anymore) are
+    omitted.
+    """
+    result = []
+    for chunk_start in range(0, len(node_ids), _MAX_ENTRIES_PER_PAGE):
+        chunk_node_ids = node_ids[chunk_start : chunk_start + _MAX_ENTRIES_PER_PAGE]
+        nodes_by_ids_info = query_info(NodesByIdsInfo, query_name, session, {"ids": chunk_node_ids}, metrics)
+        result.extend(nodes_by_ids_info.nodes)
+    return result
+
+
+class NestedConnection(NamedTuple):
+    """
+    A connection nested in the nodes of a query, like the closing issues of a pull request, whose first page is part
+    of the nodes, and whose remaining pages can be requested for the nodes that have more.
+    """
+
+    type_name: str
+    field_name: str
+    node_selection: str
+    attribute_name: str
+    connection_model: type[BaseModel]
+
+
+def complete_nested_connections(
+    session: Session,
+    parent_nodes: Iterable[BaseModel],
+    nested_connection: NestedConnection,
+    metrics: Metrics | None = None,
+):
+    """
+    Request the remaining pages of `nested_connection` for the `parent_nodes` whose first page has more, and add
+    their nodes to it. The pages of many parent nodes are requested together in a single query with an alias for
+    each parent node, so that only a few requests are needed even if many parent nodes have more.
+    """
+    pending_parent_node_and_connection_infos = _parent_node_and_connection_infos_with_next_page(
+        (parent_node, getattr(parent_node, nested_connection.attribute_name, None)) for parent_node in parent_nodes
+    )
+    while len(pending_parent_node_and_connection_infos) >= 1:
+        for chunk_start in range(0, len(pending_parent_node_and_connection_infos), _MAX_NESTED_CONNECTIONS_PER_QUERY):
+            chunk_parent_node_and_connection_infos = pending_parent_node_and_connection_infos[
+                chunk_start : chunk_start + _MAX_NESTED_CONNECTIONS_PER_QUERY
+            ]
+            _add_next_nested_connection_pages(
+                session, chunk_parent_node_and_connection_infos, nested_connection, metrics
+            )
+        pending_parent_node_and_connection_infos = _parent_node_and_connection_infos_with_next_page(
+            pending_parent_node_and_connection_infos
+        )
+
+
+def _parent_node_and_connection_infos_with_next_page(
+    parent_node_and_connection_infos: Iterable[tuple[BaseModel, BaseModel | None]],
+) -> list[tuple[BaseModel, BaseModel]]:
+    return [
+        (parent_node, connection_info)
+        for parent_node, connection_info in parent_node_and_connection_infos
+        if connection_info is not None
+        and connection_info.page_info is not None
+        and connection_info.page_info.hasNextPage
+        and getattr(parent_node, "id", None) is not None
+    ]
+
+
+def _add_next_nested_connection_pages(
+    session: Session,
+    parent_node_and_connection_infos: list[tuple[BaseModel, BaseModel]],
+    nested_connection: NestedConnection,
+    metrics: Metrics | None = None,
+):
+    variables = {}
+    for index, (parent_node, connection_info) in enumerate(parent_node_and_connection_infos):
+        variables[f"id{index}"] = parent_node.id
+        variables[f"after{index}"] = connection_info.page_info.endCursor
+    query_name = f"nested_{nested_connection.field_name}"
+    response = session.post(
+        GRAPHQL_ENDPOINT,
+        json={"variables": variables, "query": _nested_connection_query(nested_connection, len(variables) // 2)},
+    )
+    response_map = checked_graphql_data_map(response)
+    if metrics is not None:
+        _add_page_metrics(metrics, query_name, response_map)
+    for index, (parent_node, connection_info) in enumerate(parent_node_and_connection_infos):
+        parent_node_map = response_map.get(f"node{index}") or {}
+        connection_map = parent_node_map.get(nested_connection.field_name)
+        if connection_map is None:
+            # NOTE: This happens if the parent node was deleted since its first page was requested, for example.
+            logger.debug(
+                f"Cannot request more {nested_connection.field_name} of {parent_node.id}, keeping the ones found."
+            )
+            connection_info.page_info = None
+        else:
+            next_connection_info = nested_connection.connection_model(**connection_map)
+            connection_info.nodes.extend(next_connection_info.nodes)
+            connection_info.page_info = next_connection_info.page_info
+
+
+def _nested_connection_query(nested_connection: NestedConnection, parent_node_count: int) -> str:
+    variable_definitions = ", ".join(f"$id{index}: ID!, $after{index}: String" for index in range(parent_node_count))
+    aliased_nodes = " ".join(
+        f"node{index}: node(id: $id{index}) {{ ... on {nested_connection.type_name} {{ "
+        f"{nested_connection.field_name}(first: {_MAX_ENTRIES_PER_PAGE}, after: $after{index}) {{ "
+        f"nodes {{ {nested_connection.node_selection} }} pageInfo {{ hasNextPage endCursor }} }} }} }}"
+        for index in range(parent_node_count)
+    )
+    return minimized_graphql(
+        f"query nestedConnectionPages({variable_definitions}) {{ rateLimit {{ cost remaining }} {aliased_nodes} }}"
+    )
+
+
+class NodeLoader:
+    """
+    Nodes by id as needed by checks during a run, resolved with as few requests as possible: the ids requested
+    together are deduplicated and requested in chunks of the maximum page size, and each id is requested at most once
+    per loader, so that nodes referenced by many project items are only requested for the first of them.
+    """
+
+    def __init__(self, query_name: str, session: Session, metrics: Metrics | None = None):
+        self._query_name = query_name
+        self._session = session
+        self._metrics = metrics
+        self._node_id_to_node_map: dict[str, BaseModel | None] = {}
+
+    def node_id_to_node_map(self, node_ids: Iterable[str]) -> dict[str, BaseModel | None]:
+        """The nodes for the ids, with `None` for ids that do not resolve to a node of the query."""
+        requested_node_ids = list(dict.fromkeys(node_ids))
+        unknown_node_ids = [node_id for node_id in requested_node_ids if node_id not in self._node_id_to_node_map]
+        if len(unknown_node_ids) >= 1:
+            for node in query_nodes_by_ids(self._query_name, self._session, unknown_node_ids, self._metrics):
+                self._node_id_to_node_map[node.id] = node
+            for node_id in unknown_node_ids:
+                self._node_id_to_node_map.setdefault(node_id, None)
+        result = {node_id: self._node_id_to_node_map[node_id] for node_id in requested_node_ids}
+        return result
+
+
+def query_info(
+    base_model: type[BaseModel],
+    query_name: str,
+    session: Session,
+    variables: dict[str, Any],
+    metrics: Metrics | None = None,
+) -> BaseModel:
+    """The result of a query without pagination, validated as `base_model`."""
+    result, _ = _query_info_and_response_size(base_model, query_name, session, variables, metrics)
+    return result
+
+
+def _query_info_and_response_size(
+    base_model: type[BaseModel],
+    query_name: str,
+    session: Session,
+    variables: dict[str, Any],
+    metrics: Metrics | None = None,
+    node_map_filter: Callable[[dict[str, Any]], bool] | None = None,
+    is_streaming: bool = False,
+) -> tuple[BaseModel, int]:
+    """
+    The result of a query validated as `base_model`, and the size of the response. With `is_streaming`, the nodes of
+    the first connection in the response are validated one after another while the response is still received.
+    """
+    json_payload_map = {
+        "variables": variables,
+        "query": GraphQlQuery.query_for(query_name),
+    }
+    if is_streaming:
+        with session.post(GRAPHQL_ENDPOINT, json=json_payload_map, stream=True) as response:
+            _raise_for_http_status(response)
+            connection_parser = StreamedConnectionParser(node_map_filter)
+            try:
+                for chunk in response.iter_content(chunk_size=_STREAMED_RESPONSE_CHUNK_SIZE_IN_BYTES):
+                    connection_parser.feed(chunk)
+            except RequestsConnectionError as error:
+                # NOTE: While streaming, requests reports read timeouts as connection errors, so turn them back into
+                #  timeouts, which smaller pages might avoid.
+                if len(error.args) >= 1 and isinstance(error.args[0], ReadTimeoutError):
+                    _raise_if_deadline_exceeded(session, error)
+                    raise ReadTimeout(error) from error
+                raise
+            response_map = checked_graphql_data_map_from_response_map(connection_parser.close())
+        response_size_in_bytes = connection_parser.size_in_bytes
+    else:
         response = session.post(GRAPHQL_ENDPOINT, json=json_payload_map)
         response_map = checked_graphql_data_map(response)
-        response_info = base_model(**response_map)
-        query_info = query_info_from_response_info(response_info)
-        nodes_info = query_info.nodes
-        page_info = query_info.page_info
-        after = page_info.endCursor
-        has_more_pages = page_info.hasNextPage
-        result.extend(nodes_info)
-    return result
+        if node_map_filter is not None:
+            connection_map = _connection_map(response_map)
+            if connection_map is not None:
+                connection_map["nodes"] = [
+                    node_map
+                    for node_map in connection_map["nodes"]
+                    if isinstance(node_map, dict) and node_map_filter(node_map)
+                ]
+        response_size_in_bytes = len(response.content)
+    if metrics is not None:
+        _add_page_metrics(metrics, query_name, response_map)
+    return base_model(**response_map), response_size_in_bytes
+
+
+class StreamedConnectionParser:
+    """
+    Parses a JSON response fed to it in chunks, and validates each node of the first connection in it as soon as the
+    node is complete. So instead of the text and the maps of the whole response, only the text of about one node is
+    kept along with the models of the nodes before it. Everything around the nodes, like the page info, is small and
+    parsed once the response is complete.
+
+    With a `node_map_filter`, only the nodes whose raw map it returns `True` for are validated and kept.
+    """
+
+    def __init__(self, node_map_filter: Callable[[dict[str, Any]], bool] | None = None):
+        self._node_map_filter = node_map_filter
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._text = ""
+        self._text_before_nodes = None
+        self._texts_after_nodes = []
+        self._is_after_nodes = False
+        # NOTE: The text of the node received so far is kept in parts and scanned only once, remembering where in the
+        #  node the scan stopped, so that a large node arriving in many chunks is not decoded again for every chunk.
+        self._node_texts = []
+        self._is_in_node = False
+        self._is_in_scalar_node = False
+        self._is_in_string = False
+        self._is_escaped = False
+        self._node_depth = 0
+        self._nodes = []
+        self.size_in_bytes = 0
+
+    @property
+    def validated_node_count(self) -> int:
+        return len(self._nodes)
+
+    def feed(self, chunk: bytes):
+        self.size_in_bytes += len(chunk)
+        self._parse_text(self._text_decoder.decode(chunk))
+
+    def close(self) -> Any:
+        """The parsed response, with the validated nodes in its first connection."""
+        self._parse_text(self._text_decoder.decode(b"", final=True))
+        if self._is_in_scalar_node:
+            self._add_node()
+        elif self._is_in_node:
+            raise GraphQlError(
+                f"GraphQL response must include valid nodes but node {len(self._nodes) + 1} is cut short."
+            )
+        try:
+            if self._text_before_nodes is None:
+                return json.loads(self._text)
+            if not self._is_after_nodes:
+                raise GraphQlError(f"GraphQL response must end after {len(self._nodes)} nodes but is cut short.")
+            # NOTE: The remaining text starts with the end of the nodes, so that the nodes are empty in the result.
+            result = json.loads(self._text_before_nodes + "".join(self._texts_after_nodes))
+        except ValueError as error:
+            raise GraphQlError(f"GraphQL response must be valid JSON: {error}") from error
+        connection_map = _connection_map(result)
+        if connection_map is None:
+            raise GraphQlError("GraphQL response must include a connection with nodes and page info.")
+        connection_map["nodes"] = self._nodes
+        return result
+
+    def _parse_text(self, text: str):
+        """Parse `text`, which continues the text parsed before."""
+        if self._text_before_nodes is None:
+            self._text += text
+            nodes_start_match = _CONNECTION_NODES_START_REGEX.search(self._text)
+            if nodes_start_match is None:
+                return
+            self._text_before_nodes = self._text[: nodes_start_match.end()]
+            text = self._text[nodes_start_match.end() :]
+            self._text = ""
+        index = 0
+        while index < len(text):
+            if self._is_after_nodes:
+                self._texts_after_nodes.append(text[index:])
+                break
+            if not self._is_in_node:
+                index = _NODE_SEPARATOR_REGEX.match(text, index).end()
+                if index == len(text):
+                    break
+                if text[index] == "]":
+                    self._is_after_nodes = True
+                    continue
+                self._is_in_node = True
+                self._is_in_scalar_node = text[index] not in '{["'
+            node_end_index = self._node_end_index(text, index)
+            if node_end_index is None:
+                self._node_texts.append(text[index:])
+                break
+            self._node_texts.append(text[index:node_end_index])
+            self._add_node()
+            index = node_end_index
+
+    def _node_end_index(self, text: str, index: int) -> int | None:
+        """
+        The index in `text` after the end of the current node, if the node ends in it. The scan continues where the
+        scan of the previous text stopped.
+        """
+        if self._is_in_scalar_node:
+            scalar_end_match = _SCALAR_NODE_END_REGEX.search(text, index)
+            return scalar_end_match.start() if scalar_end_match is not None else None
+        while True:
+            if self._is_in_string:
+                if self._is_escaped:
+                    if index == len(text):
+                        return None
+                    index += 1
+                    self._is_escaped = False
+                index = _STRING_CONTENT_REGEX.match(text, index).end()
+                if index == len(text):
+                    return None
+                if text[index] == "\\":
+                    # NOTE: The escaped character is in the next text.
+                    self._is_escaped = True
+                    return None
+                index += 1
+                self._is_in_string = False
+            else:
+                token_match = _NESTING_OR_STRING_START_REGEX.search(text, index)
+                if token_match is None:
+                    return None
+                index = token_match.end()
+                token = token_match.group()
+                if token == '"':
+                    self._is_in_string = True
+                    continue
+                self._node_depth += 1 if token in "{[" else -1
+            if self._node_depth == 0:
+                return index
+
+    def _add_node(self):
+        node_text = "".join(self._node_texts)
+        self._node_texts = []
+        self._is_in_node = False
+        self._is_in_scalar_node = False
+        try:
+            node_map = json.loads(node_text)
+        except ValueError as error:
+            raise GraphQlError(f"GraphQL response must include valid nodes: {error}") from error
+        if isinstance(node_map, dict) and (self._node_map_filter is None or self._node_map_filter(node_map)):
+            self._nodes.extend(validated_nodes([node_map]))
+
+
+def _connection_map(value: Any) -> dict[str, Any] | None:
+    """The first map with nodes and page info in the raw `value` of a response, if any."""
+    if isinstance(value, dict):
+        if isinstance(value.get("nodes"), list) and "pageInfo" in value:
+            return value
+        for child_value in value.values():
+            result = _connection_map(child_value)
+            if result is not None:
+                return result
+    return None
+
+
+def _add_page_metrics(metrics: Metrics, query_name: str, response_map: dict[str, Any | None]):
+    metrics.increase(MetricName.PAGES_FETCHED, query=query_name.lower())
+    rate_limit_map = response_map.get("rateLimit")
+    if rate_limit_map is not None:
+        rate_limit_info = RateLimitInfo(**rate_limit_map)
+        metrics.increase(MetricName.API_COST_POINTS, rate_limit_info.cost)
+        metrics.set(MetricName.RATE_LIMIT_REMAINING_POINTS, rate_limit_info.remaining)
 
 
 def query_info_from_response_info(base_model: BaseModel) -> QueryInfo:
@@ -113,11 +916,18 @@ def query_info_from_response_info(base_model: BaseModel) -> QueryInfo:
 
 
 def checked_graphql_data_map(response: Response) -> dict[str, Any | None]:
+    _raise_for_http_status(response)
+    return checked_graphql_data_map_from_response_map(response.json())
+
+
+def _raise_for_http_status(response: Response):
     try:
         response.raise_for_status()
     except HTTPError as error:
         raise GraphQlError(error) from error
-    response_map = response.json()
+
+
+def checked_graphql_data_map_from_response_map(response_map: Any) -> dict[str, Any | None]:
     if not isinstance(response_map, dict):
         raise GraphQlError(f"GraphQL response must be a map but is: {response_map}.")
     errors = response_map.get("errors")
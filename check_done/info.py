@@ -1,7 +1,7 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
 from enum import StrEnum
-from typing import Any
+from typing import Annotated, Any
 
 from pydantic import AliasChoices, BaseModel, ConfigDict, Field, NonNegativeInt, field_validator
 
@@ -20,6 +20,14 @@ class ProjectItemState(StrEnum):
     OPEN = "OPEN"
 
 
+class StatusCheckRollupState(StrEnum):
+    ERROR = "ERROR"
+    EXPECTED = "EXPECTED"
+    FAILURE = "FAILURE"
+    PENDING = "PENDING"
+    SUCCESS = "SUCCESS"
+
+
 class GithubProjectItemType(StrEnum):
     issue = "Issue"
     pull_request = "PullRequest"
@@ -30,25 +38,43 @@ class _EmptyDict(BaseModel):
 
 
 class PageInfo(BaseModel):
-    endCursor: str
+    endCursor: str | None
     hasNextPage: bool
 
 
+class RateLimitInfo(BaseModel):
+    cost: NonNegativeInt
+    remaining: NonNegativeInt
+
+
 class QueryInfo(BaseModel):
     """The nested content of the query and its pagination info in a paginated GraphQL query with nodes"""
 
     nodes: list[Any]
     page_info: PageInfo = Field(alias="pageInfo")
+    total_count: NonNegativeInt | None = Field(alias="totalCount", default=None)
 
     @field_validator("nodes", mode="after", check_fields=True)
     def resolve_nodes(cls, nodes: list[Any]):
-        validated_nodes = []
-        for node in nodes:
-            node_type = node.get("__typename")
-            if node.get("__typename") in _NODE_TYPE_NAME_TO_INFO_CLASS_MAP:
-                node_model = _NODE_TYPE_NAME_TO_INFO_CLASS_MAP.get(node_type)
-                validated_nodes.append(node_model(**node))
-        return validated_nodes
+        return validated_nodes(nodes)
+
+
+def validated_nodes(nodes: list[dict[str, Any] | BaseModel | None]) -> list[BaseModel]:
+    """
+    The nodes with a known `__typename` validated to their matching model, skipping unknown types and `null` nodes,
+    for example from `nodes(ids: [...])` for IDs that do not exist (anymore). Nodes that already are models, for
+    example because they were validated while the response was streamed, are kept as they are.
+    """
+    result = []
+    for node in nodes:
+        if isinstance(node, BaseModel):
+            result.append(node)
+            continue
+        node_type = node.get("__typename") if node is not None else None
+        if node_type in _NODE_TYPE_NAME_TO_INFO_CLASS_MAP:
+            node_model = _NODE_TYPE_NAME_TO_INFO_CLASS_MAP.get(node_type)
+            result.append(node_model(**node))
+    return result
 
 
 class ProjectV2Node(BaseModel):
@@ -88,13 +114,19 @@ class MilestoneInfo(BaseModel):
     id: str
 
 
+class StatusCheckRollupInfo(BaseModel):
+    state: StatusCheckRollupState
+
+
 class LinkedProjectItemNode(BaseModel):
+    id: str | None = None
     number: NonNegativeInt
     title: str
 
 
 class LinkedProjectItemInfo(BaseModel):
     nodes: list[LinkedProjectItemNode]
+    page_info: PageInfo | None = Field(alias="pageInfo", default=None)
 
 
 # NOTE: For simplicity, both issues and pull requests are treated the same under a generic "project item" type.
@@ -104,6 +136,8 @@ class ProjectItemInfo(BaseModel):
 
     # Shared between Issues and Pull Requests.
     typename: GithubProjectItemType = Field(alias="__typename")
+    id: str | None = None
+    updated_at: str | None = Field(alias="updatedAt", default=None)
     assignees: AssigneesInfo
     body_html: str = Field(alias="bodyHTML", default=None)
     closed: bool
@@ -114,10 +148,27 @@ class ProjectItemInfo(BaseModel):
 
     # Only set for pull requests
     closing_issues_references: LinkedProjectItemInfo = Field(alias="closingIssuesReferences", default=None)
+    merged: bool | None = None
+    # NOTE: None means that the pull request has no status checks.
+    status_check_rollup: StatusCheckRollupInfo | None = Field(alias="statusCheckRollup", default=None)
+
+
+class ProjectItemReferenceInfo(BaseModel):
+    """Just enough of an issue or pull request to notice that it changed, without the content needed for checking."""
+
+    typename: GithubProjectItemType = Field(alias="__typename")
+    id: str
+    updated_at: str = Field(alias="updatedAt")
+    # NOTE: Status checks can finish without changing the updatedAt of their pull request.
+    status_check_rollup: StatusCheckRollupInfo | None = Field(alias="statusCheckRollup", default=None)
 
 
 class ProjectV2ItemNode(BaseModel):
-    content: ProjectItemInfo | _EmptyDict = None
+    id: str | None = None
+    updated_at: str | None = Field(alias="updatedAt", default=None)
+    content: Annotated[ProjectItemInfo | ProjectItemReferenceInfo | _EmptyDict, Field(union_mode="left_to_right")] = (
+        None
+    )
     field_value_by_name: ProjectV2ItemProjectStatusInfo | None = Field(alias="fieldValueByName", default=None)
     typename: str = Field(alias="__typename")
 
@@ -126,6 +177,68 @@ class NodeByIdInfo(BaseModel):
     node: ProjectV2Node
 
 
+class ProjectReferenceInfo(BaseModel):
+    id: str
+
+
+class ContentProjectItemNode(BaseModel):
+    id: str
+    project: ProjectReferenceInfo
+    field_value_by_name: ProjectV2ItemProjectStatusInfo | None = Field(alias="fieldValueByName", default=None)
+
+
+class ContentProjectItemsInfo(BaseModel):
+    nodes: list[ContentProjectItemNode]
+
+
+class ProjectItemWithProjectItemsInfo(ProjectItemInfo):
+    """An issue or pull request together with the project items it is part of."""
+
+    project_items: ContentProjectItemsInfo = Field(alias="projectItems")
+
+
+class ProjectItemContentByIdInfo(BaseModel):
+    node: Annotated[ProjectItemWithProjectItemsInfo | _EmptyDict | None, Field(union_mode="left_to_right")] = None
+
+
+class PullRequestReferenceInfo(BaseModel):
+    id: str
+
+
+class AssociatedPullRequestsInfo(BaseModel):
+    nodes: list[PullRequestReferenceInfo]
+
+
+class CommitInfo(BaseModel):
+    associated_pull_requests: AssociatedPullRequestsInfo = Field(alias="associatedPullRequests")
+
+
+class RepositoryWithCommitInfo(BaseModel):
+    commit: Annotated[CommitInfo | _EmptyDict | None, Field(alias="object", union_mode="left_to_right")] = None
+
+
+class PullRequestsByCommitInfo(BaseModel):
+    """The pull requests a commit is part of, for example to re-check them once the status checks of it finished."""
+
+    repository: RepositoryWithCommitInfo | None = None
+
+
+class NodesByIdsInfo(BaseModel):
+    nodes: list[Any]
+
+    @field_validator("nodes", mode="after")
+    def resolve_nodes(cls, nodes: list[Any]):
+        return validated_nodes(nodes)
+
+
+class ClosableNode(BaseModel):
+    """Just enough of an issue referenced by another project item to check whether it is closed."""
+
+    id: str
+    typename: str = Field(alias="__typename")
+    closed: bool
+
+
 class _ProjectsV2Info(BaseModel):
     projects_v2: QueryInfo = Field(alias="projectsV2")
 
@@ -140,14 +253,47 @@ class ProjectOwnerInfo(BaseModel):
     project_owner: _ProjectsV2Info = Field(validation_alias=AliasChoices("organization", "user"))
 
 
+class _ProjectItemCountInfo(BaseModel):
+    total_count: NonNegativeInt = Field(alias="totalCount")
+
+
+class _ProjectWithItemCountNode(BaseModel):
+    items: _ProjectItemCountInfo
+
+
+class ProjectItemCountInfo(BaseModel):
+    node: _ProjectWithItemCountNode
+
+
+class DryRunInfo(BaseModel):
+    """The result of a query with `rateLimit(dryRun: true)`, which only tells what the query would cost."""
+
+    rate_limit: RateLimitInfo = Field(alias="rateLimit")
+
+
+class ProjectMetadataInfo(BaseModel):
+    """
+    The stable details of a project needed to page through its items, which are cached between runs because they
+    almost never change.
+    """
+
+    project_id: str
+    project_status_option_id: str
+    status_option_ids: list[str]
+    # NOTE: Only resolved for the project statuses of configured project status rules.
+    project_status_name_to_option_id_map: dict[str, str] = {}
+
+
 class _NodeTypeName(StrEnum):
     ProjectV2 = "ProjectV2"
     ProjectV2SingleSelectField = "ProjectV2SingleSelectField"
     ProjectV2Item = "ProjectV2Item"
+    Issue = "Issue"
 
 
 _NODE_TYPE_NAME_TO_INFO_CLASS_MAP = {
     _NodeTypeName.ProjectV2.value: ProjectV2Node,
     _NodeTypeName.ProjectV2SingleSelectField.value: ProjectV2SingleSelectFieldNode,
     _NodeTypeName.ProjectV2SingleSelectField.ProjectV2Item: ProjectV2ItemNode,
+    _NodeTypeName.Issue.value: ClosableNode,
 }
@@ -0,0 +1,178 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_TEXT_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricType(StrEnum):
+    counter = "counter"
+    gauge = "gauge"
+
+
+class MetricName(StrEnum):
+    API_COST_POINTS = "check_done_api_cost_points_total"
+    AUTHENTICATION_DURATION_SECONDS = "check_done_authentication_duration_seconds"
+    ITEMS_CHECKED = "check_done_items_checked_total"
+    LAST_RUN_SUCCESS = "check_done_last_run_success"
+    LAST_RUN_TIMESTAMP_SECONDS = "check_done_last_run_timestamp_seconds"
+    PAGES_FETCHED = "check_done_pages_fetched_total"
+    PAGE_SIZE = "check_done_page_size_entries"
+    RATE_LIMIT_REMAINING_POINTS = "check_done_rate_limit_remaining_points"
+    RUN_DURATION_SECONDS = "check_done_run_duration_seconds"
+    WARNINGS = "check_done_warnings_total"
+
+
+_METRIC_NAME_TO_TYPE_AND_HELP_MAP = {
+    MetricName.API_COST_POINTS: (MetricType.counter, "GraphQL rate limit points spent by queries."),
+    MetricName.AUTHENTICATION_DURATION_SECONDS: (
+        MetricType.gauge,
+        "Duration of the last resolution of an organization access token.",
+    ),
+    MetricName.ITEMS_CHECKED: (MetricType.counter, "Project items checked for warnings."),
+    MetricName.LAST_RUN_SUCCESS: (MetricType.gauge, "Whether the last run completed without error (1) or not (0)."),
+    MetricName.LAST_RUN_TIMESTAMP_SECONDS: (MetricType.gauge, "Unix time when the last run ended."),
+    MetricName.PAGES_FETCHED: (MetricType.counter, "GraphQL result pages fetched, by query."),
+    MetricName.PAGE_SIZE: (MetricType.gauge, "Entries requested per page at the end of the run, by query."),
+    MetricName.RATE_LIMIT_REMAINING_POINTS: (
+        MetricType.gauge,
+        "GraphQL rate limit points remaining in the current window.",
+    ),
+    MetricName.RUN_DURATION_SECONDS: (MetricType.gauge, "Duration of the last run."),
+    MetricName.WARNINGS: (MetricType.counter, "Warnings found in project items, by rule."),
+}
+
+
+class Metrics:
+    """Thread safe collection of metric samples that can be rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._name_to_labels_to_value_map: dict[MetricName, dict[tuple[tuple[str, str], ...], float]] = {}
+
+    def increase(self, name: MetricName, amount: float = 1, **labels: str):
+        assert _METRIC_NAME_TO_TYPE_AND_HELP_MAP[name][0] is MetricType.counter
+        label_items = _sorted_label_items(labels)
+        with self._lock:
+            labels_to_value_map = self._name_to_labels_to_value_map.setdefault(name, {})
+            labels_to_value_map[label_items] = labels_to_value_map.get(label_items, 0) + amount
+
+    def set(self, name: MetricName, value: float, **labels: str):
+        assert _METRIC_NAME_TO_TYPE_AND_HELP_MAP[name][0] is MetricType.gauge
+        label_items = _sorted_label_items(labels)
+        with self._lock:
+            self._name_to_labels_to_value_map.setdefault(name, {})[label_items] = value
+
+    def value(self, name: MetricName, **labels: str) -> float | None:
+        with self._lock:
+            return self._name_to_labels_to_value_map.get(name, {}).get(_sorted_label_items(labels))
+
+    @contextmanager
+    def measured_duration(self, name: MetricName, **labels: str) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.set(name, time.perf_counter() - start_time, **labels)
+
+    def prometheus_text(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted(self._name_to_labels_to_value_map):
+                metric_type, metric_help = _METRIC_NAME_TO_TYPE_AND_HELP_MAP[name]
+                lines.append(f"# HELP {name} {metric_help}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for label_items, value in sorted(self._name_to_labels_to_value_map[name].items()):
+                    lines.append(f"{name}{_prometheus_labels(label_items)} {value:g}")
+        return "".join(f"{line}\n" for line in lines)
+
+
+def _sorted_label_items(labels: dict[str, str]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((label_name, str(label_value)) for label_name, label_value in labels.items()))
+
+
+def _prometheus_labels(label_items: tuple[tuple[str, str], ...]) -> str:
+    if len(label_items) == 0:
+        return ""
+    escaped_labels = ",".join(
+        f'{label_name}="{_escaped_label_value(label_value)}"' for label_name, label_value in label_items
+    )
+    return f"{{{escaped_labels}}}"
+
+
+def _escaped_label_value(label_value: str) -> str:
+    return label_value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+@contextmanager
+def measured_run(metrics: Metrics | None, metrics_file: Path | None = None) -> Iterator[None]:
+    """
+    Record the duration, success and end time of a run in `metrics`, and write them to `metrics_file` at the end of
+    the run, even if it failed.
+    """
+    if metrics is None:
+        yield
+        return
+    is_success = False
+    try:
+        with metrics.measured_duration(MetricName.RUN_DURATION_SECONDS):
+            yield
+        is_success = True
+    finally:
+        metrics.set(MetricName.LAST_RUN_SUCCESS, int(is_success))
+        metrics.set(MetricName.LAST_RUN_TIMESTAMP_SECONDS, time.time())
+        if metrics_file is not None:
+            write_prometheus_text_file(metrics, metrics_file)
+
+
+def write_prometheus_text_file(metrics: Metrics, path: Path):
+    """
+    Write the metrics to a file for the textfile collector of the node exporter. The file is replaced atomically so
+    the collector never reads a partially written file.
+    """
+    folder = path.absolute().parent
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=folder, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as temp_file:
+        temp_file.write(metrics.prometheus_text())
+    try:
+        Path(temp_file.name).replace(path)
+    except OSError:
+        os.remove(temp_file.name)
+        raise
+
+
+def started_metrics_http_server(metrics: Metrics, port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    """Serve the metrics under any path in a background thread until `shutdown()` is called on the result."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_TEXT_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # noqa: A002
+            logger.debug(format, *args)
+
+    result = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    threading.Thread(target=result.serve_forever, name="check_done_metrics", daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{result.server_port}/metrics")
+    return result
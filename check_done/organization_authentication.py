@@ -1,33 +1,103 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
+import threading
 import time
 
-import jwt
 import requests
-from requests import Session
+from requests import PreparedRequest, Session
+from requests.auth import AuthBase
 
-from check_done.graphql import HttpBearerAuth
+from check_done.graphql import DeadlineExceededError, HttpBearerAuth, RequestTimeouts, mount_request_timeouts
+from check_done.metrics import MetricName, Metrics
 
 _SECONDS_PER_MINUTE = 60
-_ISSUED_AT = int(time.time())
-_EXPIRES_AT = int(time.time()) + (10 * _SECONDS_PER_MINUTE)
+_JWT_TOKEN_DURATION_IN_SECONDS = 10 * _SECONDS_PER_MINUTE
+# NOTE: Installation access tokens of GitHub apps expire after one hour, so renew them a bit earlier.
+_ACCESS_TOKEN_RENEWAL_INTERVAL_IN_SECONDS = 50 * _SECONDS_PER_MINUTE
 
 
 class AuthenticationError(Exception):
     """Error raised due to failed JWT authentication process."""
 
 
-def resolve_organization_access_token(organization_name: str, github_app_id: str, github_app_private_key: str) -> str:
+class OrganizationAccessTokenAuth(AuthBase):
+    """
+    Bearer authentication with an organization access token that is resolved on the first request and renewed before
+    it expires, so that long-running modes like `--watch` can keep using the same session.
+    """
+
+    def __init__(
+        self,
+        organization_name: str,
+        github_app_id: str,
+        github_app_private_key: str,
+        metrics: Metrics | None = None,
+        request_timeouts: RequestTimeouts | None = None,
+    ):
+        self._organization_name = organization_name
+        self._github_app_id = github_app_id
+        self._github_app_private_key = github_app_private_key
+        self._metrics = metrics
+        self._request_timeouts = request_timeouts
+        self._lock = threading.Lock()
+        self._access_token = None
+        self._renewal_time = 0.0
+
+    @property
+    def access_token(self) -> str:
+        with self._lock:
+            if self._access_token is None or time.monotonic() >= self._renewal_time:
+                self._access_token = resolve_organization_access_token(
+                    self._organization_name,
+                    self._github_app_id,
+                    self._github_app_private_key,
+                    self._metrics,
+                    self._request_timeouts,
+                )
+                self._renewal_time = time.monotonic() + _ACCESS_TOKEN_RENEWAL_INTERVAL_IN_SECONDS
+            return self._access_token
+
+    def __call__(self, request: PreparedRequest) -> PreparedRequest:
+        request.headers["Authorization"] = "Bearer " + self.access_token
+        return request
+
+
+def resolve_organization_access_token(
+    organization_name: str,
+    github_app_id: str,
+    github_app_private_key: str,
+    metrics: Metrics | None = None,
+    request_timeouts: RequestTimeouts | None = None,
+) -> str:
     """
     Generates the necessary access token for an organization from the installed GitHub app instance in said organization
     """
+    if metrics is None:
+        return _resolved_organization_access_token(
+            organization_name, github_app_id, github_app_private_key, request_timeouts
+        )
+    with metrics.measured_duration(MetricName.AUTHENTICATION_DURATION_SECONDS):
+        return _resolved_organization_access_token(
+            organization_name, github_app_id, github_app_private_key, request_timeouts
+        )
+
+
+def _resolved_organization_access_token(
+    organization_name: str,
+    github_app_id: str,
+    github_app_private_key: str,
+    request_timeouts: RequestTimeouts | None = None,
+) -> str:
     jwt_token = generate_jwt_token(github_app_id, github_app_private_key)
     session = requests.Session()
     session.headers = {"Accept": "application/vnd.github+json"}
     session.auth = HttpBearerAuth(jwt_token)
+    mount_request_timeouts(session, request_timeouts)
     try:
         github_app_installation_id = resolve_github_app_installation_id(session, organization_name)
         result = resolve_access_token_from_github_app_installation_id(session, github_app_installation_id)
+    except DeadlineExceededError:
+        raise
     except Exception as error:
         raise AuthenticationError(
             f"Cannot resolve organization access token from JWT authentication process: {error}"
@@ -37,10 +107,17 @@ def resolve_organization_access_token(organization_name: str, github_app_id: str
 
 def generate_jwt_token(github_app_id: str, github_app_private_key: str) -> str:
     """Generates a JWT token for authentication with GitHub."""
+    # NOTE: Import lazily because the underlying cryptography takes long to import, and only organization projects
+    #  need it.
+    import jwt
+
+    # NOTE: The times are computed on each call so that long-running modes like `--watch` can
+    #  authenticate again after the token expired.
+    issued_at = int(time.time())
     try:
         payload = {
-            "exp": _EXPIRES_AT,
-            "iat": _ISSUED_AT,
+            "exp": issued_at + _JWT_TOKEN_DURATION_IN_SECONDS,
+            "iat": issued_at,
             "iss": github_app_id,
         }
         return jwt.encode(payload, github_app_private_key, algorithm="RS256")
@@ -0,0 +1,271 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import json
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from enum import StrEnum
+from typing import Any, NamedTuple, TextIO
+
+import check_done
+from check_done.graphql import DeadlineExceededError
+from check_done.info import ProjectItemInfo
+from check_done.metrics import Metrics
+from check_done.warning_checks import (
+    POSSIBLE_WARNINGS,
+    CompactProjectItem,
+    compact_project_item,
+    sentence_from_project_item_warning_reasons,
+    violated_rule_id_to_warning_reason_map,
+    warning_rule_id,
+)
+
+_SARIF_SCHEMA_URI = "https://json.schemastore.org/sarif-2.1.0.json"
+_SARIF_VERSION = "2.1.0"
+_CHECK_DONE_INFORMATION_URI = "https://github.com/siisurit/check_done"
+
+logger = logging.getLogger(__name__)
+
+
+class OutputFormat(StrEnum):
+    json = "json"
+    jsonl = "jsonl"
+    sarif = "sarif"
+    text = "text"
+
+
+class ProjectItemCheckRecord(NamedTuple):
+    """The result of checking a single project item, independent of the output format."""
+
+    project: str
+    repository: str
+    number: int
+    type: str
+    title: str
+    rule_ids: list[str]
+    warning_reasons: list[str]
+
+
+def project_item_check_records(
+    project_url: str, project_items: Iterable[ProjectItemInfo | CompactProjectItem], metrics: Metrics | None = None
+) -> Iterator[ProjectItemCheckRecord]:
+    """A record for each project item, checked only when the record is requested."""
+    for project_item in project_items:
+        checked_project_item = compact_project_item(project_item)
+        rule_id_to_warning_reason_map = violated_rule_id_to_warning_reason_map(checked_project_item, metrics)
+        yield ProjectItemCheckRecord(
+            project=project_url,
+            repository=checked_project_item.repository_name,
+            number=checked_project_item.number,
+            type=str(checked_project_item.typename),
+            title=checked_project_item.title,
+            rule_ids=list(rule_id_to_warning_reason_map.keys()),
+            warning_reasons=list(rule_id_to_warning_reason_map.values()),
+        )
+
+
+class WarningLimit:
+    """
+    The maximum number of warnings to check for, after which the remaining project items are not checked anymore,
+    for example to only find out whether there are any warnings at all.
+    """
+
+    def __init__(self, max_warning_count: int):
+        self.max_warning_count = max_warning_count
+        self.warning_count = 0
+
+    @property
+    def is_reached(self) -> bool:
+        return self.warning_count >= self.max_warning_count
+
+    def add(self, warning_count: int):
+        self.warning_count += warning_count
+
+    def limited_project_item_check_records(
+        self, project_item_check_records: Iterable[ProjectItemCheckRecord]
+    ) -> Iterator[ProjectItemCheckRecord]:
+        """The records up to the one with which the limit is reached."""
+        for project_item_check_record in project_item_check_records:
+            yield project_item_check_record
+            self.add(len(project_item_check_record.rule_ids))
+            if self.is_reached:
+                break
+
+
+class ScanUntilDeadline:
+    """
+    The done project items of a scan until the deadline of the run was exceeded, after which the scan stops instead
+    of failing, so that the project items found so far can still be reported.
+    """
+
+    def __init__(self, done_project_items: Iterator[CompactProjectItem]):
+        self._done_project_items = done_project_items
+        self.is_deadline_exceeded = False
+
+    def __iter__(self) -> Iterator[CompactProjectItem]:
+        try:
+            yield from self._done_project_items
+        except DeadlineExceededError as error:
+            logger.debug(f"Stopping scan: {error}")
+            self.is_deadline_exceeded = True
+
+    def close(self):
+        self._done_project_items.close()
+
+
+def text_log_entries(
+    done_project_items: Iterable[ProjectItemInfo | CompactProjectItem],
+    metrics: Metrics | None = None,
+    warning_limit: WarningLimit | None = None,
+    scan_until_deadline: ScanUntilDeadline | None = None,
+) -> Iterator[tuple[int, str]]:
+    """
+    The log level and message for each warning, or for the outcome if there are no warnings. With a `warning_limit`,
+    the remaining project items are not checked anymore once it is reached. With `scan_until_deadline` as
+    `done_project_items`, the outcome tells if the deadline of the run stopped the scan early.
+    """
+    done_project_items_count = 0
+    warnings = []
+    for project_item in done_project_items:
+        done_project_items_count += 1
+        checked_project_item = compact_project_item(project_item)
+        warning_reasons = list(violated_rule_id_to_warning_reason_map(checked_project_item, metrics).values())
+        if len(warning_reasons) >= 1:
+            warnings.append(sentence_from_project_item_warning_reasons(checked_project_item, warning_reasons))
+            if warning_limit is not None:
+                warning_limit.add(len(warning_reasons))
+                if warning_limit.is_reached:
+                    break
+    is_deadline_exceeded = scan_until_deadline is not None and scan_until_deadline.is_deadline_exceeded
+    if is_deadline_exceeded:
+        for warning in warnings:
+            yield logging.WARNING, warning
+        yield (
+            logging.WARNING,
+            f"Stopped checking after {done_project_items_count!s} project items because the deadline of the run was "
+            f"exceeded, so the result is incomplete.",
+        )
+    elif done_project_items_count == 0:
+        yield logging.INFO, "Nothing to check. Project has no items in the selected project status."
+    elif len(warnings) == 0:
+        yield (
+            logging.INFO,
+            f"All project items are correct, {done_project_items_count!s} checked in the selected project status. ",
+        )
+    else:
+        for warning in warnings:
+            yield logging.WARNING, warning
+        if warning_limit is not None and warning_limit.is_reached:
+            yield (
+                logging.INFO,
+                f"Stopped checking after {done_project_items_count!s} project items because the maximum of "
+                f"{warning_limit.max_warning_count!s} warnings was reached.",
+            )
+
+
+def write_project_item_check_records(
+    output_format: OutputFormat, project_item_check_records: Iterable[ProjectItemCheckRecord], target: TextIO
+):
+    """
+    Write the records to `target` in `output_format`, each one as soon as it is available, so that consumers can
+    start processing before all project items are checked.
+    """
+    write_function = _OUTPUT_FORMAT_TO_WRITE_FUNCTION_MAP.get(output_format)
+    if write_function is None:
+        raise ValueError(
+            f"Output format must be one of {sorted(_OUTPUT_FORMAT_TO_WRITE_FUNCTION_MAP)} but is: {output_format!r}"
+        )
+    write_function(project_item_check_records, target)
+
+
+def _write_jsonl(project_item_check_records: Iterable[ProjectItemCheckRecord], target: TextIO):
+    for project_item_check_record in project_item_check_records:
+        target.write(json.dumps(project_item_check_record._asdict()) + "\n")
+        target.flush()
+
+
+def _write_json(project_item_check_records: Iterable[ProjectItemCheckRecord], target: TextIO):
+    _write_json_array(
+        (project_item_check_record._asdict() for project_item_check_record in project_item_check_records),
+        target,
+        "[",
+        "]\n",
+    )
+
+
+def _write_sarif(project_item_check_records: Iterable[ProjectItemCheckRecord], target: TextIO):
+    sarif_map = {
+        "$schema": _SARIF_SCHEMA_URI,
+        "version": _SARIF_VERSION,
+        "runs": [
+            {
+                "tool": {
+                    "driver": {
+                        "name": "check_done",
+                        "version": check_done.__version__,
+                        "informationUri": _CHECK_DONE_INFORMATION_URI,
+                        "rules": [{"id": warning_rule_id(possible_warning)} for possible_warning in POSSIBLE_WARNINGS],
+                    }
+                },
+                "results": [],
+            }
+        ],
+    }
+    # NOTE: The results are the only part of the document that depends on the project items, so everything around
+    #  them is written as prefix and suffix, and the results are streamed in between.
+    sarif_text = json.dumps(sarif_map)
+    results_start = sarif_text.index('"results": [') + len('"results": [')
+    sarif_results = (
+        _sarif_result_map(project_item_check_record, rule_id, warning_reason)
+        for project_item_check_record in project_item_check_records
+        for rule_id, warning_reason in zip(
+            project_item_check_record.rule_ids, project_item_check_record.warning_reasons, strict=True
+        )
+    )
+    _write_json_array(sarif_results, target, sarif_text[:results_start], sarif_text[results_start:] + "\n")
+
+
+def _sarif_result_map(
+    project_item_check_record: ProjectItemCheckRecord, rule_id: str, warning_reason: str
+) -> dict[str, Any]:
+    return {
+        "ruleId": rule_id,
+        "level": "warning",
+        "message": {"text": f"Project item should {warning_reason}."},
+        "locations": [
+            {
+                "logicalLocations": [
+                    {
+                        "fullyQualifiedName": (
+                            f"{project_item_check_record.repository}#{project_item_check_record.number}"
+                        ),
+                        "kind": "object",
+                    }
+                ]
+            }
+        ],
+        "properties": {
+            "project": project_item_check_record.project,
+            "repository": project_item_check_record.repository,
+            "number": project_item_check_record.number,
+            "type": project_item_check_record.type,
+            "title": project_item_check_record.title,
+        },
+    }
+
+
+def _write_json_array(items: Iterable[Any], target: TextIO, prefix: str, suffix: str):
+    target.write(prefix)
+    separator = "\n"
+    for item in items:
+        target.write(separator + json.dumps(item))
+        target.flush()
+        separator = ",\n"
+    target.write(suffix if separator == "\n" else "\n" + suffix)
+    target.flush()
+
+
+_OUTPUT_FORMAT_TO_WRITE_FUNCTION_MAP: dict[OutputFormat, Callable[[Iterable[ProjectItemCheckRecord], TextIO], None]] = {
+    OutputFormat.json: _write_json,
+    OutputFormat.jsonl: _write_jsonl,
+    OutputFormat.sarif: _write_sarif,
+}
@@ -0,0 +1,447 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import hashlib
+import hmac
+import json
+import logging
+import threading
+from collections.abc import Mapping
+from enum import StrEnum
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from requests import RequestException, Session
+
+from check_done.config import ConfigurationInfo
+from check_done.done_project_items_info import (
+    ProjectItemFilter,
+    complete_project_item_infos,
+    github_auth_from_configuration_info,
+    is_project_item_in_project_status,
+    loaded_closing_issue_id_to_is_closed_map,
+    new_closing_issue_loader,
+    project_id_and_project_status_option_id_to_rule_ids_map,
+    project_item_filter_from_configuration_info,
+    project_item_filter_query_arguments,
+    rule_ids_for_project_item,
+)
+from check_done.graphql import (
+    GraphQlError,
+    GraphQlQuery,
+    new_github_session,
+    query_info,
+    query_infos,
+    query_nodes_by_ids,
+)
+from check_done.info import (
+    CommitInfo,
+    ContentProjectItemNode,
+    NodeByIdInfo,
+    ProjectItemContentByIdInfo,
+    ProjectItemInfo,
+    ProjectItemWithProjectItemsInfo,
+    ProjectV2ItemNode,
+    PullRequestsByCommitInfo,
+)
+from check_done.metrics import PROMETHEUS_TEXT_CONTENT_TYPE, Metrics
+from check_done.organization_authentication import AuthenticationError
+from check_done.warning_checks import (
+    WarningsDelta,
+    add_to_warnings_delta,
+    compact_project_item,
+    log_warnings_delta,
+    warning_for_project_item,
+)
+
+_EVENT_HEADER = "X-GitHub-Event"
+# NOTE: GitHub caps the payloads of webhook deliveries at 25 MB.
+_MAX_WEBHOOK_BODY_SIZE_IN_BYTES = 25 * 1024 * 1024
+_SIGNATURE_HEADER = "X-Hub-Signature-256"
+_SIGNATURE_PREFIX = "sha256="
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookEvent(StrEnum):
+    check_run = "check_run"
+    check_suite = "check_suite"
+    issues = "issues"
+    ping = "ping"
+    projects_v2_item = "projects_v2_item"
+    pull_request = "pull_request"
+    status = "status"
+
+
+_CONTENT_WEBHOOK_EVENT_TO_PAYLOAD_KEY_MAP = {
+    WebhookEvent.issues: "issue",
+    WebhookEvent.pull_request: "pull_request",
+}
+# NOTE: These change the state of an issue, and so the warnings of the pull requests closing it.
+_ISSUE_STATE_CHANGING_ACTIONS = {"closed", "reopened"}
+
+
+def is_valid_webhook_signature(webhook_secret: str, body: bytes, signature: str | None) -> bool:
+    """Whether the `X-Hub-Signature-256` header of a webhook delivery matches the HMAC of its body."""
+    if signature is None or not signature.startswith(_SIGNATURE_PREFIX):
+        return False
+    expected_signature = _SIGNATURE_PREFIX + hmac.new(webhook_secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected_signature, signature)
+
+
+class ProjectWarningsIndex:
+    """The current warnings of project items, by project and project item."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._check_count = 0
+        self._project_id_to_project_item_id_to_warning_map: dict[str, dict[str, str]] = {}
+        self._project_id_to_project_item_id_to_check_number_map: dict[str, dict[str, int]] = {}
+
+    def new_check_number(self) -> int:
+        """
+        The number of a check starting now, to pass to `updated()`. Checks run concurrently and might finish in a
+        different order than they started, so the result of a check is ignored if a later started one already updated
+        the warning of the project item.
+        """
+        with self._lock:
+            self._check_count += 1
+            return self._check_count
+
+    def updated(
+        self, project_id: str, project_item_id: str, warning: str | None, check_number: int | None = None
+    ) -> WarningsDelta:
+        result = WarningsDelta([], [])
+        with self._lock:
+            if check_number is not None:
+                project_item_id_to_check_number_map = (
+                    self._project_id_to_project_item_id_to_check_number_map.setdefault(project_id, {})
+                )
+                if check_number < project_item_id_to_check_number_map.get(project_item_id, 0):
+                    logger.debug(f"Ignoring outdated check of project item: {project_item_id}")
+                    return result
+                project_item_id_to_check_number_map[project_item_id] = check_number
+            project_item_id_to_warning_map = self._project_id_to_project_item_id_to_warning_map.setdefault(
+                project_id, {}
+            )
+            previous_warning = project_item_id_to_warning_map.get(project_item_id)
+            if warning is None:
+                project_item_id_to_warning_map.pop(project_item_id, None)
+            else:
+                project_item_id_to_warning_map[project_item_id] = warning
+        add_to_warnings_delta(result, previous_warning, warning)
+        return result
+
+    def warnings(self, project_id: str) -> list[str]:
+        with self._lock:
+            return list(self._project_id_to_project_item_id_to_warning_map.get(project_id, {}).values())
+
+
+class WebhookReceiver:
+    """
+    Re-checks only the project items affected by a webhook event, using a few small queries instead of a scan of the
+    whole project: the project item or issue or pull request of the event, the pull requests closing an issue that
+    was closed or reopened, and the pull requests of a commit whose status checks finished.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        project_owner_name: str,
+        project_id: str,
+        project_status_option_id: str | Mapping[str, tuple[str, ...] | None],
+        warnings_index: ProjectWarningsIndex | None = None,
+        metrics: Metrics | None = None,
+        project_item_filter: ProjectItemFilter | None = None,
+    ):
+        self._session = session
+        self._project_owner_name = project_owner_name
+        self.project_id = project_id
+        self._project_status_option_id = project_status_option_id
+        self.warnings_index = warnings_index if warnings_index is not None else ProjectWarningsIndex()
+        self._metrics = metrics
+        self._project_item_filter = project_item_filter
+        self._lock = threading.Lock()
+        self._done_pull_request_id_to_closing_issue_ids_map: dict[str, tuple[str, ...]] = {}
+
+    def checked_all_project_items(self) -> WarningsDelta:
+        check_number = self.warnings_index.new_check_number()
+        project_item_infos = query_infos(
+            NodeByIdInfo,
+            GraphQlQuery.PROJECT_V2_ITEMS.name,
+            self._session,
+            self._project_owner_name,
+            self.project_id,
+            self._metrics,
+            is_parallel=True,
+            **project_item_filter_query_arguments(self._project_item_filter),
+        )
+        closing_issue_id_to_is_closed_map = self._closing_issue_id_to_is_closed_map(
+            [
+                project_item_info.content
+                for project_item_info in project_item_infos
+                if isinstance(project_item_info.content, ProjectItemInfo)
+                and is_project_item_in_project_status(project_item_info, self._project_status_option_id)
+            ]
+        )
+        result = WarningsDelta([], [])
+        for project_item_info in project_item_infos:
+            warning = (
+                self._warning_if_done(project_item_info.content, project_item_info, closing_issue_id_to_is_closed_map)
+                if isinstance(project_item_info.content, ProjectItemInfo)
+                else None
+            )
+            _extend_warnings_delta(
+                result, self.warnings_index.updated(self.project_id, project_item_info.id, warning, check_number)
+            )
+        return result
+
+    def handled_event(self, event_name: str, payload: dict[str, Any]) -> WarningsDelta:
+        check_number = self.warnings_index.new_check_number()
+        if event_name == WebhookEvent.projects_v2_item:
+            result = self._handled_project_item_event(payload, check_number)
+        elif event_name in _CONTENT_WEBHOOK_EVENT_TO_PAYLOAD_KEY_MAP:
+            content_node_id = payload[_CONTENT_WEBHOOK_EVENT_TO_PAYLOAD_KEY_MAP[event_name]]["node_id"]
+            result = self._handled_content_event(content_node_id, check_number)
+            if event_name == WebhookEvent.issues and payload["action"] in _ISSUE_STATE_CHANGING_ACTIONS:
+                for pull_request_id in self._done_pull_request_ids_closing(content_node_id):
+                    _extend_warnings_delta(result, self._handled_content_event(pull_request_id, check_number))
+        elif event_name == WebhookEvent.status:
+            result = self._handled_commit_event(payload["repository"]["full_name"], payload["sha"], check_number)
+        elif event_name in (WebhookEvent.check_run, WebhookEvent.check_suite):
+            # NOTE: Only the completion of status checks changes whether they passed.
+            result = (
+                self._handled_commit_event(
+                    payload["repository"]["full_name"], payload[event_name]["head_sha"], check_number
+                )
+                if payload["action"] == "completed"
+                else WarningsDelta([], [])
+            )
+        else:
+            result = WarningsDelta([], [])
+        return result
+
+    def _handled_project_item_event(self, payload: dict[str, Any], check_number: int) -> WarningsDelta:
+        project_item_map = payload["projects_v2_item"]
+        if project_item_map["project_node_id"] != self.project_id:
+            return WarningsDelta([], [])
+        project_item_id = project_item_map["node_id"]
+        if payload["action"] == "deleted":
+            return self.warnings_index.updated(self.project_id, project_item_id, None, check_number)
+        project_item_infos = query_nodes_by_ids(
+            GraphQlQuery.PROJECT_V2_ITEMS_BY_IDS.name, self._session, [project_item_id], self._metrics
+        )
+        project_item_info = project_item_infos[0] if len(project_item_infos) >= 1 else None
+        warning = (
+            self._warning_if_done(
+                project_item_info.content,
+                project_item_info,
+                self._closing_issue_id_to_is_closed_map([project_item_info.content]),
+            )
+            if project_item_info is not None and isinstance(project_item_info.content, ProjectItemInfo)
+            else None
+        )
+        return self.warnings_index.updated(self.project_id, project_item_id, warning, check_number)
+
+    def _handled_content_event(self, content_node_id: str, check_number: int) -> WarningsDelta:
+        content_info = query_info(
+            ProjectItemContentByIdInfo,
+            GraphQlQuery.PROJECT_ITEM_CONTENT_BY_ID.name,
+            self._session,
+            {"id": content_node_id},
+            self._metrics,
+        ).node
+        result = WarningsDelta([], [])
+        if isinstance(content_info, ProjectItemWithProjectItemsInfo):
+            closing_issue_id_to_is_closed_map = self._closing_issue_id_to_is_closed_map([content_info])
+            for project_item_info in content_info.project_items.nodes:
+                if project_item_info.project.id == self.project_id:
+                    warning = self._warning_if_done(content_info, project_item_info, closing_issue_id_to_is_closed_map)
+                    warnings_delta = self.warnings_index.updated(
+                        self.project_id, project_item_info.id, warning, check_number
+                    )
+                    _extend_warnings_delta(result, warnings_delta)
+        return result
+
+    def _handled_commit_event(self, repository_full_name: str, commit_oid: str, check_number: int) -> WarningsDelta:
+        repository_owner_name, repository_name = repository_full_name.split("/", 1)
+        repository_info = query_info(
+            PullRequestsByCommitInfo,
+            GraphQlQuery.PULL_REQUESTS_BY_COMMIT.name,
+            self._session,
+            {"owner": repository_owner_name, "name": repository_name, "oid": commit_oid},
+            self._metrics,
+        ).repository
+        commit_info = repository_info.commit if repository_info is not None else None
+        result = WarningsDelta([], [])
+        if isinstance(commit_info, CommitInfo):
+            for pull_request_info in commit_info.associated_pull_requests.nodes:
+                _extend_warnings_delta(result, self._handled_content_event(pull_request_info.id, check_number))
+        return result
+
+    def _done_pull_request_ids_closing(self, issue_id: str) -> list[str]:
+        with self._lock:
+            return [
+                pull_request_id
+                for pull_request_id, closing_issue_ids in self._done_pull_request_id_to_closing_issue_ids_map.items()
+                if issue_id in closing_issue_ids
+            ]
+
+    def _remember_closing_issues(self, content_info: ProjectItemInfo, is_done: bool):
+        """Remember the issues closed by done pull requests, so that these can be re-checked when one changes."""
+        if content_info.id is None or content_info.closing_issues_references is None:
+            return
+        with self._lock:
+            if is_done:
+                self._done_pull_request_id_to_closing_issue_ids_map[content_info.id] = tuple(
+                    closing_issue.id
+                    for closing_issue in content_info.closing_issues_references.nodes
+                    if closing_issue.id is not None
+                )
+            else:
+                self._done_pull_request_id_to_closing_issue_ids_map.pop(content_info.id, None)
+
+    def _warning_if_done(
+        self,
+        content_info: ProjectItemInfo,
+        project_item_info: ProjectV2ItemNode | ContentProjectItemNode,
+        closing_issue_id_to_is_closed_map: dict[str, bool] | None = None,
+    ) -> str | None:
+        is_done = is_project_item_in_project_status(project_item_info, self._project_status_option_id) and (
+            self._project_item_filter is None or self._project_item_filter.is_included_content(content_info)
+        )
+        self._remember_closing_issues(content_info, is_done)
+        return (
+            warning_for_project_item(
+                compact_project_item(
+                    content_info,
+                    closing_issue_id_to_is_closed_map=closing_issue_id_to_is_closed_map,
+                    checked_rule_ids=rule_ids_for_project_item(project_item_info, self._project_status_option_id),
+                ),
+                self._metrics,
+            )
+            if is_done
+            else None
+        )
+
+    def _closing_issue_id_to_is_closed_map(self, content_infos: list[ProjectItemInfo]) -> dict[str, bool] | None:
+        complete_project_item_infos(self._session, content_infos, self._metrics)
+        # NOTE: Use a new loader each time, so that closing issues closed since the previous event are noticed.
+        return loaded_closing_issue_id_to_is_closed_map(
+            content_infos, new_closing_issue_loader(self._session, self._metrics)
+        )
+
+
+def _extend_warnings_delta(warnings_delta: WarningsDelta, other_warnings_delta: WarningsDelta):
+    warnings_delta.appeared.extend(other_warnings_delta.appeared)
+    warnings_delta.resolved.extend(other_warnings_delta.resolved)
+
+
+def started_webhook_http_server(
+    webhook_receiver: WebhookReceiver,
+    webhook_secret: str,
+    port: int,
+    host: str = "127.0.0.1",
+    metrics: Metrics | None = None,
+) -> ThreadingHTTPServer:
+    """
+    Receive webhooks via POST in a background thread until `shutdown()` is called on the result. The current warnings
+    are available as JSON via GET on `/warnings`, and the metrics (if any) via GET on `/metrics`.
+    """
+
+    class _WebhookRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/warnings":
+                warnings = webhook_receiver.warnings_index.warnings(webhook_receiver.project_id)
+                self._send(HTTPStatus.OK, json.dumps(warnings).encode("utf-8"), "application/json")
+            elif self.path == "/metrics" and metrics is not None:
+                self._send(HTTPStatus.OK, metrics.prometheus_text().encode("utf-8"), PROMETHEUS_TEXT_CONTENT_TYPE)
+            else:
+                self._send(HTTPStatus.NOT_FOUND)
+
+        def do_POST(self):
+            try:
+                body_size = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                body_size = -1
+            if body_size < 0:
+                self._send(HTTPStatus.BAD_REQUEST)
+                return
+            # NOTE: Reject large bodies before reading them, because anyone can send them, even without the secret.
+            if body_size > _MAX_WEBHOOK_BODY_SIZE_IN_BYTES:
+                logger.warning(f"Ignoring webhook with too large body from {self.client_address[0]}.")
+                self.close_connection = True
+                self._send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                return
+            body = self.rfile.read(body_size)
+            if not is_valid_webhook_signature(webhook_secret, body, self.headers.get(_SIGNATURE_HEADER)):
+                logger.warning(f"Ignoring webhook with invalid signature from {self.client_address[0]}.")
+                self._send(HTTPStatus.UNAUTHORIZED)
+                return
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                self._send(HTTPStatus.BAD_REQUEST)
+                return
+            event_name = self.headers.get(_EVENT_HEADER, "")
+            try:
+                warnings_delta = webhook_receiver.handled_event(event_name, payload)
+            except (AuthenticationError, GraphQlError, RequestException):
+                logger.exception(f"Cannot check project item of webhook event {event_name!r}.")
+                self._send(HTTPStatus.BAD_GATEWAY)
+            except (KeyError, TypeError):
+                logger.exception(f"Cannot process payload of webhook event {event_name!r}.")
+                self._send(HTTPStatus.BAD_REQUEST)
+            else:
+                log_warnings_delta(warnings_delta)
+                self._send(HTTPStatus.NO_CONTENT)
+
+        def log_message(self, format, *args):  # noqa: A002
+            logger.debug(format, *args)
+
+        def _send(self, status: HTTPStatus, body: bytes = b"", content_type: str | None = None):
+            self.send_response(status)
+            if content_type is not None:
+                self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    result = ThreadingHTTPServer((host, port), _WebhookRequestHandler)
+    threading.Thread(target=result.serve_forever, name="check_done_webhooks", daemon=True).start()
+    logger.info(f"Receiving webhooks on http://{host}:{result.server_port}/")
+    return result
+
+
+def serve_webhooks(
+    configuration_info: ConfigurationInfo,
+    port: int,
+    host: str = "127.0.0.1",
+    metrics: Metrics | None = None,
+):
+    """
+    Check all done project items once, and then only the project items affected by webhooks. Runs until interrupted.
+    """
+    if configuration_info.webhook_secret is None:
+        raise ValueError("To receive webhooks, the configuration must include a webhook_secret.")
+    with new_github_session(github_auth_from_configuration_info(configuration_info, metrics)) as session:
+        project_id, project_status_option_id = project_id_and_project_status_option_id_to_rule_ids_map(
+            session, configuration_info, metrics
+        )
+        webhook_receiver = WebhookReceiver(
+            session,
+            configuration_info.project_owner_name,
+            project_id,
+            project_status_option_id,
+            metrics=metrics,
+            project_item_filter=project_item_filter_from_configuration_info(configuration_info),
+        )
+        log_warnings_delta(webhook_receiver.checked_all_project_items())
+        webhook_server = started_webhook_http_server(
+            webhook_receiver, configuration_info.webhook_secret, port, host, metrics
+        )
+        try:
+            threading.Event().wait()
+        finally:
+            webhook_server.shutdown()
+            webhook_server.server_close()
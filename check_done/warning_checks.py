@@ -1,8 +1,108 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
+import logging
+import sys
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from html.parser import HTMLParser
+from typing import TYPE_CHECKING, NamedTuple
 
-from check_done.info import GithubProjectItemType, ProjectItemInfo
+import check_done
+from check_done.info import GithubProjectItemType, ProjectItemInfo, StatusCheckRollupState
+from check_done.metrics import MetricName, Metrics
+
+if TYPE_CHECKING:
+    from check_done.cache import TaskCheckMemo
+
+_WARNING_REASON_FUNCTION_NAME_PREFIX = "warning_reason_if_"
+# NOTE: Increase when changing how tasks are checked, so that results remembered by earlier versions are discarded.
+_TASK_CHECK_REVISION = 1
+TASK_CHECK_VERSION = f"{check_done.__version__}-{_TASK_CHECK_REVISION}"
+
+logger = logging.getLogger(__name__)
+
+
+class WarningsDelta(NamedTuple):
+    """Warnings that appeared or were resolved since a previous check."""
+
+    appeared: list[str]
+    resolved: list[str]
+
+
+@dataclass(frozen=True, slots=True)
+class CompactProjectItem:
+    """
+    Just the facts about a project item that the checks need, derived once from a `ProjectItemInfo`. Without
+    `__dict__`, nested models and the HTML body this takes a fraction of the memory, so that large projects can keep
+    all their done project items until the end of a run.
+    """
+
+    typename: GithubProjectItemType
+    number: int
+    title: str
+    repository_name: str
+    closed: bool
+    assignees_count: int
+    has_milestone: bool
+    has_uncompleted_tasks: bool
+    closing_issues_reference_count: int
+    # NOTE: None means that the state of the closing issues is unknown, so it is not checked.
+    open_closing_issues_count: int | None = None
+    # NOTE: None for issues, which cannot be merged.
+    is_merged: bool | None = None
+    # NOTE: None means that there are no status checks, so they are not checked.
+    status_check_rollup_state: StatusCheckRollupState | None = None
+    # NOTE: None means that all rules are checked.
+    checked_rule_ids: tuple[str, ...] | None = None
+
+
+def compact_project_item(
+    project_item: ProjectItemInfo | CompactProjectItem,
+    task_check_memo: "TaskCheckMemo | None" = None,
+    closing_issue_id_to_is_closed_map: Mapping[str, bool] | None = None,
+    checked_rule_ids: tuple[str, ...] | None = None,
+) -> CompactProjectItem:
+    """
+    The compact form of `project_item`. With a `task_check_memo`, its tasks are only checked again if its body
+    changed since they were remembered. With a `closing_issue_id_to_is_closed_map`, the closing issues found in it
+    are counted if they are open. With `checked_rule_ids`, only these rules are checked for it.
+    """
+    if isinstance(project_item, CompactProjectItem):
+        return project_item
+    closing_issues_references = project_item.closing_issues_references
+    open_closing_issues_count = (
+        sum(
+            1
+            for closing_issue in closing_issues_references.nodes
+            if closing_issue_id_to_is_closed_map.get(closing_issue.id) is False
+        )
+        if closing_issue_id_to_is_closed_map is not None and closing_issues_references is not None
+        else None
+    )
+    return CompactProjectItem(
+        typename=project_item.typename,
+        number=project_item.number,
+        title=project_item.title,
+        # NOTE: Many project items share a few repositories, so interning keeps only one copy of each name.
+        repository_name=sys.intern(project_item.repository.name),
+        closed=project_item.closed,
+        assignees_count=project_item.assignees.total_count,
+        has_milestone=project_item.milestone is not None,
+        has_uncompleted_tasks=(
+            task_check_memo.has_uncompleted_tasks(project_item.id, project_item.body_html)
+            if task_check_memo is not None
+            else has_uncompleted_tasks(project_item.body_html)
+        ),
+        closing_issues_reference_count=(
+            len(closing_issues_references.nodes) if closing_issues_references is not None else 0
+        ),
+        open_closing_issues_count=open_closing_issues_count,
+        is_merged=project_item.merged,
+        status_check_rollup_state=(
+            project_item.status_check_rollup.state if project_item.status_check_rollup is not None else None
+        ),
+        checked_rule_ids=checked_rule_ids,
+    )
 
 
 class _StopParsingHtml(Exception):
@@ -25,71 +125,172 @@ class _AllTasksCheckedHtmlParser(HTMLParser):
                     raise _StopParsingHtml
 
 
-def warnings_for_done_project_items(done_project_items: list[ProjectItemInfo]) -> list[str | None]:
+def warnings_for_done_project_items(
+    done_project_items: list[ProjectItemInfo | CompactProjectItem], metrics: Metrics | None = None
+) -> list[str | None]:
     result = []
     for project_item in done_project_items:
-        warning_reasons = [
-            warning_reason(project_item)
-            for warning_reason in POSSIBLE_WARNINGS
-            if warning_reason(project_item) is not None
-        ]
-        if len(warning_reasons) >= 1:
-            warning = sentence_from_project_item_warning_reasons(project_item, warning_reasons)
+        warning = warning_for_project_item(project_item, metrics)
+        if warning is not None:
             result.append(warning)
     return result
 
 
-def sentence_from_project_item_warning_reasons(project_item: ProjectItemInfo, warning_reasons: list[str]) -> str:
-    if len(warning_reasons) >= 3:
-        warning_reasons = f"{', '.join(warning_reasons[:-1])}, and {warning_reasons[-1]}"
-    elif len(warning_reasons) == 2:
-        warning_reasons = f"{', '.join(warning_reasons[:1])} and {warning_reasons[1]}"
-    else:
-        warning_reasons = warning_reasons[0]
+def warning_for_project_item(
+    project_item: ProjectItemInfo | CompactProjectItem, metrics: Metrics | None = None
+) -> str | None:
+    checked_project_item = compact_project_item(project_item)
+    warning_reasons = list(violated_rule_id_to_warning_reason_map(checked_project_item, metrics).values())
     return (
-        f" Project item should {warning_reasons}."
-        f" - repository: {project_item.repository.name!r} - item name: '#{project_item.number} {project_item.title}'."
+        sentence_from_project_item_warning_reasons(checked_project_item, warning_reasons) if warning_reasons else None
     )
 
 
-def warning_reason_if_open(project_item: ProjectItemInfo) -> str | None:
-    return "be closed" if not project_item.closed else None
+def violated_rule_id_to_warning_reason_map(
+    project_item: ProjectItemInfo | CompactProjectItem, metrics: Metrics | None = None
+) -> dict[str, str]:
+    """
+    The reasons for the rules in `POSSIBLE_WARNINGS` that the project item violates, by rule id, limited to its
+    `checked_rule_ids` if there are any.
+    """
+    checked_project_item = compact_project_item(project_item)
+    checked_rule_ids = checked_project_item.checked_rule_ids
+    result = {}
+    for possible_warning in POSSIBLE_WARNINGS:
+        rule_id = warning_rule_id(possible_warning)
+        if checked_rule_ids is not None and rule_id not in checked_rule_ids:
+            continue
+        warning_reason = possible_warning(checked_project_item)
+        if warning_reason is not None:
+            result[rule_id] = warning_reason
+            if metrics is not None:
+                metrics.increase(MetricName.WARNINGS, rule=rule_id)
+    if metrics is not None:
+        metrics.increase(MetricName.ITEMS_CHECKED)
+    return result
 
 
-def warning_reason_if_unassigned(project_item: ProjectItemInfo) -> str | None:
-    return "be assigned" if project_item.assignees.total_count == 0 else None
+def warning_rule_id(possible_warning: Callable[[ProjectItemInfo | CompactProjectItem], str | None]) -> str:
+    """The stable identifier of a rule in `POSSIBLE_WARNINGS`, for example "unassigned"."""
+    return possible_warning.__name__.removeprefix(_WARNING_REASON_FUNCTION_NAME_PREFIX)
 
 
-def warning_reason_if_missing_milestone(project_item: ProjectItemInfo) -> str | None:
-    return "have a milestone" if project_item.milestone is None else None
+def add_to_warnings_delta(warnings_delta: WarningsDelta, previous_warning: str | None, warning: str | None):
+    if previous_warning != warning:
+        if previous_warning is not None:
+            warnings_delta.resolved.append(previous_warning)
+        if warning is not None:
+            warnings_delta.appeared.append(warning)
 
 
-def warning_reason_if_tasks_are_uncompleted(project_item: ProjectItemInfo) -> str | None:
+def log_warnings_delta(warnings_delta: WarningsDelta):
+    for warning in warnings_delta.appeared:
+        logger.warning(warning)
+    for warning in warnings_delta.resolved:
+        logger.info(f"Resolved:{warning}")
+
+
+def sentence_from_project_item_warning_reasons(
+    project_item: ProjectItemInfo | CompactProjectItem, warning_reasons: list[str]
+) -> str:
+    checked_project_item = compact_project_item(project_item)
+    return sentence_from_warning_reasons(
+        checked_project_item.repository_name, checked_project_item.number, checked_project_item.title, warning_reasons
+    )
+
+
+def sentence_from_warning_reasons(repository_name: str, number: int, title: str, warning_reasons: list[str]) -> str:
+    if len(warning_reasons) >= 3:
+        warning_reasons = f"{', '.join(warning_reasons[:-1])}, and {warning_reasons[-1]}"
+    elif len(warning_reasons) == 2:
+        warning_reasons = f"{', '.join(warning_reasons[:1])} and {warning_reasons[1]}"
+    else:
+        warning_reasons = warning_reasons[0]
+    return (
+        f" Project item should {warning_reasons}. - repository: {repository_name!r} - item name: '#{number} {title}'."
+    )
+
+
+def has_uncompleted_tasks(body_html: str | None) -> bool:
     # TODO#29 Change parsing of tasks to markdown description.
     #  Background: This is less fragile than HTML because even if GitHub changes the names of HTML
     #  types it will still work.
+    if body_html is None or "<input" not in body_html:
+        return False  # Without any input element there cannot be a task, so skip the comparably slow parsing.
     parser = _AllTasksCheckedHtmlParser()
     try:
-        parser.feed(project_item.body_html)
+        parser.feed(body_html)
         parser.close()
     except _StopParsingHtml:
         pass  # Stop parsing HTML after first unchecked task.
-    return "have all tasks completed" if not parser.all_tasks_are_checked else None
+    return not parser.all_tasks_are_checked
+
+
+def warning_reason_if_open(project_item: ProjectItemInfo | CompactProjectItem) -> str | None:
+    checked_project_item = compact_project_item(project_item)
+    return "be closed" if not checked_project_item.closed else None
+
+
+def warning_reason_if_unassigned(project_item: ProjectItemInfo | CompactProjectItem) -> str | None:
+    checked_project_item = compact_project_item(project_item)
+    return "be assigned" if checked_project_item.assignees_count == 0 else None
 
 
-def warning_reason_if_missing_closing_issue_reference_in_pull_request(project_item: ProjectItemInfo) -> str | None:
+def warning_reason_if_missing_milestone(project_item: ProjectItemInfo | CompactProjectItem) -> str | None:
+    checked_project_item = compact_project_item(project_item)
+    return "have a milestone" if not checked_project_item.has_milestone else None
+
+
+def warning_reason_if_tasks_are_uncompleted(project_item: ProjectItemInfo | CompactProjectItem) -> str | None:
+    checked_project_item = compact_project_item(project_item)
+    return "have all tasks completed" if checked_project_item.has_uncompleted_tasks else None
+
+
+def warning_reason_if_missing_closing_issue_reference_in_pull_request(
+    project_item: ProjectItemInfo | CompactProjectItem,
+) -> str | None:
+    checked_project_item = compact_project_item(project_item)
     is_missing_closing_issue_reference_in_pull_request = (
-        len(project_item.closing_issues_references.nodes) == 0
-        if project_item.typename is GithubProjectItemType.pull_request
+        checked_project_item.closing_issues_reference_count == 0
+        if checked_project_item.typename is GithubProjectItemType.pull_request
         else False
     )
     return "have a closing issue reference" if is_missing_closing_issue_reference_in_pull_request else None
 
 
+def warning_reason_if_closing_issues_are_open(project_item: ProjectItemInfo | CompactProjectItem) -> str | None:
+    checked_project_item = compact_project_item(project_item)
+    has_open_closing_issues = (
+        checked_project_item.open_closing_issues_count is not None
+        and checked_project_item.open_closing_issues_count >= 1
+    )
+    return "have all closing issues closed" if has_open_closing_issues else None
+
+
+def warning_reason_if_pull_request_is_unmerged(project_item: ProjectItemInfo | CompactProjectItem) -> str | None:
+    checked_project_item = compact_project_item(project_item)
+    # NOTE: An open pull request is already reported as open, so only closed ones are reported as unmerged.
+    is_closed_without_merge = checked_project_item.closed and checked_project_item.is_merged is False
+    return "be merged" if is_closed_without_merge else None
+
+
+def warning_reason_if_status_checks_are_unsuccessful(project_item: ProjectItemInfo | CompactProjectItem) -> str | None:
+    checked_project_item = compact_project_item(project_item)
+    has_unsuccessful_status_checks = (
+        checked_project_item.status_check_rollup_state is not None
+        and checked_project_item.status_check_rollup_state is not StatusCheckRollupState.SUCCESS
+    )
+    return "have all status checks passed" if has_unsuccessful_status_checks else None
+
+
 POSSIBLE_WARNINGS = [
     warning_reason_if_open,
     warning_reason_if_unassigned,
     warning_reason_if_missing_milestone,
     warning_reason_if_tasks_are_uncompleted,
     warning_reason_if_missing_closing_issue_reference_in_pull_request,
+    warning_reason_if_closing_issues_are_open,
+    warning_reason_if_pull_request_is_unmerged,
+    warning_reason_if_status_checks_are_unsuccessful,
 ]
+POSSIBLE_RULE_IDS = [warning_rule_id(possible_warning) for possible_warning in POSSIBLE_WARNINGS]
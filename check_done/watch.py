@@ -0,0 +1,252 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import logging
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import NamedTuple
+
+from requests import RequestException, Session
+
+from check_done.config import ConfigurationInfo
+from check_done.done_project_items_info import (
+    ProjectItemFilter,
+    complete_project_item_infos,
+    github_auth_from_configuration_info,
+    is_project_item_in_project_status,
+    loaded_closing_issue_id_to_is_closed_map,
+    new_closing_issue_loader,
+    project_id_and_project_status_option_id_to_rule_ids_map,
+    project_item_filter_from_configuration_info,
+    project_item_filter_query_arguments,
+    rule_ids_for_project_item,
+)
+from check_done.graphql import (
+    GraphQlError,
+    GraphQlQuery,
+    new_github_session,
+    query_infos,
+    query_nodes_by_ids,
+)
+from check_done.info import NodeByIdInfo, ProjectItemInfo, ProjectItemReferenceInfo, ProjectV2ItemNode
+from check_done.metrics import Metrics, measured_run
+from check_done.organization_authentication import AuthenticationError
+from check_done.warning_checks import (
+    WarningsDelta,
+    add_to_warnings_delta,
+    compact_project_item,
+    log_warnings_delta,
+    warning_for_project_item,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _WatchedProjectItem(NamedTuple):
+    change_key: tuple[str | None, ...]
+    warning: str | None
+    # NOTE: Closing issues can be closed without changing the project item, so their states are compared too.
+    closing_issue_id_to_is_closed_map: Mapping[str, bool]
+
+
+class ProjectItemsWatcher:
+    """
+    Keeps the project items and their warnings between the cycles of a watch, so that each cycle only has to fetch
+    lightweight references to all items, the states of the issues closed by done pull requests, and the full content
+    of items that changed since the previous cycle.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        project_owner_name: str,
+        project_id: str,
+        project_status_option_id: str | Mapping[str, tuple[str, ...] | None],
+        metrics: Metrics | None = None,
+        project_item_filter: ProjectItemFilter | None = None,
+    ):
+        self._session = session
+        self._project_owner_name = project_owner_name
+        self._project_id = project_id
+        self._project_status_option_id = project_status_option_id
+        self._metrics = metrics
+        self._project_item_filter = project_item_filter
+        self._project_item_id_to_watched_project_item_map: dict[str, _WatchedProjectItem] = {}
+
+    @property
+    def warnings(self) -> list[str]:
+        return [
+            watched_project_item.warning
+            for watched_project_item in self._project_item_id_to_watched_project_item_map.values()
+            if watched_project_item.warning is not None
+        ]
+
+    def checked_warnings_delta(self) -> WarningsDelta:
+        project_item_reference_infos = query_infos(
+            NodeByIdInfo,
+            GraphQlQuery.PROJECT_V2_ITEM_REFERENCES.name,
+            self._session,
+            self._project_owner_name,
+            self._project_id,
+            self._metrics,
+            is_parallel=True,
+            **project_item_filter_query_arguments(self._project_item_filter),
+        )
+        closing_issue_loader = new_closing_issue_loader(self._session, self._metrics)
+        current_closing_issue_id_to_is_closed_map = {
+            closing_issue_id: closing_issue.closed
+            for closing_issue_id, closing_issue in closing_issue_loader.node_id_to_node_map(
+                closing_issue_id
+                for watched_project_item in self._project_item_id_to_watched_project_item_map.values()
+                for closing_issue_id in watched_project_item.closing_issue_id_to_is_closed_map
+            ).items()
+            if closing_issue is not None
+        }
+        project_item_id_to_change_key_map = {}
+        changed_project_item_ids = set()
+        changed_done_project_item_ids = []
+        for project_item_reference_info in project_item_reference_infos:
+            project_item_id = project_item_reference_info.id
+            change_key = _change_key(project_item_reference_info)
+            project_item_id_to_change_key_map[project_item_id] = change_key
+            watched_project_item = self._project_item_id_to_watched_project_item_map.get(project_item_id)
+            has_changed = (
+                watched_project_item is None
+                or watched_project_item.change_key != change_key
+                or any(
+                    current_closing_issue_id_to_is_closed_map.get(closing_issue_id) != is_closed
+                    for closing_issue_id, is_closed in watched_project_item.closing_issue_id_to_is_closed_map.items()
+                )
+            )
+            if has_changed:
+                changed_project_item_ids.add(project_item_id)
+                if self._is_done(project_item_reference_info):
+                    changed_done_project_item_ids.append(project_item_id)
+        changed_done_project_item_infos = query_nodes_by_ids(
+            GraphQlQuery.PROJECT_V2_ITEMS_BY_IDS.name, self._session, changed_done_project_item_ids, self._metrics
+        )
+        project_item_id_to_changed_project_item_info_map = {
+            project_item_info.id: project_item_info
+            for project_item_info in changed_done_project_item_infos
+            if self._is_done(project_item_info)
+            and (
+                self._project_item_filter is None
+                or self._project_item_filter.is_included_content(project_item_info.content)
+            )
+        }
+        changed_done_content_infos = [
+            project_item_info.content for project_item_info in project_item_id_to_changed_project_item_info_map.values()
+        ]
+        complete_project_item_infos(self._session, changed_done_content_infos, self._metrics)
+        closing_issue_id_to_is_closed_map = loaded_closing_issue_id_to_is_closed_map(
+            changed_done_content_infos, closing_issue_loader
+        )
+        project_item_id_to_warning_map = {
+            project_item_id: warning_for_project_item(
+                compact_project_item(
+                    project_item_info.content,
+                    closing_issue_id_to_is_closed_map=closing_issue_id_to_is_closed_map,
+                    checked_rule_ids=rule_ids_for_project_item(project_item_info, self._project_status_option_id),
+                ),
+                self._metrics,
+            )
+            for project_item_id, project_item_info in project_item_id_to_changed_project_item_info_map.items()
+        }
+
+        result = WarningsDelta([], [])
+        previous_project_item_id_to_watched_project_item_map = self._project_item_id_to_watched_project_item_map
+        self._project_item_id_to_watched_project_item_map = {}
+        for project_item_id, change_key in project_item_id_to_change_key_map.items():
+            previous_watched_project_item = previous_project_item_id_to_watched_project_item_map.get(project_item_id)
+            previous_warning = previous_watched_project_item.warning if previous_watched_project_item else None
+            if project_item_id in changed_project_item_ids:
+                warning = project_item_id_to_warning_map.get(project_item_id)
+                changed_project_item_info = project_item_id_to_changed_project_item_info_map.get(project_item_id)
+                project_item_closing_issue_id_to_is_closed_map = (
+                    _closing_issue_id_to_is_closed_map_of(
+                        changed_project_item_info.content, closing_issue_id_to_is_closed_map
+                    )
+                    if changed_project_item_info is not None
+                    else {}
+                )
+            else:
+                warning = previous_warning
+                project_item_closing_issue_id_to_is_closed_map = (
+                    previous_watched_project_item.closing_issue_id_to_is_closed_map
+                )
+            self._project_item_id_to_watched_project_item_map[project_item_id] = _WatchedProjectItem(
+                change_key, warning, project_item_closing_issue_id_to_is_closed_map
+            )
+            add_to_warnings_delta(result, previous_warning, warning)
+        for (
+            project_item_id,
+            previous_watched_project_item,
+        ) in previous_project_item_id_to_watched_project_item_map.items():
+            if project_item_id not in project_item_id_to_change_key_map:
+                add_to_warnings_delta(result, previous_watched_project_item.warning, None)
+        return result
+
+    def _is_done(self, project_item_info: ProjectV2ItemNode) -> bool:
+        return isinstance(
+            project_item_info.content, ProjectItemInfo | ProjectItemReferenceInfo
+        ) and is_project_item_in_project_status(project_item_info, self._project_status_option_id)
+
+
+def _change_key(project_item_info: ProjectV2ItemNode) -> tuple[str | None, ...]:
+    content_info = project_item_info.content
+    has_content = isinstance(content_info, ProjectItemInfo | ProjectItemReferenceInfo)
+    content_updated_at = content_info.updated_at if has_content else None
+    status_check_rollup_state = (
+        content_info.status_check_rollup.state if has_content and content_info.status_check_rollup is not None else None
+    )
+    option_id = (
+        project_item_info.field_value_by_name.option_id if project_item_info.field_value_by_name is not None else None
+    )
+    return project_item_info.updated_at, content_updated_at, status_check_rollup_state, option_id
+
+
+def _closing_issue_id_to_is_closed_map_of(
+    content_info: ProjectItemInfo, closing_issue_id_to_is_closed_map: Mapping[str, bool] | None
+) -> dict[str, bool]:
+    """The known states of the closing issues of `content_info`, to notice once one of them changes."""
+    if content_info.closing_issues_references is None or closing_issue_id_to_is_closed_map is None:
+        return {}
+    return {
+        closing_issue.id: closing_issue_id_to_is_closed_map[closing_issue.id]
+        for closing_issue in content_info.closing_issues_references.nodes
+        if closing_issue.id in closing_issue_id_to_is_closed_map
+    }
+
+
+def watch_done_project_items(
+    configuration_info: ConfigurationInfo,
+    interval_in_seconds: float,
+    metrics: Metrics | None = None,
+    metrics_file: Path | None = None,
+):
+    """
+    Check the done project items every `interval_in_seconds` and log only the warnings that appeared or were resolved
+    since the previous check. Runs until interrupted.
+    """
+    with new_github_session(github_auth_from_configuration_info(configuration_info, metrics)) as session:
+        project_id, project_status_option_id = project_id_and_project_status_option_id_to_rule_ids_map(
+            session, configuration_info, metrics
+        )
+        watcher = ProjectItemsWatcher(
+            session,
+            configuration_info.project_owner_name,
+            project_id,
+            project_status_option_id,
+            metrics,
+            project_item_filter_from_configuration_info(configuration_info),
+        )
+        logger.info(f"Watching for changes every {interval_in_seconds:g} seconds.")
+        while True:
+            try:
+                with measured_run(metrics, metrics_file):
+                    warnings_delta = watcher.checked_warnings_delta()
+            except (AuthenticationError, GraphQlError, RequestException):
+                logger.exception("Cannot check done project items, trying again in the next cycle.")
+            else:
+                log_warnings_delta(warnings_delta)
+            time.sleep(interval_in_seconds)
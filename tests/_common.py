@@ -16,6 +16,8 @@ from check_done.info import (
     ProjectV2ItemNode,
     ProjectV2ItemProjectStatusInfo,
     RepositoryInfo,
+    StatusCheckRollupInfo,
+    StatusCheckRollupState,
 )
 
 _ENVVAR_DEMO_CHECK_DONE_GITHUB_APP_ID = "CHECK_DONE_GITHUB_APP_ID"
@@ -58,6 +60,10 @@ REASON_SHOULD_HAVE_DEMO_CHECK_DONE_ORGANIZATION_PROJECT_CONFIGURED = (
 )
 
 
+FAKE_DONE_OPTION_ID = "fake_done_option_id"
+FAKE_IN_PROGRESS_OPTION_ID = "fake_in_progress_option_id"
+
+
 def new_fake_project_v2_item_node(status: str = "Done", option_id: str = "a1", closed: bool = True):
     return ProjectV2ItemNode(
         __typename="ProjectV2Item",
@@ -72,9 +78,11 @@ def new_fake_project_item_info(
     body_html: str = "",
     closed: bool = True,
     closing_issues_references: [] = None,
+    merged: bool | None = None,
     milestone: MilestoneInfo = None,
     number: int = 1,
     repository: RepositoryInfo = None,
+    status_check_rollup_state: StatusCheckRollupState | None = None,
     title: str = "fake_title",
     typename: GithubProjectItemType = GithubProjectItemType.pull_request,
 ):
@@ -90,13 +98,100 @@ def new_fake_project_item_info(
         bodyHTML=body_html,
         closed=closed,
         closingIssuesReferences=LinkedProjectItemInfo(nodes=closing_issues_references),
+        merged=merged,
         milestone=milestone,
         number=number,
         repository=repository,
+        statusCheckRollup=(
+            StatusCheckRollupInfo(state=status_check_rollup_state) if status_check_rollup_state is not None else None
+        ),
         title=title,
     )
 
 
+def new_fake_project_item_map(
+    project_item_id: str,
+    updated_at: str,
+    number: int = 1,
+    closed: bool = True,
+    option_id: str = FAKE_DONE_OPTION_ID,
+) -> dict:
+    return {
+        "__typename": "ProjectV2Item",
+        "id": project_item_id,
+        "updatedAt": updated_at,
+        "type": "ISSUE",
+        "content": {
+            "__typename": "Issue",
+            "id": f"issue_{project_item_id}",
+            "updatedAt": updated_at,
+            "assignees": {"totalCount": 1},
+            "bodyHTML": "",
+            "number": number,
+            "milestone": {"id": "dummy_milestone_id"},
+            "closed": closed,
+            "title": f"dummy_title_{project_item_id}",
+            "repository": {"name": "dummy_repository"},
+        },
+        "fieldValueByName": {"status": "dummy_status", "optionId": option_id},
+    }
+
+
+def new_fake_pull_request_map(
+    project_item_id: str, number: int, closing_issue_ids: list[str], option_id: str = FAKE_DONE_OPTION_ID
+) -> dict:
+    result = new_fake_project_item_map(project_item_id, "t1", number=number, option_id=option_id)
+    result["content"] = {
+        **result["content"],
+        "__typename": "PullRequest",
+        "closingIssuesReferences": {
+            "nodes": [
+                {"id": closing_issue_id, "number": 100 + index, "title": f"dummy_closing_issue_{closing_issue_id}"}
+                for index, closing_issue_id in enumerate(closing_issue_ids)
+            ]
+        },
+    }
+    result["type"] = "PULL_REQUEST"
+    return result
+
+
+def new_fake_project_item_references_response(project_item_maps: list[dict]) -> dict:
+    project_item_reference_maps = [
+        {
+            **project_item_map,
+            "content": {
+                key: project_item_map["content"][key]
+                for key in ("__typename", "id", "updatedAt", "repository", "statusCheckRollup")
+                if key in project_item_map["content"]
+            },
+        }
+        for project_item_map in project_item_maps
+    ]
+    return new_fake_project_items_response(project_item_reference_maps)
+
+
+def new_fake_project_items_response(project_item_maps: list[dict]) -> dict:
+    return {
+        "json": {
+            "data": {
+                "node": {
+                    "__typename": "ProjectV2",
+                    "id": "dummy_project_id",
+                    "number": 1,
+                    "items": {
+                        "nodes": project_item_maps,
+                        "pageInfo": {"endCursor": "AA", "hasNextPage": False},
+                    },
+                }
+            }
+        }
+    }
+
+
+def new_fake_nodes_response(node_maps: list[dict | None]) -> dict:
+    return {"json": {"data": {"nodes": node_maps}}}
+
+
 @contextmanager
 def change_current_folder(path):
     old_folder = os.getcwd()
@@ -0,0 +1,79 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import logging
+
+import pytest
+
+from check_done.baseline import (
+    BaselineComparison,
+    WarningKey,
+    baseline_text_log_entries,
+    read_baseline,
+    write_baseline,
+)
+from check_done.output import project_item_check_records
+from tests._common import new_fake_project_item_info
+
+_DUMMY_PROJECT_URL = "https://github.com/users/fake-username/projects/1"
+
+
+def test_can_write_and_read_baseline(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    warning_keys = {
+        WarningKey("open", "fake_repository#1"),
+        WarningKey("unassigned", "fake_repository#1"),
+        WarningKey("open", "other_repository#2"),
+    }
+    write_baseline(baseline_path, warning_keys)
+    assert read_baseline(baseline_path) == warning_keys
+    baseline_lines = baseline_path.read_text().splitlines()
+    assert baseline_lines[1:3] == ['"fake_repository#1":[0,1],', '"other_repository#2":[0]']
+
+
+def test_can_write_and_read_empty_baseline(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    write_baseline(baseline_path, set())
+    assert read_baseline(baseline_path) == set()
+
+
+def test_fails_to_read_baseline_of_other_version(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text('{"version": 0}')
+    with pytest.raises(ValueError, match=r"Baseline must be a map with version 1"):
+        read_baseline(baseline_path)
+
+
+def test_can_compare_to_baseline():
+    baseline_comparison = BaselineComparison(
+        {WarningKey("open", "fake_repository#1"), WarningKey("unassigned", "fake_repository#3")}
+    )
+    records = list(
+        baseline_comparison.new_project_item_check_records(
+            project_item_check_records(
+                _DUMMY_PROJECT_URL,
+                [
+                    new_fake_project_item_info(number=1, closed=False, assignees_count=0),
+                    new_fake_project_item_info(number=2, closed=False),
+                    new_fake_project_item_info(number=3),
+                ],
+            )
+        )
+    )
+    assert [(record.number, record.rule_ids) for record in records] == [(1, ["unassigned"]), (2, ["open"])]
+    assert baseline_comparison.new_warning_count == 2
+    assert baseline_comparison.resolved_warning_keys() == [WarningKey("unassigned", "fake_repository#3")]
+
+
+def test_can_log_comparison_to_baseline():
+    baseline_comparison = BaselineComparison({WarningKey("unassigned", "fake_repository#3")})
+    log_entries = list(
+        baseline_text_log_entries(
+            baseline_comparison,
+            project_item_check_records(_DUMMY_PROJECT_URL, [new_fake_project_item_info(number=1, closed=False)]),
+        )
+    )
+    assert [level for level, _ in log_entries] == [logging.WARNING, logging.INFO, logging.INFO]
+    assert "be closed" in log_entries[0][1]
+    assert "unassigned" in log_entries[1][1]
+    assert "fake_repository#3" in log_entries[1][1]
+    assert "1 new and 1 resolved" in log_entries[2][1]
@@ -0,0 +1,183 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import json
+from unittest.mock import patch
+
+import pytest
+import requests_mock
+
+from check_done.cache import (
+    CACHE_FOLDER_ENVIRONMENT_VARIABLE_NAME,
+    ProjectMetadataCache,
+    TaskCheckMemo,
+    default_project_metadata_cache_path,
+    project_metadata_cache_key,
+)
+from check_done.config import ConfigurationInfo
+from check_done.done_project_items_info import done_project_items_info
+from check_done.graphql import GRAPHQL_ENDPOINT, GraphQlError
+from check_done.info import ProjectMetadataInfo
+from check_done.warning_checks import compact_project_item, has_uncompleted_tasks
+from tests._common import (
+    FAKE_DONE_OPTION_ID,
+    FAKE_IN_PROGRESS_OPTION_ID,
+    new_fake_project_item_info,
+    new_fake_project_item_map,
+    new_fake_project_items_response,
+)
+
+_CONFIGURATION_INFO = ConfigurationInfo(
+    project_url="https://github.com/users/fake-username/projects/1",
+    personal_access_token="fake_personal_token",
+)
+_CACHE_KEY = project_metadata_cache_key(_CONFIGURATION_INFO)
+_PROJECT_METADATA = ProjectMetadataInfo(
+    project_id="dummy_project_id",
+    project_status_option_id=FAKE_DONE_OPTION_ID,
+    status_option_ids=[FAKE_IN_PROGRESS_OPTION_ID, FAKE_DONE_OPTION_ID],
+)
+_NEW_DONE_OPTION_ID = "new_done_option_id"
+_COMPLETED_TASKS_BODY_HTML = '<ul><li><input type="checkbox" checked> some task</li></ul>'
+_UNCOMPLETED_TASKS_BODY_HTML = '<ul><li><input type="checkbox"> some task</li></ul>'
+
+
+def test_can_derive_default_project_metadata_cache_path(monkeypatch, tmp_path):
+    monkeypatch.setenv(CACHE_FOLDER_ENVIRONMENT_VARIABLE_NAME, str(tmp_path))
+    assert default_project_metadata_cache_path().parent == tmp_path
+
+
+def test_can_store_and_forget_project_metadata(tmp_path):
+    project_metadata_cache = ProjectMetadataCache(tmp_path / "some_folder" / "project_metadata.json")
+    assert project_metadata_cache.project_metadata(_CACHE_KEY) is None
+    project_metadata_cache.store(_CACHE_KEY, _PROJECT_METADATA)
+    assert project_metadata_cache.project_metadata(_CACHE_KEY) == _PROJECT_METADATA
+    assert project_metadata_cache.project_metadata("other_key") is None
+    project_metadata_cache.forget(_CACHE_KEY)
+    assert project_metadata_cache.project_metadata(_CACHE_KEY) is None
+
+
+def test_can_expire_project_metadata(tmp_path):
+    project_metadata_cache = ProjectMetadataCache(tmp_path / "project_metadata.json", time_to_live_in_seconds=60)
+    with patch("check_done.cache.time.time", return_value=1000.0):
+        project_metadata_cache.store(_CACHE_KEY, _PROJECT_METADATA)
+    with patch("check_done.cache.time.time", return_value=1059.0):
+        assert project_metadata_cache.project_metadata(_CACHE_KEY) == _PROJECT_METADATA
+    with patch("check_done.cache.time.time", return_value=1061.0):
+        assert project_metadata_cache.project_metadata(_CACHE_KEY) is None
+
+
+def test_can_ignore_broken_project_metadata_cache(tmp_path):
+    project_metadata_cache_path = tmp_path / "project_metadata.json"
+    project_metadata_cache_path.write_text("{broken")
+    project_metadata_cache = ProjectMetadataCache(project_metadata_cache_path)
+    assert project_metadata_cache.project_metadata(_CACHE_KEY) is None
+    project_metadata_cache.store(_CACHE_KEY, _PROJECT_METADATA)
+    assert project_metadata_cache.project_metadata(_CACHE_KEY) == _PROJECT_METADATA
+
+
+def test_can_check_with_cached_project_metadata(tmp_path):
+    project_metadata_cache = ProjectMetadataCache(tmp_path / "project_metadata.json")
+    project_item_maps = [
+        new_fake_project_item_map("a", "t1", number=1),
+        new_fake_project_item_map("b", "t1", number=2, option_id=FAKE_IN_PROGRESS_OPTION_ID),
+    ]
+    with patch(
+        "check_done.done_project_items_info.project_metadata", return_value=_PROJECT_METADATA
+    ) as project_metadata_mock:
+        cold_numbers = _checked_numbers(project_metadata_cache, project_item_maps)
+        warm_numbers = _checked_numbers(project_metadata_cache, project_item_maps)
+    assert cold_numbers == warm_numbers == [1]
+    assert project_metadata_mock.call_count == 1
+
+
+def test_can_resolve_project_metadata_again_on_unknown_project_status_option(tmp_path):
+    project_metadata_cache = ProjectMetadataCache(tmp_path / "project_metadata.json")
+    project_metadata_cache.store(_CACHE_KEY, _PROJECT_METADATA)
+    new_project_metadata = ProjectMetadataInfo(
+        project_id="dummy_project_id",
+        project_status_option_id=_NEW_DONE_OPTION_ID,
+        status_option_ids=[FAKE_IN_PROGRESS_OPTION_ID, _NEW_DONE_OPTION_ID],
+    )
+    project_item_maps = [
+        new_fake_project_item_map("a", "t1", number=1, option_id=_NEW_DONE_OPTION_ID),
+        new_fake_project_item_map("b", "t1", number=2, option_id=FAKE_IN_PROGRESS_OPTION_ID),
+    ]
+    with patch(
+        "check_done.done_project_items_info.project_metadata", return_value=new_project_metadata
+    ) as project_metadata_mock:
+        numbers = _checked_numbers(project_metadata_cache, project_item_maps)
+    assert numbers == [1]
+    assert project_metadata_mock.call_count == 1
+    assert project_metadata_cache.project_metadata(_CACHE_KEY) == new_project_metadata
+
+
+def test_can_forget_cached_project_metadata_on_failed_check(tmp_path):
+    project_metadata_cache = ProjectMetadataCache(tmp_path / "project_metadata.json")
+    project_metadata_cache.store(_CACHE_KEY, _PROJECT_METADATA)
+    with requests_mock.Mocker() as mock:
+        mock.post(GRAPHQL_ENDPOINT, json={"errors": [{"message": "Could not resolve to a node"}]})
+        with pytest.raises(GraphQlError, match="Could not resolve to a node"):
+            done_project_items_info(_CONFIGURATION_INFO, project_metadata_cache=project_metadata_cache)
+    assert project_metadata_cache.project_metadata(_CACHE_KEY) is None
+
+
+def test_can_remember_task_checks(tmp_path):
+    task_check_memo_path = tmp_path / "task_checks.json"
+    task_check_memo = TaskCheckMemo(task_check_memo_path)
+    assert task_check_memo.has_uncompleted_tasks("a", _UNCOMPLETED_TASKS_BODY_HTML)
+    assert not task_check_memo.has_uncompleted_tasks("b", _COMPLETED_TASKS_BODY_HTML)
+    task_check_memo.save(is_complete=True)
+
+    with patch("check_done.cache.has_uncompleted_tasks", wraps=has_uncompleted_tasks) as has_uncompleted_tasks_mock:
+        warm_task_check_memo = TaskCheckMemo(task_check_memo_path)
+        assert warm_task_check_memo.has_uncompleted_tasks("a", _UNCOMPLETED_TASKS_BODY_HTML)
+        assert not warm_task_check_memo.has_uncompleted_tasks("b", _COMPLETED_TASKS_BODY_HTML)
+        assert has_uncompleted_tasks_mock.call_count == 0
+        assert not warm_task_check_memo.has_uncompleted_tasks("a", _COMPLETED_TASKS_BODY_HTML)
+        assert has_uncompleted_tasks_mock.call_count == 1
+
+
+def test_can_discard_task_checks_of_other_version(tmp_path):
+    task_check_memo_path = tmp_path / "task_checks.json"
+    task_check_memo = TaskCheckMemo(task_check_memo_path)
+    task_check_memo.has_uncompleted_tasks("a", _UNCOMPLETED_TASKS_BODY_HTML)
+    task_check_memo.save(is_complete=True)
+    with (
+        patch("check_done.cache.TASK_CHECK_VERSION", "other_version"),
+        patch("check_done.cache.has_uncompleted_tasks", wraps=has_uncompleted_tasks) as has_uncompleted_tasks_mock,
+    ):
+        TaskCheckMemo(task_check_memo_path).has_uncompleted_tasks("a", _UNCOMPLETED_TASKS_BODY_HTML)
+    assert has_uncompleted_tasks_mock.call_count == 1
+
+
+def test_can_keep_only_task_checks_of_complete_scan(tmp_path):
+    task_check_memo_path = tmp_path / "task_checks.json"
+    task_check_memo = TaskCheckMemo(task_check_memo_path)
+    task_check_memo.has_uncompleted_tasks("a", _UNCOMPLETED_TASKS_BODY_HTML)
+    task_check_memo.has_uncompleted_tasks("b", _UNCOMPLETED_TASKS_BODY_HTML)
+    task_check_memo.save(is_complete=True)
+
+    partial_task_check_memo = TaskCheckMemo(task_check_memo_path)
+    partial_task_check_memo.has_uncompleted_tasks("a", _UNCOMPLETED_TASKS_BODY_HTML)
+    partial_task_check_memo.save(is_complete=False)
+    assert sorted(json.loads(task_check_memo_path.read_text())["entries"]) == ["a", "b"]
+
+    complete_task_check_memo = TaskCheckMemo(task_check_memo_path)
+    complete_task_check_memo.has_uncompleted_tasks("a", _UNCOMPLETED_TASKS_BODY_HTML)
+    complete_task_check_memo.save(is_complete=True)
+    assert sorted(json.loads(task_check_memo_path.read_text())["entries"]) == ["a"]
+
+
+def test_can_compact_project_item_with_task_check_memo(tmp_path):
+    task_check_memo = TaskCheckMemo(tmp_path / "task_checks.json")
+    project_item_info = new_fake_project_item_info(body_html=_UNCOMPLETED_TASKS_BODY_HTML)
+    project_item_info.id = "a"
+    assert compact_project_item(project_item_info, task_check_memo).has_uncompleted_tasks
+
+
+def _checked_numbers(project_metadata_cache: ProjectMetadataCache, project_item_maps: list[dict]) -> list[int]:
+    with requests_mock.Mocker() as mock:
+        mock.post(GRAPHQL_ENDPOINT, response_list=[new_fake_project_items_response(project_item_maps)])
+        done_project_items = done_project_items_info(_CONFIGURATION_INFO, project_metadata_cache=project_metadata_cache)
+        assert mock.call_count == 1
+    return [done_project_item.number for done_project_item in done_project_items]
@@ -0,0 +1,208 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+import requests
+import requests_mock
+
+from check_done.checkpoint import (
+    CHECKPOINT_FOLDER_ENVIRONMENT_VARIABLE_NAME,
+    ScanCheckpoint,
+    checkpoint_key_map,
+    default_checkpoint_path,
+)
+from check_done.done_project_items_info import iter_project_items_in_project_status
+from check_done.graphql import GRAPHQL_ENDPOINT, GraphQlError, GraphQlQuery
+from check_done.info import GithubProjectItemType, StatusCheckRollupState
+from check_done.warning_checks import compact_project_item
+from tests._common import (
+    FAKE_DONE_OPTION_ID,
+    FAKE_IN_PROGRESS_OPTION_ID,
+    new_fake_project_item_info,
+    new_fake_project_item_map,
+)
+
+_PROJECT_ID = "dummy_project_id"
+_ITEM_COUNT = 250
+
+
+def test_can_derive_default_checkpoint_path_from_project_url(monkeypatch, tmp_path):
+    monkeypatch.setenv(CHECKPOINT_FOLDER_ENVIRONMENT_VARIABLE_NAME, str(tmp_path))
+    checkpoint_path = default_checkpoint_path("https://github.com/users/fake-username/projects/1")
+    assert checkpoint_path.parent == tmp_path
+    assert checkpoint_path != default_checkpoint_path("https://github.com/users/fake-username/projects/2")
+
+
+def test_can_resume_interrupted_scan(tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    with pytest.raises(GraphQlError):
+        _scanned_numbers_and_requested_cursors(checkpoint_path, failing_cursor="opaque_200")
+    assert checkpoint_path.exists()
+
+    numbers, requested_cursors = _scanned_numbers_and_requested_cursors(checkpoint_path, is_resuming=True)
+    assert requested_cursors == ["opaque_200"]
+    assert numbers == _expected_done_numbers()
+    assert not checkpoint_path.exists()
+
+
+def test_can_scan_from_start_without_resuming(tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    with pytest.raises(GraphQlError):
+        _scanned_numbers_and_requested_cursors(checkpoint_path, failing_cursor="opaque_200")
+    numbers, requested_cursors = _scanned_numbers_and_requested_cursors(checkpoint_path)
+    assert requested_cursors == [None, "opaque_100", "opaque_200"]
+    assert numbers == _expected_done_numbers()
+
+
+def test_can_scan_from_start_if_checkpoint_is_of_other_project_status(tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    with pytest.raises(GraphQlError):
+        _scanned_numbers_and_requested_cursors(checkpoint_path, failing_cursor="opaque_200")
+    numbers, requested_cursors = _scanned_numbers_and_requested_cursors(
+        checkpoint_path, is_resuming=True, project_status_option_id=FAKE_IN_PROGRESS_OPTION_ID
+    )
+    assert requested_cursors == [None, "opaque_100", "opaque_200"]
+    assert numbers == [number for number in range(_ITEM_COUNT) if number % 2 == 1]
+
+
+def test_can_scan_from_start_without_checkpoint(tmp_path):
+    numbers, requested_cursors = _scanned_numbers_and_requested_cursors(
+        tmp_path / "no_such_checkpoint.jsonl", is_resuming=True
+    )
+    assert requested_cursors == [None, "opaque_100", "opaque_200"]
+    assert numbers == _expected_done_numbers()
+
+
+def test_can_resume_from_checkpoint_with_partially_written_page(tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    with pytest.raises(GraphQlError):
+        _scanned_numbers_and_requested_cursors(checkpoint_path, failing_cursor="opaque_200")
+    with checkpoint_path.open("a", encoding="utf-8") as checkpoint_file:
+        checkpoint_file.write('{"end_cursor":"opaque_300","items":[["Iss')
+
+    with pytest.raises(GraphQlError):
+        _scanned_numbers_and_requested_cursors(checkpoint_path, is_resuming=True, failing_cursor="opaque_200")
+    with checkpoint_path.open(encoding="utf-8") as checkpoint_file:
+        assert len(checkpoint_file.readlines()) == 3
+
+    numbers, requested_cursors = _scanned_numbers_and_requested_cursors(checkpoint_path, is_resuming=True)
+    assert requested_cursors == ["opaque_200"]
+    assert numbers == _expected_done_numbers()
+
+
+def test_can_read_checkpointed_project_items(tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    with pytest.raises(GraphQlError):
+        _scanned_numbers_and_requested_cursors(checkpoint_path, failing_cursor="opaque_100")
+    checkpoint = ScanCheckpoint(checkpoint_path, _checkpoint_key_map())
+    end_cursor, project_items = checkpoint.resumed_end_cursor_and_project_items()
+    assert end_cursor == "opaque_100"
+    assert len(project_items) == 50
+    assert project_items[0].typename == GithubProjectItemType.issue
+    assert project_items[0].repository_name == "dummy_repository"
+
+
+def test_can_read_checkpointed_project_items_with_rule_ids(tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    project_status_option_id_to_rule_ids_map = {FAKE_DONE_OPTION_ID: ("open", "unassigned")}
+    with pytest.raises(GraphQlError):
+        _scanned_numbers_and_requested_cursors(
+            checkpoint_path,
+            failing_cursor="opaque_100",
+            project_status_option_id=project_status_option_id_to_rule_ids_map,
+        )
+    checkpoint = ScanCheckpoint(checkpoint_path, _checkpoint_key_map(project_status_option_id_to_rule_ids_map))
+    _, project_items = checkpoint.resumed_end_cursor_and_project_items()
+    assert project_items[0].checked_rule_ids == ("open", "unassigned")
+    assert ScanCheckpoint(checkpoint_path, _checkpoint_key_map()).resumed_end_cursor_and_project_items() is None
+
+
+def test_can_read_checkpointed_pull_requests(tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    pull_request = compact_project_item(
+        new_fake_project_item_info(merged=False, status_check_rollup_state=StatusCheckRollupState.FAILURE)
+    )
+    checkpoint = ScanCheckpoint(checkpoint_path, _checkpoint_key_map())
+    checkpoint.start()
+    checkpoint.add_page("opaque_100", [pull_request])
+    checkpoint.close(is_finished=False)
+    _, project_items = ScanCheckpoint(checkpoint_path, _checkpoint_key_map()).resumed_end_cursor_and_project_items()
+    assert project_items == [pull_request]
+    assert project_items[0].status_check_rollup_state is StatusCheckRollupState.FAILURE
+
+
+def test_can_scan_without_writable_checkpoint(tmp_path, caplog):
+    blocking_file_path = tmp_path / "not_a_folder"
+    blocking_file_path.write_text("")
+    numbers, _ = _scanned_numbers_and_requested_cursors(blocking_file_path / "checkpoint.jsonl")
+    assert numbers == _expected_done_numbers()
+    assert any("Cannot write checkpoint" in message for message in caplog.messages)
+
+
+def _expected_done_numbers() -> list[int]:
+    return [number for number in range(_ITEM_COUNT) if number % 2 == 0]
+
+
+def _checkpoint_key_map(
+    project_status_option_id: str | Mapping[str, tuple[str, ...] | None] = FAKE_DONE_OPTION_ID,
+) -> dict:
+    return checkpoint_key_map(_PROJECT_ID, project_status_option_id, GraphQlQuery.PROJECT_V2_ITEMS.name)
+
+
+def _scanned_numbers_and_requested_cursors(
+    checkpoint_path: Path,
+    is_resuming: bool = False,
+    failing_cursor: str | None = None,
+    project_status_option_id: str | Mapping[str, tuple[str, ...] | None] = FAKE_DONE_OPTION_ID,
+) -> tuple[list[int], list[str | None]]:
+    requested_cursors = []
+
+    def _project_items_page(request, context):
+        # NOTE: Cursors are not offset based, so the pages are requested one after another.
+        cursor = request.json()["variables"].get("after")
+        requested_cursors.append(cursor)
+        if failing_cursor is not None and cursor == failing_cursor:
+            context.status_code = 502
+            return {}
+        offset = 0 if cursor is None else int(cursor.removeprefix("opaque_"))
+        end_offset = min(offset + 100, _ITEM_COUNT)
+        return {
+            "data": {
+                "node": {
+                    "__typename": "ProjectV2",
+                    "id": _PROJECT_ID,
+                    "number": 1,
+                    "items": {
+                        "totalCount": _ITEM_COUNT,
+                        "nodes": [
+                            new_fake_project_item_map(
+                                f"item_{number}",
+                                "t1",
+                                number=number,
+                                option_id=FAKE_DONE_OPTION_ID if number % 2 == 0 else FAKE_IN_PROGRESS_OPTION_ID,
+                            )
+                            for number in range(offset, end_offset)
+                        ],
+                        "pageInfo": {"endCursor": f"opaque_{end_offset}", "hasNextPage": end_offset < _ITEM_COUNT},
+                    },
+                }
+            }
+        }
+
+    checkpoint = ScanCheckpoint(checkpoint_path, _checkpoint_key_map(project_status_option_id))
+    with requests_mock.Mocker() as mock:
+        mock.post(GRAPHQL_ENDPOINT, json=_project_items_page)
+        numbers = [
+            project_item.number
+            for project_item in iter_project_items_in_project_status(
+                requests.Session(),
+                "dummy_owner",
+                _PROJECT_ID,
+                project_status_option_id,
+                checkpoint=checkpoint,
+                is_resuming=is_resuming,
+            )
+        ]
+    return numbers, requested_cursors
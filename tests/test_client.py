@@ -0,0 +1,115 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import requests_mock
+
+from check_done.client import CheckDoneClient
+from check_done.config import ConfigurationInfo
+from check_done.graphql import GRAPHQL_ENDPOINT, new_github_session
+from check_done.info import ProjectMetadataInfo
+from tests._common import (
+    FAKE_DONE_OPTION_ID,
+    FAKE_IN_PROGRESS_OPTION_ID,
+    new_fake_nodes_response,
+    new_fake_project_item_map,
+    new_fake_project_item_references_response,
+    new_fake_project_items_response,
+)
+
+_PROJECT_URL = "https://github.com/users/fake-username/projects/1"
+_OTHER_PROJECT_URL = "https://github.com/users/other-username/projects/2"
+_RELEASE_PROJECT_URL = "https://github.com/users/fake-username/projects/3"
+_PROJECT_METADATA = ProjectMetadataInfo(
+    project_id="dummy_project_id",
+    project_status_option_id=FAKE_DONE_OPTION_ID,
+    status_option_ids=[FAKE_IN_PROGRESS_OPTION_ID, FAKE_DONE_OPTION_ID],
+)
+_PROJECT_ITEMS_RESPONSE = new_fake_project_items_response(
+    [
+        new_fake_project_item_map("a", "t1", number=1, closed=False),
+        new_fake_project_item_map("b", "t1", number=2),
+        new_fake_project_item_map("c", "t1", number=3, option_id=FAKE_IN_PROGRESS_OPTION_ID),
+    ]
+)
+
+
+def test_can_check_project_with_structured_result(tmp_path):
+    with (
+        patch("check_done.done_project_items_info.project_metadata", return_value=_PROJECT_METADATA),
+        requests_mock.Mocker() as mock,
+        CheckDoneClient(personal_access_token="fake_personal_token", cache_folder=tmp_path) as client,
+    ):
+        mock.post(GRAPHQL_ENDPOINT, **_PROJECT_ITEMS_RESPONSE)
+        result = client.check(_PROJECT_URL)
+    assert result.project_url == _PROJECT_URL
+    assert [(record.number, record.rule_ids) for record in result.project_item_check_records] == [
+        (1, ["open"]),
+        (2, []),
+    ]
+    assert result.warning_count == 1
+    assert mock.request_history[0].headers["Authorization"] == "Bearer fake_personal_token"
+
+
+def test_can_reuse_session_between_checks(tmp_path):
+    with (
+        patch("check_done.done_project_items_info.project_metadata", return_value=_PROJECT_METADATA),
+        patch("check_done.client.new_github_session", wraps=new_github_session) as new_github_session_mock,
+        requests_mock.Mocker() as mock,
+        CheckDoneClient(personal_access_token="fake_personal_token", is_caching=False) as client,
+    ):
+        mock.post(GRAPHQL_ENDPOINT, **_PROJECT_ITEMS_RESPONSE)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(client.check, [_PROJECT_URL] * 4 + [_OTHER_PROJECT_URL] * 4))
+    assert new_github_session_mock.call_count == 2
+    assert all(result.warning_count == 1 for result in results)
+    assert not any(tmp_path.iterdir())
+
+
+def test_can_check_project_asynchronously(tmp_path):
+    configuration_info = ConfigurationInfo(project_url=_PROJECT_URL, personal_access_token="other_personal_token")
+    with (
+        patch("check_done.done_project_items_info.project_metadata", return_value=_PROJECT_METADATA),
+        requests_mock.Mocker() as mock,
+        CheckDoneClient(cache_folder=tmp_path) as client,
+    ):
+        mock.post(GRAPHQL_ENDPOINT, **_PROJECT_ITEMS_RESPONSE)
+        result = asyncio.run(client.check_async(configuration_info))
+    assert result.warning_count == 1
+    assert mock.request_history[0].headers["Authorization"] == "Bearer other_personal_token"
+
+
+def test_can_check_issue_in_several_projects_once(tmp_path):
+    shared_project_item_map = new_fake_project_item_map("a", "t1", number=1, closed=False)
+    release_project_item_map = {
+        **new_fake_project_item_map("x", "t1", number=1, closed=False),
+        "content": shared_project_item_map["content"],
+    }
+    other_project_item_map = new_fake_project_item_map("y", "t1", number=2)
+    in_progress_project_item_map = new_fake_project_item_map("b", "t1", number=3, option_id=FAKE_IN_PROGRESS_OPTION_ID)
+    with (
+        patch("check_done.done_project_items_info.project_metadata", return_value=_PROJECT_METADATA),
+        requests_mock.Mocker() as mock,
+        CheckDoneClient(personal_access_token="fake_personal_token", cache_folder=tmp_path) as client,
+    ):
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_item_references_response([shared_project_item_map, in_progress_project_item_map]),
+                new_fake_project_item_references_response([release_project_item_map, other_project_item_map]),
+                new_fake_nodes_response([shared_project_item_map, other_project_item_map]),
+            ],
+        )
+        results = client.check_all([_PROJECT_URL, _RELEASE_PROJECT_URL])
+    assert mock.call_count == 3
+    assert mock.request_history[2].json()["variables"] == {"ids": ["a", "y"]}
+    assert [result.project_url for result in results] == [_PROJECT_URL, _RELEASE_PROJECT_URL]
+    assert [
+        [(record.project, record.number, record.rule_ids) for record in result.project_item_check_records]
+        for result in results
+    ] == [
+        [(_PROJECT_URL, 1, ["open"])],
+        [(_RELEASE_PROJECT_URL, 1, ["open"]), (_RELEASE_PROJECT_URL, 2, [])],
+    ]
@@ -1,22 +1,45 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
+import json
 import logging
 import os
 import re
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
+from check_done.checkpoint import CHECKPOINT_FOLDER_ENVIRONMENT_VARIABLE_NAME, default_checkpoint_path
 from check_done.command import CONFIG_BASE_NAME, check_done_command
+from check_done.dry_run import DryRunEstimate
+from check_done.graphql import DeadlineExceededError
 from tests._common import (
     HAS_DEMO_CHECK_DONE_ORGANIZATION_PROJECT_CONFIGURED,
     REASON_SHOULD_HAVE_DEMO_CHECK_DONE_ORGANIZATION_PROJECT_CONFIGURED,
     change_current_folder,
+    new_fake_project_item_info,
 )
 
 _PATH_TO_TEST_CONFIG = Path(__file__).parent / "data" / "test_configuration.yaml"
+# NOTE: This is about twice the import time on a typical developer machine, so that it fails if something slow is
+#  imported again, but not because of a busy test machine.
+_IMPORT_TIME_BUDGET_IN_SECONDS = 0.5
+_SLOW_MODULE_NAMES_TO_IMPORT_LAZILY = [
+    "check_done.baseline",
+    "check_done.daemon",
+    "check_done.dry_run",
+    "check_done.serve",
+    "check_done.watch",
+    "cryptography",
+    "http.server",
+    "jwt",
+    "socketserver",
+]
+_FAKE_USER_PROJECT_URL = "https://github.com/users/fake-username/projects/1"
+_FAKE_USER_PROJECT_CONFIG_TEXT = f"project_url: {_FAKE_USER_PROJECT_URL}\npersonal_access_token: fake_personal_token\n"
 
 
 def test_can_show_help():
@@ -165,3 +188,275 @@ def test_can_log_info_message_if_no_warnings_were_found_for_checked_project_item
         check_done_command(["--config", str(_PATH_TO_TEST_CONFIG)])
         os.environ[envvar_name] = original_envar_value
         assert "All project items are correct" in caplog.messages[1]
+
+
+def test_can_write_metrics_file():
+    with tempfile.TemporaryDirectory() as temp_folder:
+        config_path = Path(temp_folder) / "config.yaml"
+        config_path.write_text(_FAKE_USER_PROJECT_CONFIG_TEXT)
+        metrics_path = Path(temp_folder) / "check_done.prom"
+        with patch(
+            "check_done.command.iter_done_project_items_info",
+            return_value=_fake_done_project_items(
+                [new_fake_project_item_info(closed=False), new_fake_project_item_info()]
+            ),
+        ):
+            exit_code = check_done_command(["--config", str(config_path), "--metrics-file", str(metrics_path)])
+        assert exit_code == 0
+        metrics_text = metrics_path.read_text()
+    assert "check_done_items_checked_total 2\n" in metrics_text
+    assert 'check_done_warnings_total{rule="open"} 1\n' in metrics_text
+    assert "check_done_last_run_success 1\n" in metrics_text
+    assert "check_done_run_duration_seconds " in metrics_text
+
+
+def test_can_write_metrics_file_on_failed_run():
+    with tempfile.TemporaryDirectory() as temp_folder:
+        config_path = Path(temp_folder) / "config.yaml"
+        config_path.write_text(_FAKE_USER_PROJECT_CONFIG_TEXT)
+        metrics_path = Path(temp_folder) / "check_done.prom"
+        with patch("check_done.command.iter_done_project_items_info", side_effect=Exception("Fake exception")):
+            exit_code = check_done_command(["--config", str(config_path), "--metrics-file", str(metrics_path)])
+        assert exit_code == 1
+        assert "check_done_last_run_success 0\n" in metrics_path.read_text()
+
+
+def test_fails_on_metrics_port_without_watch():
+    with pytest.raises(SystemExit) as error_info:
+        check_done_command(["--metrics-port", "9000"])
+    assert error_info.value.code == 2
+
+
+def test_fails_on_non_positive_watch_interval():
+    with pytest.raises(SystemExit) as error_info:
+        check_done_command(["--watch", "0"])
+    assert error_info.value.code == 2
+
+
+def test_can_write_jsonl_format(capsys):
+    with tempfile.TemporaryDirectory() as temp_folder:
+        config_path = Path(temp_folder) / "config.yaml"
+        config_path.write_text(_FAKE_USER_PROJECT_CONFIG_TEXT)
+        with patch(
+            "check_done.command.iter_done_project_items_info",
+            return_value=_fake_done_project_items(
+                [new_fake_project_item_info(closed=False), new_fake_project_item_info(number=2)]
+            ),
+        ):
+            exit_code = check_done_command(["--config", str(config_path), "--format", "jsonl"])
+    assert exit_code == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record["rule_ids"] for record in records] == [["open"], []]
+    assert records[0]["project"] == "https://github.com/users/fake-username/projects/1"
+
+
+def test_fails_on_format_with_watch():
+    with pytest.raises(SystemExit) as error_info:
+        check_done_command(["--format", "sarif", "--watch", "60"])
+    assert error_info.value.code == 2
+
+
+def test_fails_on_resume_with_watch():
+    with pytest.raises(SystemExit) as error_info:
+        check_done_command(["--resume", "--watch", "60"])
+    assert error_info.value.code == 2
+
+
+def test_can_suggest_resume_after_failed_check(caplog, monkeypatch):
+    with tempfile.TemporaryDirectory() as temp_folder:
+        monkeypatch.setenv(CHECKPOINT_FOLDER_ENVIRONMENT_VARIABLE_NAME, temp_folder)
+        config_path = Path(temp_folder) / "config.yaml"
+        config_path.write_text(_FAKE_USER_PROJECT_CONFIG_TEXT)
+        default_checkpoint_path(_FAKE_USER_PROJECT_URL).write_text("")
+        with (
+            caplog.at_level(logging.INFO),
+            patch("check_done.command.iter_done_project_items_info", side_effect=Exception("Fake exception")) as mock,
+        ):
+            exit_code = check_done_command(["--config", str(config_path), "--no-daemon", "--resume"])
+    assert exit_code == 1
+    assert mock.call_args.args[2:4] == (default_checkpoint_path(_FAKE_USER_PROJECT_URL), True)
+    assert any("--resume" in message for message in caplog.messages)
+
+
+def test_can_check_against_baseline(capsys):
+    with tempfile.TemporaryDirectory() as temp_folder:
+        config_path = Path(temp_folder) / "config.yaml"
+        config_path.write_text(_FAKE_USER_PROJECT_CONFIG_TEXT)
+        baseline_path = Path(temp_folder) / "baseline.json"
+        base_arguments = ["--config", str(config_path), "--no-cache", "--baseline", str(baseline_path)]
+        first_project_items = [new_fake_project_item_info(number=1, closed=False)]
+        second_project_items = [*first_project_items, new_fake_project_item_info(number=2, assignees_count=0)]
+        with patch("check_done.command.iter_done_project_items_info", side_effect=lambda *_: iter(first_project_items)):
+            missing_baseline_exit_code = check_done_command(base_arguments)
+            update_exit_code = check_done_command([*base_arguments, "--update-baseline"])
+            unchanged_exit_code = check_done_command(base_arguments)
+        with patch(
+            "check_done.command.iter_done_project_items_info", side_effect=lambda *_: iter(second_project_items)
+        ):
+            capsys.readouterr()
+            new_warnings_exit_code = check_done_command([*base_arguments, "--format", "jsonl"])
+    assert missing_baseline_exit_code == 1
+    assert update_exit_code == 0
+    assert unchanged_exit_code == 0
+    assert new_warnings_exit_code == 3
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(record["number"], record["rule_ids"]) for record in records] == [(2, ["unassigned"])]
+
+
+def test_can_stop_at_max_warnings(capsys):
+    with tempfile.TemporaryDirectory() as temp_folder:
+        config_path = Path(temp_folder) / "config.yaml"
+        config_path.write_text(_FAKE_USER_PROJECT_CONFIG_TEXT)
+        checked_numbers = []
+        project_items = [
+            new_fake_project_item_info(number=1),
+            new_fake_project_item_info(number=2, closed=False, assignees_count=0),
+            new_fake_project_item_info(number=3, closed=False),
+            new_fake_project_item_info(number=4, closed=False),
+        ]
+        with patch(
+            "check_done.command.iter_done_project_items_info",
+            side_effect=lambda *_: _fake_done_project_items(project_items, checked_numbers),
+        ):
+            exit_code = check_done_command(["--config", str(config_path), "--max-warnings", "3", "--format", "jsonl"])
+            fail_fast_exit_code = check_done_command(["--config", str(config_path), "--fail-fast"])
+            checked_numbers.clear()
+            below_limit_exit_code = check_done_command(["--config", str(config_path), "--max-warnings", "5"])
+    assert exit_code == 4
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record["number"] for record in records] == [1, 2, 3]
+    assert fail_fast_exit_code == 4
+    assert below_limit_exit_code == 0
+    assert checked_numbers == [1, 2, 3, 4]
+
+
+def test_can_log_stop_at_max_warnings(caplog):
+    with tempfile.TemporaryDirectory() as temp_folder:
+        config_path = Path(temp_folder) / "config.yaml"
+        config_path.write_text(_FAKE_USER_PROJECT_CONFIG_TEXT)
+        checked_numbers = []
+        project_items = [new_fake_project_item_info(number=number, closed=False) for number in range(1, 4)]
+        with (
+            caplog.at_level(logging.INFO),
+            patch(
+                "check_done.command.iter_done_project_items_info",
+                side_effect=lambda *_: _fake_done_project_items(project_items, checked_numbers),
+            ),
+        ):
+            exit_code = check_done_command(["--config", str(config_path), "--fail-fast"])
+    assert exit_code == 4
+    assert checked_numbers == [1]
+    assert "Stopped checking after 1 project items because the maximum of 1 warnings was reached." in caplog.messages
+
+
+def test_can_report_partial_result_after_deadline(caplog, capsys):
+    def _done_project_items_until_deadline(*_):
+        yield new_fake_project_item_info(number=1, closed=False)
+        raise DeadlineExceededError("Deadline of 60 seconds exceeded.")
+
+    with tempfile.TemporaryDirectory() as temp_folder:
+        config_path = Path(temp_folder) / "config.yaml"
+        config_path.write_text(_FAKE_USER_PROJECT_CONFIG_TEXT)
+        with patch("check_done.command.iter_done_project_items_info", side_effect=_done_project_items_until_deadline):
+            exit_code = check_done_command(["--config", str(config_path), "--deadline", "60"])
+            jsonl_exit_code = check_done_command(
+                ["--config", str(config_path), "--deadline", "60", "--format", "jsonl"]
+            )
+    assert exit_code == 5
+    assert any("be closed" in message for message in caplog.messages)
+    assert (
+        "Stopped checking after 1 project items because the deadline of the run was exceeded, so the result is "
+        "incomplete." in caplog.messages
+    )
+    assert jsonl_exit_code == 5
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record["rule_ids"] for record in records] == [["open"]]
+
+
+def test_fails_on_non_positive_read_timeout():
+    with pytest.raises(SystemExit) as error_info:
+        check_done_command(["--read-timeout", "0"])
+    assert error_info.value.code == 2
+
+
+def test_fails_on_max_warnings_with_baseline():
+    with pytest.raises(SystemExit) as error_info:
+        check_done_command(["--fail-fast", "--baseline", "baseline.json"])
+    assert error_info.value.code == 2
+
+
+def test_fails_on_non_positive_max_warnings():
+    with pytest.raises(SystemExit) as error_info:
+        check_done_command(["--max-warnings", "0"])
+    assert error_info.value.code == 2
+
+
+def test_can_dry_run(capsys):
+    estimate = DryRunEstimate(
+        project_url=_FAKE_USER_PROJECT_URL,
+        project_item_count=150,
+        page_size=100,
+        page_count=2,
+        api_cost_points_per_page=1,
+        api_cost_points=2,
+        rate_limit_remaining_points=4999,
+        estimated_duration_in_seconds=4.0,
+    )
+    with tempfile.TemporaryDirectory() as temp_folder:
+        config_path = Path(temp_folder) / "config.yaml"
+        config_path.write_text(_FAKE_USER_PROJECT_CONFIG_TEXT)
+        with (
+            patch("check_done.dry_run.dry_run_estimate", return_value=estimate),
+            patch("check_done.command.iter_done_project_items_info") as iter_done_project_items_info_mock,
+        ):
+            capsys.readouterr()
+            exit_code = check_done_command(
+                ["--config", str(config_path), "--no-cache", "--dry-run", "--format", "json"]
+            )
+    assert exit_code == 0
+    assert iter_done_project_items_info_mock.call_count == 0
+    assert json.loads(capsys.readouterr().out) == estimate._asdict()
+
+
+def test_fails_on_dry_run_with_resume():
+    with pytest.raises(SystemExit) as error_info:
+        check_done_command(["--dry-run", "--resume"])
+    assert error_info.value.code == 2
+
+
+def test_fails_on_update_baseline_without_baseline():
+    with pytest.raises(SystemExit) as error_info:
+        check_done_command(["--update-baseline"])
+    assert error_info.value.code == 2
+
+
+def test_can_import_command_without_slow_modules():
+    imported_module_names = {
+        import_time_line.split("|")[-1].strip() for import_time_line in _import_time_lines_of_command()
+    }
+    for slow_module_name in _SLOW_MODULE_NAMES_TO_IMPORT_LAZILY:
+        assert slow_module_name not in imported_module_names
+
+
+def test_can_import_command_within_import_time_budget():
+    command_import_time_line = _import_time_lines_of_command()[-1]
+    _, cumulative_microseconds_text, module_name = command_import_time_line.split("|")
+    assert module_name.strip() == "check_done.command"
+    assert int(cumulative_microseconds_text) / 1_000_000 < _IMPORT_TIME_BUDGET_IN_SECONDS
+
+
+def _import_time_lines_of_command() -> list[str]:
+    completed_process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import check_done.command"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return [line for line in completed_process.stderr.splitlines() if line.startswith("import time:")]
+
+
+def _fake_done_project_items(project_items, checked_numbers=None):
+    for project_item in project_items:
+        if checked_numbers is not None:
+            checked_numbers.append(project_item.number)
+        yield project_item
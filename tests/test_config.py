@@ -142,6 +142,53 @@ def test_fails_on_organization_authentication_method_missing_app_id():
         )
 
 
+def test_fails_on_unknown_rule_id_in_project_status_rules():
+    with pytest.raises(
+        ValueError, match=r"Rule ids for project status 'In Review' must be some of .* \['no_such_rule'\]"
+    ):
+        ConfigurationInfo(
+            project_url="https://github.com/users/fake-username/projects/1",
+            personal_access_token="fake_personal_token",
+            project_status_rules={"In Review": ["unassigned", "no_such_rule"], "Done": None},
+        )
+
+
+def test_fails_on_project_status_rules_with_project_status_name_to_check():
+    with pytest.raises(ValueError, match="Only one of project_status_name_to_check and project_status_rules"):
+        ConfigurationInfo(
+            project_url="https://github.com/users/fake-username/projects/1",
+            personal_access_token="fake_personal_token",
+            project_status_name_to_check="Done",
+            project_status_rules={"Done": None},
+        )
+
+
+def test_can_resolve_additional_credentials_from_env(monkeypatch):
+    monkeypatch.setenv("FAKE_CHECK_DONE_OTHER_GITHUB_APP_PRIVATE_KEY", "fake_other_github_app_private_key")
+    configuration_info = ConfigurationInfo(
+        project_url="https://github.com/orgs/fake-organization/projects/1",
+        github_app_id="fake_github_app_id",
+        github_app_private_key="fake_github_app_private_key",
+        additional_github_apps=[
+            {
+                "github_app_id": "fake_other_github_app_id",
+                "github_app_private_key": "${FAKE_CHECK_DONE_OTHER_GITHUB_APP_PRIVATE_KEY}",
+            }
+        ],
+    )
+    assert configuration_info.additional_github_apps[0].github_app_private_key == "fake_other_github_app_private_key"
+
+
+def test_fails_on_additional_personal_access_tokens_for_organization_project():
+    with pytest.raises(ValueError, match="cannot be authenticated with additional_personal_access_tokens"):
+        ConfigurationInfo(
+            project_url="https://github.com/orgs/fake-organization/projects/1",
+            github_app_id="fake_github_app_id",
+            github_app_private_key="fake_github_app_private_key",
+            additional_personal_access_tokens=["fake_other_personal_token"],
+        )
+
+
 def test_can_resolve_value_from_env():
     envvar_name = "FAKE_CHECK_DONE_GITHUB_PROJECT_URL"
     envvar_value = "https://github.com/users/fake-username/projects/1"
@@ -0,0 +1,82 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import time
+
+import requests_mock
+
+from check_done.config import ConfigurationInfo
+from check_done.credential_pool import CredentialPoolAuth
+from check_done.done_project_items_info import github_auth_from_configuration_info
+from check_done.graphql import GRAPHQL_ENDPOINT, HttpBearerAuth, new_github_session
+
+_RATE_LIMIT_RESET_TIME_TEXT = str(int(time.time()) + 3600)
+
+
+def _rate_limit_headers(remaining_points: int) -> dict[str, str]:
+    return {"X-RateLimit-Remaining": str(remaining_points), "X-RateLimit-Reset": _RATE_LIMIT_RESET_TIME_TEXT}
+
+
+def _authorization_to_response_map(request, context, authorization_to_remaining_points_map) -> dict:
+    authorization = request.headers["Authorization"]
+    remaining_points = authorization_to_remaining_points_map[authorization]
+    context.headers.update(_rate_limit_headers(remaining_points))
+    if remaining_points == 0:
+        context.status_code = 403
+        return {"message": "API rate limit exceeded"}
+    authorization_to_remaining_points_map[authorization] -= 1
+    return {"data": {"authorization": authorization}}
+
+
+def _new_credential_pool_auth() -> CredentialPoolAuth:
+    return CredentialPoolAuth(
+        [
+            ("first", HttpBearerAuth("first_token")),
+            ("second", HttpBearerAuth("second_token")),
+        ]
+    )
+
+
+def test_can_use_credential_with_most_remaining_points():
+    authorization_to_remaining_points_map = {"Bearer first_token": 10, "Bearer second_token": 100}
+    with requests_mock.Mocker() as mock, new_github_session(_new_credential_pool_auth()) as session:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            json=lambda request, context: _authorization_to_response_map(
+                request, context, authorization_to_remaining_points_map
+            ),
+        )
+        authorizations = [session.post(GRAPHQL_ENDPOINT).json()["data"]["authorization"] for _ in range(4)]
+    # NOTE: Before their first responses, the credentials take turns.
+    assert authorizations == ["Bearer first_token", "Bearer second_token", "Bearer second_token", "Bearer second_token"]
+
+
+def test_can_continue_with_other_credential_once_rate_limited():
+    credential_pool_auth = _new_credential_pool_auth()
+    authorization_to_remaining_points_map = {"Bearer first_token": 0, "Bearer second_token": 1}
+    with requests_mock.Mocker() as mock, new_github_session(credential_pool_auth) as session:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            json=lambda request, context: _authorization_to_response_map(
+                request, context, authorization_to_remaining_points_map
+            ),
+        )
+        first_response = session.post(GRAPHQL_ENDPOINT)
+        assert first_response.status_code == 200
+        assert first_response.json()["data"]["authorization"] == "Bearer second_token"
+        assert [response.status_code for response in first_response.history] == [403]
+        assert session.post(GRAPHQL_ENDPOINT).status_code == 403
+    assert [credential.rate_limit_remaining_points for credential in credential_pool_auth.credentials] == [0, 0]
+
+
+def test_can_pool_credentials_from_configuration_info():
+    configuration_info = ConfigurationInfo(
+        project_url="https://github.com/users/fake-username/projects/1",
+        personal_access_token="fake_personal_token",
+        additional_personal_access_tokens=["fake_other_personal_token"],
+    )
+    auth = github_auth_from_configuration_info(configuration_info)
+    assert isinstance(auth, CredentialPoolAuth)
+    assert [credential.auth.token for credential in auth.credentials] == [
+        "fake_personal_token",
+        "fake_other_personal_token",
+    ]
@@ -0,0 +1,177 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import io
+import json
+import logging
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import requests_mock
+
+from check_done.command import check_done_command
+from check_done.daemon import CheckDoneDaemon, started_daemon_server
+from check_done.daemon_client import (
+    DAEMON_SOCKET_ENVIRONMENT_VARIABLE_NAME,
+    DaemonError,
+    check_done_via_daemon,
+    is_daemon_supported,
+)
+from check_done.graphql import GRAPHQL_ENDPOINT
+from check_done.info import ProjectMetadataInfo
+from check_done.output import OutputFormat
+from tests._common import (
+    FAKE_DONE_OPTION_ID,
+    FAKE_IN_PROGRESS_OPTION_ID,
+    new_fake_nodes_response,
+    new_fake_project_item_map,
+    new_fake_project_items_response,
+    new_fake_pull_request_map,
+)
+
+pytestmark = pytest.mark.skipif(not is_daemon_supported(), reason="Unix domain sockets are not available")
+
+_FAKE_USER_PROJECT_CONFIG_TEXT = (
+    "project_url: https://github.com/users/fake-username/projects/1\npersonal_access_token: fake_personal_token\n"
+)
+
+
+def test_can_check_via_daemon_and_keep_project_warm():
+    with _running_daemon() as (socket_path, config_path), requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_items_response([new_fake_project_item_map("a", "t1", number=1, closed=False)]),
+                new_fake_project_items_response([new_fake_project_item_map("a", "t2", number=1)]),
+            ],
+        )
+        first_output = io.StringIO()
+        assert check_done_via_daemon(socket_path, config_path, OutputFormat.jsonl, first_output)
+        second_output = io.StringIO()
+        assert check_done_via_daemon(socket_path, config_path, OutputFormat.jsonl, second_output)
+        assert mock.call_count == 2
+    assert [json.loads(line)["rule_ids"] for line in first_output.getvalue().splitlines()] == [["open"]]
+    assert [json.loads(line)["rule_ids"] for line in second_output.getvalue().splitlines()] == [[]]
+
+
+def test_can_check_closing_issues_via_daemon():
+    with _running_daemon() as (socket_path, config_path), requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_items_response([new_fake_pull_request_map("a", 1, ["open_issue_id"])]),
+                new_fake_nodes_response([{"__typename": "Issue", "id": "open_issue_id", "closed": False}]),
+            ],
+        )
+        output = io.StringIO()
+        assert check_done_via_daemon(socket_path, config_path, OutputFormat.jsonl, output)
+    assert [json.loads(line)["rule_ids"] for line in output.getvalue().splitlines()] == [["closing_issues_are_open"]]
+
+
+def test_can_check_via_daemon_after_project_status_was_recreated():
+    outdated_project_metadata_info = _new_fake_project_metadata_info("deleted_done_option_id")
+    project_metadata_infos = [outdated_project_metadata_info, _new_fake_project_metadata_info(FAKE_DONE_OPTION_ID)]
+    with _running_daemon(project_metadata_infos) as (socket_path, config_path), requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_items_response([new_fake_project_item_map("a", "t1", number=1, closed=False)])
+            ],
+        )
+        output = io.StringIO()
+        assert check_done_via_daemon(socket_path, config_path, OutputFormat.jsonl, output)
+    assert [json.loads(line)["rule_ids"] for line in output.getvalue().splitlines()] == [["open"]]
+
+
+def test_can_log_warnings_via_daemon(caplog):
+    caplog.set_level(logging.INFO)
+    with _running_daemon() as (socket_path, config_path), requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[new_fake_project_items_response([new_fake_project_item_map("a", "t1", number=7)])],
+        )
+        assert check_done_via_daemon(socket_path, config_path, OutputFormat.text, io.StringIO())
+    assert any("All project items are correct, 1 checked" in message for message in caplog.messages)
+
+
+def test_fails_on_check_via_daemon_with_graphql_error():
+    with _running_daemon() as (socket_path, config_path), requests_mock.Mocker() as mock:
+        mock.post(GRAPHQL_ENDPOINT, status_code=502)
+        with pytest.raises(DaemonError, match="Daemon cannot check done project items: 502 "):
+            check_done_via_daemon(socket_path, config_path, OutputFormat.jsonl, io.StringIO())
+
+
+def test_can_detect_missing_daemon():
+    with tempfile.TemporaryDirectory() as temp_folder:
+        missing_socket_path = Path(temp_folder) / "missing.sock"
+        assert not check_done_via_daemon(missing_socket_path, Path("dummy.yaml"), OutputFormat.text, io.StringIO())
+
+
+def test_fails_on_second_daemon_for_same_socket():
+    with _running_daemon() as (socket_path, _), pytest.raises(DaemonError, match="already listening"):
+        started_daemon_server(CheckDoneDaemon(), socket_path)
+
+
+def test_can_check_done_command_via_daemon(capsys, monkeypatch):
+    with _running_daemon() as (socket_path, config_path), requests_mock.Mocker() as mock:
+        monkeypatch.setenv(DAEMON_SOCKET_ENVIRONMENT_VARIABLE_NAME, str(socket_path))
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[new_fake_project_items_response([new_fake_project_item_map("a", "t1", closed=False)])],
+        )
+        with patch("check_done.command.iter_done_project_items_info") as iter_done_project_items_info_mock:
+            exit_code = check_done_command(["--config", str(config_path), "--format", "jsonl"])
+        assert iter_done_project_items_info_mock.call_count == 0
+    assert exit_code == 0
+    (record_line,) = capsys.readouterr().out.splitlines()
+    assert json.loads(record_line)["rule_ids"] == ["open"]
+
+
+def test_can_check_done_command_without_daemon_if_caches_are_disabled(monkeypatch):
+    with _running_daemon() as (socket_path, config_path):
+        monkeypatch.setenv(DAEMON_SOCKET_ENVIRONMENT_VARIABLE_NAME, str(socket_path))
+        with (
+            patch("check_done.command.check_done_via_daemon") as check_done_via_daemon_mock,
+            patch(
+                "check_done.command.iter_done_project_items_info",
+                return_value=(project_item for project_item in []),
+            ),
+        ):
+            exit_code = check_done_command(["--config", str(config_path), "--no-cache"])
+        assert check_done_via_daemon_mock.call_count == 0
+    assert exit_code == 0
+
+
+@contextmanager
+def _running_daemon(project_metadata_infos: list[ProjectMetadataInfo] | None = None) -> Iterator[tuple[Path, Path]]:
+    if project_metadata_infos is None:
+        project_metadata_infos = [_new_fake_project_metadata_info(FAKE_DONE_OPTION_ID)]
+    with (
+        tempfile.TemporaryDirectory() as temp_folder,
+        patch(
+            "check_done.done_project_items_info.project_metadata", side_effect=project_metadata_infos
+        ) as project_metadata_mock,
+    ):
+        config_path = Path(temp_folder) / "config.yaml"
+        config_path.write_text(_FAKE_USER_PROJECT_CONFIG_TEXT)
+        socket_path = Path(temp_folder) / "check_done.sock"
+        check_done_daemon = CheckDoneDaemon()
+        daemon_server = started_daemon_server(check_done_daemon, socket_path)
+        try:
+            yield socket_path, config_path
+        finally:
+            daemon_server.shutdown()
+            daemon_server.server_close()
+            check_done_daemon.close()
+        assert project_metadata_mock.call_count <= len(project_metadata_infos)
+
+
+def _new_fake_project_metadata_info(done_option_id: str) -> ProjectMetadataInfo:
+    return ProjectMetadataInfo(
+        project_id="dummy_project_id",
+        project_status_option_id=done_option_id,
+        status_option_ids=[FAKE_IN_PROGRESS_OPTION_ID, done_option_id],
+    )
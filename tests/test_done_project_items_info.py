@@ -1,30 +1,47 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
 import os
+from unittest.mock import patch
 
 import pytest
+import requests
+import requests_mock
 
 from check_done.config import ConfigurationInfo
 from check_done.done_project_items_info import (
+    ProjectItemFilter,
     done_project_items_info,
     filtered_project_item_infos_by_done_status,
+    iter_project_items_in_project_status,
     matching_project_id,
     matching_project_status_option_id,
+    new_closing_issue_loader,
+    project_status_option_id_to_rule_ids_map,
 )
+from check_done.graphql import GRAPHQL_ENDPOINT
 from check_done.info import (
+    GithubProjectItemType,
+    ProjectMetadataInfo,
     ProjectV2Node,
     ProjectV2Options,
     ProjectV2SingleSelectFieldNode,
 )
+from check_done.output import project_item_check_records
 from tests._common import (
     DEMO_CHECK_DONE_GITHUB_APP_ID,
     DEMO_CHECK_DONE_GITHUB_APP_PRIVATE_KEY,
     DEMO_CHECK_DONE_GITHUB_PROJECT_STATUS_NAME_TO_CHECK,
     DEMO_CHECK_DONE_GITHUB_PROJECT_URL,
     ENVVAR_DEMO_CHECK_DONE_GITHUB_PROJECT_STATUS_NAME_TO_CHECK,
+    FAKE_DONE_OPTION_ID,
+    FAKE_IN_PROGRESS_OPTION_ID,
     HAS_DEMO_CHECK_DONE_ORGANIZATION_PROJECT_CONFIGURED,
     REASON_SHOULD_HAVE_DEMO_CHECK_DONE_ORGANIZATION_PROJECT_CONFIGURED,
+    new_fake_nodes_response,
+    new_fake_project_item_map,
+    new_fake_project_items_response,
     new_fake_project_v2_item_node,
+    new_fake_pull_request_map,
 )
 
 _HAS_PROJECT_STATUS_NAME_TO_CHECK = DEMO_CHECK_DONE_GITHUB_PROJECT_STATUS_NAME_TO_CHECK is not None
@@ -191,3 +208,127 @@ def test_can_resolve_filtered_project_item_infos_by_done_status():
     ]
     done_issue_infos = filtered_project_item_infos_by_done_status(fake_done_issues_node_infos, done_project_status_id)
     assert len(done_issue_infos) == 2
+
+
+def test_can_check_closing_issues_of_done_project_items_in_one_batch():
+    project_item_maps = [
+        new_fake_pull_request_map("a", 1, ["open_issue_id"]),
+        new_fake_pull_request_map("b", 2, ["open_issue_id", "closed_issue_id"]),
+        new_fake_pull_request_map("c", 3, ["closed_issue_id"]),
+        new_fake_pull_request_map("d", 4, ["other_issue_id"], option_id=FAKE_IN_PROGRESS_OPTION_ID),
+    ]
+    closing_issue_maps = [
+        {"__typename": "Issue", "id": "open_issue_id", "closed": False},
+        {"__typename": "Issue", "id": "closed_issue_id", "closed": True},
+    ]
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_items_response(project_item_maps),
+                new_fake_nodes_response(closing_issue_maps),
+            ],
+        )
+        session = requests.Session()
+        done_project_items = list(
+            iter_project_items_in_project_status(
+                session,
+                "dummy_owner",
+                "dummy_project_id",
+                FAKE_DONE_OPTION_ID,
+                closing_issue_loader=new_closing_issue_loader(session),
+            )
+        )
+        assert mock.call_count == 2
+        assert mock.request_history[1].json()["variables"] == {"ids": ["open_issue_id", "closed_issue_id"]}
+    assert [done_project_item.open_closing_issues_count for done_project_item in done_project_items] == [1, 1, 0]
+
+
+def test_can_check_several_project_statuses_with_their_rules_in_one_scan():
+    configuration_info = ConfigurationInfo(
+        project_url="https://github.com/users/fake-username/projects/1",
+        personal_access_token="fake_personal_token",
+        project_status_rules={"In Progress": ["unassigned"], "Done": None},
+    )
+    project_metadata = ProjectMetadataInfo(
+        project_id="dummy_project_id",
+        project_status_option_id=FAKE_IN_PROGRESS_OPTION_ID,
+        status_option_ids=["fake_todo_option_id", FAKE_IN_PROGRESS_OPTION_ID, FAKE_DONE_OPTION_ID],
+        project_status_name_to_option_id_map={"In Progress": FAKE_IN_PROGRESS_OPTION_ID, "Done": FAKE_DONE_OPTION_ID},
+    )
+    project_item_maps = [
+        new_fake_project_item_map("a", "t1", number=1, closed=False),
+        new_fake_project_item_map("b", "t1", number=2, closed=False, option_id=FAKE_IN_PROGRESS_OPTION_ID),
+        new_fake_project_item_map("c", "t1", number=3, closed=False, option_id="fake_todo_option_id"),
+    ]
+    project_item_maps[1]["content"]["assignees"] = {"totalCount": 0}
+    with (
+        patch("check_done.done_project_items_info.project_metadata", return_value=project_metadata),
+        requests_mock.Mocker() as mock,
+    ):
+        mock.post(GRAPHQL_ENDPOINT, **new_fake_project_items_response(project_item_maps))
+        records = list(
+            project_item_check_records(configuration_info.project_url, done_project_items_info(configuration_info))
+        )
+        assert mock.call_count == 1
+    assert [(record.number, record.rule_ids) for record in records] == [(1, ["open"]), (2, ["unassigned"])]
+
+
+def test_fails_on_project_status_rules_matching_the_same_project_status():
+    configuration_info = ConfigurationInfo(
+        project_url="https://github.com/users/fake-username/projects/1",
+        personal_access_token="fake_personal_token",
+        project_status_rules={"Done": ["unassigned"], "Do": None},
+    )
+    project_metadata = ProjectMetadataInfo(
+        project_id="dummy_project_id",
+        project_status_option_id=FAKE_DONE_OPTION_ID,
+        status_option_ids=[FAKE_IN_PROGRESS_OPTION_ID, FAKE_DONE_OPTION_ID],
+        project_status_name_to_option_id_map={"Done": FAKE_DONE_OPTION_ID, "Do": FAKE_DONE_OPTION_ID},
+    )
+    with pytest.raises(ValueError, match="The project statuses 'Done' and 'Do' in project_status_rules match the same"):
+        project_status_option_id_to_rule_ids_map(configuration_info, project_metadata)
+
+
+def test_can_skip_project_items_of_other_repositories_and_types():
+    included_pull_request_map = new_fake_pull_request_map("a", 1, [])
+    excluded_repository_pull_request_map = new_fake_pull_request_map("b", 2, [])
+    excluded_repository_pull_request_map["content"]["repository"]["name"] = "excluded_repository"
+    # NOTE: The content of this project item cannot be validated, so it must be skipped before its model is built.
+    excluded_repository_pull_request_map["content"]["number"] = "not_a_number"
+    issue_map = new_fake_project_item_map("c", "t1", number=3)
+    issue_map["content"] = {}
+    project_item_filter = ProjectItemFilter(
+        repository_names_to_exclude=["excluded_repository"],
+        project_item_types_to_exclude=[GithubProjectItemType.issue],
+    )
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            **new_fake_project_items_response(
+                [included_pull_request_map, excluded_repository_pull_request_map, issue_map]
+            ),
+        )
+        done_project_items = list(
+            iter_project_items_in_project_status(
+                requests.Session(),
+                "dummy_owner",
+                "dummy_project_id",
+                FAKE_DONE_OPTION_ID,
+                project_item_filter=project_item_filter,
+            )
+        )
+        request_variables = mock.request_history[0].json()["variables"]
+    assert [done_project_item.number for done_project_item in done_project_items] == [1]
+    assert request_variables["includeIssues"] is False
+    assert request_variables["includePullRequests"] is True
+
+
+def test_can_include_only_project_items_of_some_repositories():
+    project_item_filter = ProjectItemFilter(repository_names_to_include=["some_repository"])
+    issue_map = new_fake_project_item_map("a", "t1")
+    assert not project_item_filter.is_included_project_item_map(issue_map)
+    issue_map["content"]["repository"]["name"] = "some_repository"
+    assert project_item_filter.is_included_project_item_map(issue_map)
+    assert not project_item_filter.is_included_project_item_map({**issue_map, "type": "DRAFT_ISSUE", "content": {}})
+    assert project_item_filter.query_variables() == {"includeIssues": True, "includePullRequests": True}
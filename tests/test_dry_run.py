@@ -0,0 +1,74 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import logging
+from unittest.mock import patch
+
+import requests_mock
+
+from check_done.config import ConfigurationInfo
+from check_done.dry_run import DryRunEstimate, dry_run_estimate, dry_run_text_log_entries
+from check_done.graphql import GRAPHQL_ENDPOINT
+from check_done.info import ProjectMetadataInfo
+from check_done.metrics import MetricName, Metrics
+from tests._common import FAKE_DONE_OPTION_ID
+
+_CONFIGURATION_INFO = ConfigurationInfo(
+    project_url="https://github.com/users/fake-username/projects/1",
+    personal_access_token="fake_personal_token",
+)
+_PROJECT_METADATA = ProjectMetadataInfo(
+    project_id="dummy_project_id",
+    project_status_option_id=FAKE_DONE_OPTION_ID,
+    status_option_ids=[FAKE_DONE_OPTION_ID],
+)
+
+
+def test_can_estimate_check_without_requesting_project_items():
+    metrics = Metrics()
+    with (
+        patch("check_done.dry_run.project_metadata", return_value=_PROJECT_METADATA),
+        requests_mock.Mocker() as mock,
+    ):
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                {
+                    "json": {
+                        "data": {
+                            "rateLimit": {"cost": 1, "remaining": 4999},
+                            "node": {"__typename": "ProjectV2", "id": "dummy_project_id", "items": {"totalCount": 950}},
+                        }
+                    }
+                },
+                {"json": {"data": {"rateLimit": {"cost": 3, "remaining": 4998}, "node": None}}},
+            ],
+        )
+        estimate = dry_run_estimate(_CONFIGURATION_INFO, metrics)
+        assert mock.request_history[1].json()["variables"] == {
+            "projectId": "dummy_project_id",
+            "maxEntriesPerPage": 100,
+            "dryRun": True,
+        }
+    assert estimate.project_item_count == 950
+    assert estimate.page_count == 10
+    assert estimate.api_cost_points == 30
+    assert estimate.rate_limit_remaining_points == 4998
+    assert estimate.estimated_duration_in_seconds == 8.0
+    assert metrics.value(MetricName.API_COST_POINTS) == 1
+
+
+def test_can_warn_about_estimate_exceeding_rate_limit():
+    estimate = DryRunEstimate(
+        project_url=_CONFIGURATION_INFO.project_url,
+        project_item_count=50_000,
+        page_size=100,
+        page_count=500,
+        api_cost_points_per_page=20,
+        api_cost_points=10_000,
+        rate_limit_remaining_points=5_000,
+        estimated_duration_in_seconds=250.0,
+    )
+    log_entries = list(dry_run_text_log_entries(estimate))
+    assert "500 pages" in log_entries[0][1]
+    assert "10000 rate limit points" in log_entries[0][1]
+    assert log_entries[1][0] == logging.WARNING
@@ -1,30 +1,54 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
+import base64
+import io
 import json
+import threading
+import time
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 import requests
 import requests_mock
 from pydantic import BaseModel
-from requests import HTTPError, Response
+from requests import HTTPError, ReadTimeout, Response
+from urllib3 import HTTPResponse
+from urllib3.exceptions import ReadTimeoutError
 
 from check_done.graphql import (
     GRAPHQL_ENDPOINT,
+    DeadlineExceededError,
     GraphQlError,
     GraphQlQuery,
+    HttpBearerAuth,
+    NestedConnection,
+    NodeLoader,
+    PageSizer,
+    RequestTimeouts,
+    StreamedConnectionParser,
     checked_graphql_data_map,
+    complete_nested_connections,
     minimized_graphql,
+    new_github_session,
+    paginated_query_infos,
+    query_info,
     query_info_from_response_info,
     query_infos,
 )
 from check_done.info import (
+    GithubProjectItemType,
+    LinkedProjectItemInfo,
+    LinkedProjectItemNode,
+    NodeByIdInfo,
     PageInfo,
+    ProjectItemContentByIdInfo,
     ProjectOwnerInfo,
     ProjectV2Node,
     QueryInfo,
 )
+from check_done.metrics import MetricName, Metrics
+from tests._common import new_fake_project_item_info, new_fake_project_item_map, new_fake_project_items_response
 
 
 class _FakeModelWithQueryInfoField(BaseModel):
@@ -163,6 +187,466 @@ def test_can_resolve_multi_page_query_infos():
     assert isinstance(mocked_result[1], ProjectV2Node)
 
 
+def test_can_add_page_metrics_from_query_infos():
+    metrics = Metrics()
+    page_maps = [
+        {
+            "data": {
+                "rateLimit": {"cost": 1, "remaining": remaining},
+                "user": {
+                    "projectsV2": {
+                        "nodes": [{"__typename": "ProjectV2", "id": f"dummy_id_{remaining}", "number": remaining}],
+                        "pageInfo": {"endCursor": "AA", "hasNextPage": remaining == 4999},
+                    }
+                },
+            }
+        }
+        for remaining in (4999, 4998)
+    ]
+    with requests_mock.Mocker() as mock:
+        mock.post(GRAPHQL_ENDPOINT, response_list=[{"json": page_map} for page_map in page_maps])
+        query_infos(
+            ProjectOwnerInfo,
+            GraphQlQuery.USER_PROJECTS.name,
+            requests.Session(),
+            "dummy_project_owner_name",
+            metrics=metrics,
+        )
+    assert metrics.value(MetricName.PAGES_FETCHED, query="user_projects") == 2
+    assert metrics.value(MetricName.API_COST_POINTS) == 2
+    assert metrics.value(MetricName.RATE_LIMIT_REMAINING_POINTS) == 4998
+
+
+def test_can_query_project_items_in_parallel():
+    project_item_ids, requested_cursors = _queried_fake_project_item_ids_and_requested_cursors(250, is_parallel=True)
+    assert project_item_ids == [f"item_{index}" for index in range(250)]
+    assert sorted(requested_cursors, key=str) == sorted([None, "MTAw", "MjAw"], key=str)
+
+
+def test_can_query_project_items_in_parallel_with_same_result_as_serially():
+    parallel_project_item_ids, _ = _queried_fake_project_item_ids_and_requested_cursors(301, is_parallel=True)
+    serial_project_item_ids, _ = _queried_fake_project_item_ids_and_requested_cursors(301, is_parallel=False)
+    assert parallel_project_item_ids == serial_project_item_ids
+
+
+def test_can_fall_back_to_serial_project_items_query_without_offset_cursors():
+    project_item_ids, requested_cursors = _queried_fake_project_item_ids_and_requested_cursors(
+        250, is_parallel=True, is_offset_cursor=False
+    )
+    assert project_item_ids == [f"item_{index}" for index in range(250)]
+    assert requested_cursors == [None, "opaque_100", "opaque_200"]
+
+
+def test_can_fall_back_to_serial_project_items_query_on_unexpected_cursor():
+    project_item_ids, requested_cursors = _queried_fake_project_item_ids_and_requested_cursors(
+        350, is_parallel=True, unexpected_cursor_offset=200
+    )
+    assert project_item_ids == [f"item_{index}" for index in range(350)]
+    assert "opaque_200" in requested_cursors
+
+
+def test_can_query_project_items_in_parallel_after_cursor():
+    project_item_ids, requested_cursors = _queried_fake_project_item_ids_and_requested_cursors(
+        450, is_parallel=True, after="MTAw"
+    )
+    assert project_item_ids == [f"item_{index}" for index in range(100, 450)]
+    assert sorted(requested_cursors) == ["MTAw", "MjAw", "MzAw", "NDAw"]
+
+
+def test_can_load_nodes_in_deduplicated_chunks_only_once():
+    requested_id_chunks = []
+
+    def _closing_issues_by_ids(request, context):
+        node_ids = request.json()["variables"]["ids"]
+        requested_id_chunks.append(node_ids)
+        return {
+            "data": {
+                "nodes": [
+                    {"__typename": "Issue", "id": node_id, "closed": node_id.endswith("0")}
+                    if node_id != "issue_missing"
+                    else None
+                    for node_id in node_ids
+                ]
+            }
+        }
+
+    node_ids = [f"issue_{index}" for index in range(150)]
+    with requests_mock.Mocker() as mock:
+        mock.post(GRAPHQL_ENDPOINT, json=_closing_issues_by_ids)
+        node_loader = NodeLoader(GraphQlQuery.CLOSING_ISSUES_BY_IDS.name, requests.Session())
+        node_id_to_node_map = node_loader.node_id_to_node_map([*node_ids, *node_ids, "issue_missing"])
+        assert [len(requested_id_chunk) for requested_id_chunk in requested_id_chunks] == [100, 51]
+        assert len(node_id_to_node_map) == 151
+        assert node_id_to_node_map["issue_10"].closed
+        assert not node_id_to_node_map["issue_11"].closed
+        assert node_id_to_node_map["issue_missing"] is None
+
+        cached_node_id_to_node_map = node_loader.node_id_to_node_map(["issue_10", "issue_missing", "issue_new"])
+        assert requested_id_chunks[-1] == ["issue_new"]
+        assert list(cached_node_id_to_node_map) == ["issue_10", "issue_missing", "issue_new"]
+
+
+def test_can_query_project_items_with_smaller_pages_after_timeout():
+    project_item_ids, requested_cursors = _queried_fake_project_item_ids_and_requested_cursors(
+        250, is_parallel=True, max_working_page_size=50
+    )
+    assert project_item_ids == [f"item_{index}" for index in range(250)]
+    assert sorted(requested_cursors, key=str) == sorted([None, None, "NTA", "MTAw", "MTUw", "MjAw"], key=str)
+
+
+def test_can_query_project_items_one_after_another_with_smaller_pages_after_timeout():
+    project_item_ids, requested_cursors = _queried_fake_project_item_ids_and_requested_cursors(
+        250, is_parallel=False, max_working_page_size=50
+    )
+    assert project_item_ids == [f"item_{index}" for index in range(250)]
+    assert requested_cursors.count(None) == 2
+
+
+def test_can_query_project_items_with_smaller_pages_after_timeout_of_parallel_page():
+    project_item_ids, requested_cursors = _queried_fake_project_item_ids_and_requested_cursors(
+        350, is_parallel=True, max_working_page_size=50, first_offset_with_max_working_page_size=100
+    )
+    assert project_item_ids == [f"item_{index}" for index in range(350)]
+    assert requested_cursors.count("MTAw") == 2
+
+
+def test_can_query_project_items_with_smaller_pages_after_large_parallel_page():
+    with patch("check_done.graphql._MAX_PAGE_RESPONSE_SIZE_IN_BYTES", 500_000):
+        project_item_ids, requested_cursors = _queried_fake_project_item_ids_and_requested_cursors(
+            350, is_parallel=True, large_page_offset=100
+        )
+    assert project_item_ids == [f"item_{index}" for index in range(350)]
+    assert requested_cursors.count("MjAw") == 2
+    assert "MjUw" in requested_cursors
+
+
+def test_can_stop_querying_project_items_in_parallel_without_waiting_for_slow_page():
+    slow_page_event = threading.Event()
+
+    def _project_items_page(request, context):
+        offset = int(base64.b64decode(request.json()["variables"].get("after") or "MA=="))
+        if offset >= 200:
+            slow_page_event.wait(10)
+        end_offset = offset + 100
+        return {
+            "data": {
+                "node": {
+                    "__typename": "ProjectV2",
+                    "id": "dummy_project_id",
+                    "number": 1,
+                    "items": {
+                        "totalCount": 400,
+                        "nodes": [
+                            new_fake_project_item_map(f"item_{index}", "t1") for index in range(offset, end_offset)
+                        ],
+                        "pageInfo": {
+                            "endCursor": base64.b64encode(str(end_offset).encode("ascii")).decode("ascii"),
+                            "hasNextPage": end_offset < 400,
+                        },
+                    },
+                }
+            }
+        }
+
+    with requests_mock.Mocker() as mock:
+        mock.post(GRAPHQL_ENDPOINT, json=_project_items_page)
+        page_query_infos = paginated_query_infos(
+            NodeByIdInfo,
+            GraphQlQuery.PROJECT_V2_ITEMS.name,
+            requests.Session(),
+            "dummy_project_owner_name",
+            "dummy_project_id",
+            is_parallel=True,
+        )
+        try:
+            next(page_query_infos)
+            next(page_query_infos)
+            start_time = time.monotonic()
+            page_query_infos.close()
+            assert time.monotonic() - start_time < 5
+        finally:
+            slow_page_event.set()
+
+
+def test_fails_to_query_project_items_if_even_smallest_page_times_out():
+    with pytest.raises(GraphQlError, match="502"):
+        _queried_fake_project_item_ids_and_requested_cursors(10, is_parallel=False, max_working_page_size=0)
+
+
+def test_can_query_project_items_with_smaller_pages_after_read_timeout_while_streaming():
+    class _StuckBody(io.RawIOBase):
+        def readinto(self, _):
+            raise ReadTimeoutError(None, GRAPHQL_ENDPOINT, "Read timed out.")
+
+    project_item_maps = [new_fake_project_item_map("a", "t1")]
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT, response_list=[{"body": _StuckBody()}, new_fake_project_items_response(project_item_maps)]
+        )
+        page_query_infos = list(
+            paginated_query_infos(
+                NodeByIdInfo, GraphQlQuery.PROJECT_V2_ITEMS.name, requests.Session(), "dummy_owner", "dummy_project_id"
+            )
+        )
+        assert [request.json()["variables"]["maxEntriesPerPage"] for request in mock.request_history] == [100, 50]
+    assert [node.id for node in page_query_infos[0].nodes] == ["a"]
+
+
+def test_can_send_requests_with_timeouts():
+    response = Response()
+    response.status_code = 200
+    with patch("requests.adapters.HTTPAdapter.send", return_value=response) as send_mock:
+        new_github_session(HttpBearerAuth("dummy_token"), RequestTimeouts(5.0, 30.0)).post(GRAPHQL_ENDPOINT)
+    assert send_mock.call_args.kwargs["timeout"] == (5.0, 30.0)
+
+
+def test_fails_to_send_requests_after_deadline():
+    session = new_github_session(HttpBearerAuth("dummy_token"), RequestTimeouts(deadline_in_seconds=0.001))
+    with (
+        patch("check_done.graphql.time.monotonic", return_value=float("inf")),
+        patch("requests.adapters.HTTPAdapter.send") as send_mock,
+        pytest.raises(DeadlineExceededError, match="Deadline of 0.001 seconds exceeded"),
+    ):
+        session.post(GRAPHQL_ENDPOINT)
+    assert send_mock.call_count == 0
+
+
+def test_fails_with_deadline_exceeded_if_query_times_out_at_deadline():
+    session = new_github_session(HttpBearerAuth("dummy_token"), RequestTimeouts(deadline_in_seconds=0.05))
+
+    def _send_until_deadline_timeout(*_, **__):
+        time.sleep(0.1)
+        raise ReadTimeout("Read timed out.")
+
+    with (
+        patch("requests.adapters.HTTPAdapter.send", side_effect=_send_until_deadline_timeout),
+        pytest.raises(DeadlineExceededError, match="Deadline of 0.05 seconds exceeded"),
+    ):
+        query_info(ProjectItemContentByIdInfo, GraphQlQuery.PROJECT_ITEM_CONTENT_BY_ID.name, session, {"id": "a"})
+
+
+def test_fails_with_deadline_exceeded_if_streamed_page_times_out_at_deadline():
+    class _StuckBody(io.RawIOBase):
+        def readinto(self, _):
+            time.sleep(0.1)
+            raise ReadTimeoutError(None, GRAPHQL_ENDPOINT, "Read timed out.")
+
+    response = Response()
+    response.status_code = 200
+    response.raw = HTTPResponse(body=_StuckBody(), preload_content=False)
+    session = new_github_session(HttpBearerAuth("dummy_token"), RequestTimeouts(deadline_in_seconds=0.05))
+    with (
+        patch("requests.adapters.HTTPAdapter.send", return_value=response),
+        pytest.raises(DeadlineExceededError, match="Deadline of 0.05 seconds exceeded") as error_info,
+    ):
+        list(
+            paginated_query_infos(
+                NodeByIdInfo, GraphQlQuery.PROJECT_V2_ITEMS.name, session, "dummy_owner", "dummy_project_id"
+            )
+        )
+    # NOTE: The page is not requested again with fewer entries, because the timeout was caused by the deadline.
+    assert isinstance(error_info.value.__cause__, requests.ConnectionError)
+
+
+def test_fails_with_timeout_if_query_times_out_before_deadline():
+    session = new_github_session(HttpBearerAuth("dummy_token"), RequestTimeouts(deadline_in_seconds=60))
+    with (
+        patch("requests.adapters.HTTPAdapter.send", side_effect=ReadTimeout("Read timed out.")),
+        pytest.raises(ReadTimeout),
+    ):
+        query_info(ProjectItemContentByIdInfo, GraphQlQuery.PROJECT_ITEM_CONTENT_BY_ID.name, session, {"id": "a"})
+
+
+def test_can_adapt_page_size():
+    metrics = Metrics()
+    page_sizer = PageSizer("PROJECT_V2_ITEMS", metrics)
+    assert page_sizer.page_size == 100
+    page_sizer.add_page(30.0, 1000)
+    assert page_sizer.page_size == 50
+    page_sizer.add_page(0.1, 10 * 1024 * 1024)
+    assert page_sizer.page_size == 25
+    for _ in range(3):
+        page_sizer.add_page(0.1, 1000)
+    assert page_sizer.page_size == 50
+    assert metrics.value(MetricName.PAGE_SIZE, query="project_v2_items") == 50
+    for _ in range(10):
+        page_sizer.add_page(0.1, 1000)
+    assert page_sizer.page_size == 100
+    while page_sizer.shrink():
+        pass
+    assert page_sizer.page_size == 5
+
+
+def test_can_parse_connection_nodes_as_soon_as_they_are_complete():
+    project_item_maps = [new_fake_project_item_map(f"item_{index}", "t1", number=index) for index in range(3)]
+    project_item_maps[1]["content"]["title"] = 'Some "nodes": [tricky] title'
+    response_text = json.dumps(new_fake_project_items_response(project_item_maps)["json"])
+    connection_parser = StreamedConnectionParser(lambda project_item_map: project_item_map["id"] != "item_2")
+    validated_node_counts = []
+    response_bytes = response_text.encode("utf-8")
+    for chunk_start in range(0, len(response_bytes), 7):
+        connection_parser.feed(response_bytes[chunk_start : chunk_start + 7])
+        validated_node_counts.append(connection_parser.validated_node_count)
+    response_map = connection_parser.close()
+    assert validated_node_counts[len(validated_node_counts) // 2] == 1
+    assert connection_parser.size_in_bytes == len(response_bytes)
+    nodes_info = NodeByIdInfo(**response_map["data"])
+    assert [node.id for node in nodes_info.node.items.nodes] == ["item_0", "item_1"]
+    assert nodes_info.node.items.nodes[1].content.title == 'Some "nodes": [tricky] title'
+    assert nodes_info.node.items.nodes[0].content.typename == GithubProjectItemType.issue
+    assert nodes_info.node.items.page_info.endCursor == "AA"
+
+
+def test_can_parse_connection_nodes_with_escapes_split_across_chunks():
+    project_item_maps = [new_fake_project_item_map(f"item_{index}", "t1", number=index) for index in range(2)]
+    project_item_maps[0]["content"]["title"] = 'Some \\"escaped\\" {title} with \\\\ backslash ]'
+    response_map = new_fake_project_items_response(project_item_maps)["json"]
+    response_map["data"]["node"]["items"]["nodes"].append(None)
+    response_bytes = json.dumps(response_map).encode("utf-8")
+    connection_parser = StreamedConnectionParser()
+    for chunk_start in range(len(response_bytes)):
+        connection_parser.feed(response_bytes[chunk_start : chunk_start + 1])
+    nodes_info = NodeByIdInfo(**connection_parser.close()["data"])
+    assert [node.id for node in nodes_info.node.items.nodes] == ["item_0", "item_1"]
+    assert nodes_info.node.items.nodes[0].content.title == 'Some \\"escaped\\" {title} with \\\\ backslash ]'
+
+
+def test_can_parse_streamed_response_without_connection():
+    connection_parser = StreamedConnectionParser()
+    connection_parser.feed(b'{"errors": [{"message": "some error"}]}')
+    assert connection_parser.close() == {"errors": [{"message": "some error"}]}
+
+
+def test_fails_to_parse_streamed_response_that_is_cut_short():
+    response_text = json.dumps(new_fake_project_items_response([new_fake_project_item_map("a", "t1")])["json"])
+    connection_parser = StreamedConnectionParser()
+    connection_parser.feed(response_text[: len(response_text) // 2].encode("utf-8"))
+    with pytest.raises(GraphQlError, match="GraphQL response must include valid nodes"):
+        connection_parser.close()
+
+
+def test_can_complete_nested_connections_batched_across_parent_nodes():
+    def _new_fake_pull_request(pull_request_id: str, has_next_page: bool):
+        result = new_fake_project_item_info(
+            closing_issues_references=[LinkedProjectItemNode(id=f"{pull_request_id}_issue_0", number=0, title="a")]
+        )
+        result.id = pull_request_id
+        result.closing_issues_references.page_info = PageInfo(endCursor="cursor_1", hasNextPage=has_next_page)
+        return result
+
+    def _nested_connection_pages(request, context):
+        variables = request.json()["variables"]
+        requested_variables.append(variables)
+        data_map = {}
+        for index in range(len(variables) // 2):
+            pull_request_id = variables[f"id{index}"]
+            page_number = int(variables[f"after{index}"].removeprefix("cursor_"))
+            has_next_page = pull_request_id == "pr_a" and page_number == 1
+            data_map[f"node{index}"] = {
+                "closingIssuesReferences": {
+                    "nodes": [
+                        {"id": f"{pull_request_id}_issue_{page_number}", "number": page_number, "title": "dummy"}
+                    ],
+                    "pageInfo": {"endCursor": f"cursor_{page_number + 1}", "hasNextPage": has_next_page},
+                }
+            }
+        return {"data": data_map}
+
+    requested_variables = []
+    pull_requests = [
+        _new_fake_pull_request("pr_a", has_next_page=True),
+        _new_fake_pull_request("pr_b", has_next_page=True),
+        _new_fake_pull_request("pr_c", has_next_page=False),
+    ]
+    nested_connection = NestedConnection(
+        "PullRequest", "closingIssuesReferences", "id number title", "closing_issues_references", LinkedProjectItemInfo
+    )
+    with requests_mock.Mocker() as mock:
+        mock.post(GRAPHQL_ENDPOINT, json=_nested_connection_pages)
+        complete_nested_connections(requests.Session(), pull_requests, nested_connection)
+    assert requested_variables == [
+        {"id0": "pr_a", "after0": "cursor_1", "id1": "pr_b", "after1": "cursor_1"},
+        {"id0": "pr_a", "after0": "cursor_2"},
+    ]
+    assert [
+        [closing_issue.id for closing_issue in pull_request.closing_issues_references.nodes]
+        for pull_request in pull_requests
+    ] == [["pr_a_issue_0", "pr_a_issue_1", "pr_a_issue_2"], ["pr_b_issue_0", "pr_b_issue_1"], ["pr_c_issue_0"]]
+
+
+def _queried_fake_project_item_ids_and_requested_cursors(
+    item_count: int,
+    is_parallel: bool,
+    is_offset_cursor: bool = True,
+    unexpected_cursor_offset: int | None = None,
+    after: str | None = None,
+    max_working_page_size: int = 100,
+    first_offset_with_max_working_page_size: int = 0,
+    large_page_offset: int | None = None,
+) -> tuple[list[str], list[str | None]]:
+    def _cursor(offset: int) -> str:
+        is_unexpected = offset == unexpected_cursor_offset
+        return (
+            base64.b64encode(str(offset).encode("ascii")).decode("ascii").rstrip("=")
+            if is_offset_cursor and not is_unexpected
+            else f"opaque_{offset}"
+        )
+
+    def _offset(cursor: str | None) -> int:
+        if cursor is None:
+            return 0
+        if cursor.startswith("opaque_"):
+            return int(cursor.removeprefix("opaque_"))
+        return int(base64.b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+    requested_cursors = []
+
+    def _project_items_page(request, context):
+        variables = request.json()["variables"]
+        cursor = variables.get("after")
+        requested_cursors.append(cursor)
+        page_size = variables["maxEntriesPerPage"]
+        offset = _offset(cursor)
+        if page_size > max_working_page_size and offset >= first_offset_with_max_working_page_size:
+            context.status_code = 502
+            return {}
+        end_offset = min(offset + page_size, item_count)
+        project_item_maps = [new_fake_project_item_map(f"item_{index}", "t1") for index in range(offset, end_offset)]
+        if offset == large_page_offset:
+            project_item_maps[0]["content"]["title"] = "x" * 1_000_000
+        return {
+            "data": {
+                "node": {
+                    "__typename": "ProjectV2",
+                    "id": "dummy_project_id",
+                    "number": 1,
+                    "items": {
+                        "totalCount": item_count,
+                        "nodes": project_item_maps,
+                        "pageInfo": {"endCursor": _cursor(end_offset), "hasNextPage": end_offset < item_count},
+                    },
+                }
+            }
+        }
+
+    with requests_mock.Mocker() as mock:
+        mock.post(GRAPHQL_ENDPOINT, json=_project_items_page)
+        project_item_ids = [
+            project_item_info.id
+            for page_query_info in paginated_query_infos(
+                NodeByIdInfo,
+                GraphQlQuery.PROJECT_V2_ITEMS.name,
+                requests.Session(),
+                "dummy_project_owner_name",
+                "dummy_project_id",
+                is_parallel=is_parallel,
+                after=after,
+            )
+            for project_item_info in page_query_info.nodes
+        ]
+    return project_item_ids, requested_cursors
+
+
 def _mocked_query_infos_from_json_files(json_files_base_name: list[str]) -> list:
     test_data_base_folder = Path(__file__).parent / "data" / "test_can_query_mocked_query_infos"
     with requests_mock.Mocker() as mock:
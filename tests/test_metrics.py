@@ -0,0 +1,72 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import tempfile
+from pathlib import Path
+
+import requests
+
+from check_done.metrics import (
+    PROMETHEUS_TEXT_CONTENT_TYPE,
+    MetricName,
+    Metrics,
+    started_metrics_http_server,
+    write_prometheus_text_file,
+)
+
+
+def test_can_render_prometheus_text():
+    metrics = Metrics()
+    metrics.increase(MetricName.WARNINGS, rule="open")
+    metrics.increase(MetricName.WARNINGS, 2, rule="open")
+    metrics.increase(MetricName.WARNINGS, rule="unassigned")
+    metrics.set(MetricName.RATE_LIMIT_REMAINING_POINTS, 4999)
+    assert metrics.prometheus_text() == (
+        "# HELP check_done_rate_limit_remaining_points GraphQL rate limit points remaining in the current window.\n"
+        "# TYPE check_done_rate_limit_remaining_points gauge\n"
+        "check_done_rate_limit_remaining_points 4999\n"
+        "# HELP check_done_warnings_total Warnings found in project items, by rule.\n"
+        "# TYPE check_done_warnings_total counter\n"
+        'check_done_warnings_total{rule="open"} 3\n'
+        'check_done_warnings_total{rule="unassigned"} 1\n'
+    )
+
+
+def test_can_render_empty_prometheus_text():
+    assert Metrics().prometheus_text() == ""
+
+
+def test_can_escape_prometheus_label_values():
+    metrics = Metrics()
+    metrics.increase(MetricName.PAGES_FETCHED, query='some"\\query\n')
+    assert 'check_done_pages_fetched_total{query="some\\"\\\\query\\n"} 1\n' in metrics.prometheus_text()
+
+
+def test_can_measure_duration():
+    metrics = Metrics()
+    with metrics.measured_duration(MetricName.RUN_DURATION_SECONDS):
+        pass
+    assert metrics.value(MetricName.RUN_DURATION_SECONDS) >= 0
+
+
+def test_can_write_prometheus_text_file():
+    metrics = Metrics()
+    metrics.increase(MetricName.ITEMS_CHECKED, 7)
+    with tempfile.TemporaryDirectory() as temp_folder:
+        metrics_path = Path(temp_folder) / "check_done.prom"
+        write_prometheus_text_file(metrics, metrics_path)
+        assert "check_done_items_checked_total 7\n" in metrics_path.read_text()
+        assert [path.name for path in Path(temp_folder).iterdir()] == ["check_done.prom"]
+
+
+def test_can_serve_metrics_via_http():
+    metrics = Metrics()
+    metrics.increase(MetricName.ITEMS_CHECKED, 3)
+    metrics_server = started_metrics_http_server(metrics, 0)
+    try:
+        response = requests.get(f"http://127.0.0.1:{metrics_server.server_port}/metrics", timeout=5)
+    finally:
+        metrics_server.shutdown()
+        metrics_server.server_close()
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == PROMETHEUS_TEXT_CONTENT_TYPE
+    assert "check_done_items_checked_total 3\n" in response.text
@@ -1,14 +1,19 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
+import time
+from unittest.mock import patch
+
 import pytest
 import requests
 import requests_mock
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 
-from check_done.graphql import HttpBearerAuth
+from check_done.graphql import DeadlineExceededError, HttpBearerAuth, RequestTimeouts
+from check_done.metrics import MetricName, Metrics
 from check_done.organization_authentication import (
     AuthenticationError,
+    OrganizationAccessTokenAuth,
     generate_jwt_token,
     resolve_github_app_installation_id,
     resolve_organization_access_token,
@@ -58,6 +63,34 @@ def test_can_resolve_organization_access_token_from_bad_requests():
     assert token == _DUMMY_ACCESS_TOKEN
 
 
+def test_can_measure_organization_access_token_resolution_duration():
+    metrics = Metrics()
+    with requests_mock.Mocker() as mock:
+        mock.get(f"https://api.github.com/orgs/{_DUMMY_ORGANIZATION_NAME}/installation", status_code=400)
+        with pytest.raises(AuthenticationError):
+            resolve_organization_access_token(
+                _DUMMY_ORGANIZATION_NAME, _DUMMY_GITHUB_APP_ID, _FAKE_PEM_PRIVATE_KEY, metrics
+            )
+    assert metrics.value(MetricName.AUTHENTICATION_DURATION_SECONDS) >= 0
+
+
+def test_fails_with_deadline_exceeded_if_organization_access_token_resolution_times_out_at_deadline():
+    def _send_until_deadline_timeout(*_, **__):
+        time.sleep(0.1)
+        raise requests.ReadTimeout("Read timed out.")
+
+    with (
+        patch("requests.adapters.HTTPAdapter.send", side_effect=_send_until_deadline_timeout),
+        pytest.raises(DeadlineExceededError),
+    ):
+        resolve_organization_access_token(
+            _DUMMY_ORGANIZATION_NAME,
+            _DUMMY_GITHUB_APP_ID,
+            _FAKE_PEM_PRIVATE_KEY,
+            request_timeouts=RequestTimeouts(deadline_in_seconds=0.05),
+        )
+
+
 def test_fails_to_generate_jwt_token():
     invalid_private_key_value = ""
     with pytest.raises(Exception, match="Cannot generate JWT token: Could not parse the provided public key."):
@@ -108,6 +141,21 @@ def test_fails_to_resolve_access_token_from_github_app_installation_id():
             resolve_organization_access_token(_DUMMY_ORGANIZATION_NAME, _DUMMY_GITHUB_APP_ID, _FAKE_PEM_PRIVATE_KEY)
 
 
+def test_can_renew_organization_access_token():
+    auth = OrganizationAccessTokenAuth(_DUMMY_ORGANIZATION_NAME, _DUMMY_GITHUB_APP_ID, _FAKE_PEM_PRIVATE_KEY)
+    with (
+        patch(
+            "check_done.organization_authentication.resolve_organization_access_token",
+            side_effect=["first_access_token", "second_access_token"],
+        ) as resolve_mock,
+        patch("check_done.organization_authentication.time.monotonic", side_effect=[0.0, 60.0, 3600.0, 3600.0]),
+    ):
+        assert auth.access_token == "first_access_token"
+        assert auth.access_token == "first_access_token"
+        assert auth.access_token == "second_access_token"
+    assert resolve_mock.call_count == 2
+
+
 def _session():
     assert DEMO_CHECK_DONE_GITHUB_APP_ID is not None
     assert DEMO_CHECK_DONE_GITHUB_APP_PRIVATE_KEY is not None
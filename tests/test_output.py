@@ -0,0 +1,92 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import io
+import json
+
+from check_done.output import OutputFormat, project_item_check_records, write_project_item_check_records
+from tests._common import new_fake_project_item_info
+
+_DUMMY_PROJECT_URL = "https://github.com/users/fake-username/projects/1"
+
+
+def test_can_write_jsonl():
+    target = io.StringIO()
+    write_project_item_check_records(OutputFormat.jsonl, _fake_project_item_check_records(), target)
+    records = [json.loads(line) for line in target.getvalue().splitlines()]
+    assert records == [
+        {
+            "project": _DUMMY_PROJECT_URL,
+            "repository": "fake_repository",
+            "number": 1,
+            "type": "PullRequest",
+            "title": "fake_title",
+            "rule_ids": ["open", "unassigned"],
+            "warning_reasons": ["be closed", "be assigned"],
+        },
+        {
+            "project": _DUMMY_PROJECT_URL,
+            "repository": "fake_repository",
+            "number": 2,
+            "type": "PullRequest",
+            "title": "fake_title",
+            "rule_ids": [],
+            "warning_reasons": [],
+        },
+    ]
+
+
+def test_can_write_json():
+    target = io.StringIO()
+    write_project_item_check_records(OutputFormat.json, _fake_project_item_check_records(), target)
+    records = json.loads(target.getvalue())
+    assert [record["number"] for record in records] == [1, 2]
+    assert records[0]["rule_ids"] == ["open", "unassigned"]
+
+
+def test_can_write_empty_json():
+    target = io.StringIO()
+    write_project_item_check_records(OutputFormat.json, [], target)
+    assert json.loads(target.getvalue()) == []
+
+
+def test_can_write_sarif():
+    target = io.StringIO()
+    write_project_item_check_records(OutputFormat.sarif, _fake_project_item_check_records(), target)
+    sarif_map = json.loads(target.getvalue())
+    assert sarif_map["version"] == "2.1.0"
+    (run_map,) = sarif_map["runs"]
+    rule_ids = [rule_map["id"] for rule_map in run_map["tool"]["driver"]["rules"]]
+    assert "open" in rule_ids
+    assert "missing_closing_issue_reference_in_pull_request" in rule_ids
+    assert [result_map["ruleId"] for result_map in run_map["results"]] == ["open", "unassigned"]
+    first_result_map = run_map["results"][0]
+    assert first_result_map["message"]["text"] == "Project item should be closed."
+    assert first_result_map["locations"][0]["logicalLocations"][0]["fullyQualifiedName"] == "fake_repository#1"
+    assert first_result_map["properties"]["project"] == _DUMMY_PROJECT_URL
+
+
+def test_can_write_empty_sarif():
+    target = io.StringIO()
+    write_project_item_check_records(OutputFormat.sarif, [], target)
+    assert json.loads(target.getvalue())["runs"][0]["results"] == []
+
+
+def test_can_stream_records_as_soon_as_they_are_checked():
+    target = io.StringIO()
+    written_line_counts = []
+
+    def _project_items():
+        for number in range(1, 4):
+            written_line_counts.append(len(target.getvalue().splitlines()))
+            yield new_fake_project_item_info(number=number)
+
+    records = project_item_check_records(_DUMMY_PROJECT_URL, _project_items())
+    write_project_item_check_records(OutputFormat.jsonl, records, target)
+    assert written_line_counts == [0, 1, 2]
+
+
+def _fake_project_item_check_records():
+    return project_item_check_records(
+        _DUMMY_PROJECT_URL,
+        [new_fake_project_item_info(closed=False, assignees_count=0), new_fake_project_item_info(number=2)],
+    )
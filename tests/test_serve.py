@@ -0,0 +1,403 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+import hashlib
+import hmac
+import http.client
+import json
+from pathlib import Path
+
+import requests
+import requests_mock
+
+from check_done.done_project_items_info import ProjectItemFilter
+from check_done.graphql import GRAPHQL_ENDPOINT
+from check_done.info import GithubProjectItemType
+from check_done.serve import (
+    ProjectWarningsIndex,
+    WebhookReceiver,
+    is_valid_webhook_signature,
+    started_webhook_http_server,
+)
+from tests._common import (
+    FAKE_DONE_OPTION_ID,
+    FAKE_IN_PROGRESS_OPTION_ID,
+    new_fake_nodes_response,
+    new_fake_project_item_map,
+    new_fake_project_items_response,
+)
+
+_TEST_DATA_FOLDER = Path(__file__).parent / "data" / "test_serve"
+_DUMMY_WEBHOOK_SECRET = "dummy_webhook_secret"
+_PROJECT_ID = "PVT_kwDOCtvHBM4Ai0Q8"
+_PROJECT_ITEM_ID = "PVTI_lADOCtvHBM4Ai0Q8zgTkCxQ"
+_COMMIT_OID = "4f6a3c1d2e9b8a7f6e5d4c3b2a1f0e9d8c7b6a59"
+_ISSUE_ID = "I_kwDOMCGoX86Uq6ez"
+_PULL_REQUEST_ID = "PR_kwDOMCGoX855VkZy"
+
+
+def test_can_validate_webhook_signature():
+    body = b'{"zen": "Keep it logically awesome."}'
+    signature = _signature(body)
+    assert is_valid_webhook_signature(_DUMMY_WEBHOOK_SECRET, body, signature)
+    assert not is_valid_webhook_signature(_DUMMY_WEBHOOK_SECRET, body + b" ", signature)
+    assert not is_valid_webhook_signature("other_webhook_secret", body, signature)
+    assert not is_valid_webhook_signature(_DUMMY_WEBHOOK_SECRET, body, signature.removeprefix("sha256="))
+    assert not is_valid_webhook_signature(_DUMMY_WEBHOOK_SECRET, body, None)
+
+
+def test_can_update_project_warnings_index():
+    warnings_index = ProjectWarningsIndex()
+    assert warnings_index.updated("project", "item", "some warning") == (["some warning"], [])
+    assert warnings_index.updated("project", "item", "some warning") == ([], [])
+    assert warnings_index.updated("other_project", "item", "other warning") == (["other warning"], [])
+    assert warnings_index.warnings("project") == ["some warning"]
+    assert warnings_index.updated("project", "item", None) == ([], ["some warning"])
+    assert warnings_index.warnings("project") == []
+    assert warnings_index.warnings("no_such_project") == []
+
+
+def test_can_ignore_outdated_check_in_project_warnings_index():
+    warnings_index = ProjectWarningsIndex()
+    earlier_check_number = warnings_index.new_check_number()
+    later_check_number = warnings_index.new_check_number()
+    assert warnings_index.updated("project", "item", None, later_check_number) == ([], [])
+    assert warnings_index.updated("project", "item", "outdated warning", earlier_check_number) == ([], [])
+    assert warnings_index.warnings("project") == []
+    assert warnings_index.updated("project", "other_item", "other warning", earlier_check_number) == (
+        ["other warning"],
+        [],
+    )
+
+
+def test_can_check_all_project_items():
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_items_response(
+                    [
+                        new_fake_project_item_map("a", "t1", number=1),
+                        new_fake_project_item_map("b", "t1", number=2, closed=False),
+                        new_fake_project_item_map(
+                            "c", "t1", number=3, closed=False, option_id=FAKE_IN_PROGRESS_OPTION_ID
+                        ),
+                    ]
+                )
+            ],
+        )
+        webhook_receiver = _webhook_receiver()
+        warnings_delta = webhook_receiver.checked_all_project_items()
+    assert len(warnings_delta.appeared) == 1
+    assert "#2 " in warnings_delta.appeared[0]
+    assert webhook_receiver.warnings_index.warnings(_PROJECT_ID) == warnings_delta.appeared
+
+
+def test_can_skip_project_items_of_other_repositories_and_types_when_checking_all():
+    included_issue_map = new_fake_project_item_map("a", "t1", number=1, closed=False)
+    excluded_repository_issue_map = new_fake_project_item_map("b", "t1", number=2, closed=False)
+    excluded_repository_issue_map["content"]["repository"]["name"] = "excluded_repository"
+    # NOTE: The content of this project item cannot be validated, so it must be skipped before its model is built.
+    excluded_repository_issue_map["content"]["number"] = "not_a_number"
+    project_item_filter = ProjectItemFilter(
+        repository_names_to_exclude=["excluded_repository"],
+        project_item_types_to_exclude=[GithubProjectItemType.pull_request],
+    )
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[new_fake_project_items_response([included_issue_map, excluded_repository_issue_map])],
+        )
+        webhook_receiver = WebhookReceiver(
+            requests.Session(),
+            "dummy-organization",
+            _PROJECT_ID,
+            FAKE_DONE_OPTION_ID,
+            project_item_filter=project_item_filter,
+        )
+        warnings_delta = webhook_receiver.checked_all_project_items()
+        request_variables = mock.last_request.json()["variables"]
+    assert request_variables["includeIssues"] is True
+    assert request_variables["includePullRequests"] is False
+    assert len(warnings_delta.appeared) == 1
+    assert "#1 " in warnings_delta.appeared[0]
+
+
+def test_can_handle_projects_v2_item_event():
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[new_fake_nodes_response([new_fake_project_item_map(_PROJECT_ITEM_ID, "t1", closed=False)])],
+        )
+        warnings_delta = _webhook_receiver().handled_event("projects_v2_item", _payload("projects_v2_item_edited"))
+        assert mock.call_count == 1
+        assert mock.last_request.json()["variables"] == {"ids": [_PROJECT_ITEM_ID]}
+    assert len(warnings_delta.appeared) == 1
+    assert "be closed" in warnings_delta.appeared[0]
+
+
+def test_can_handle_projects_v2_item_event_moved_out_of_project_status():
+    webhook_receiver = _webhook_receiver()
+    webhook_receiver.warnings_index.updated(_PROJECT_ID, _PROJECT_ITEM_ID, "some warning")
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_nodes_response(
+                    [
+                        new_fake_project_item_map(
+                            _PROJECT_ITEM_ID, "t2", closed=False, option_id=FAKE_IN_PROGRESS_OPTION_ID
+                        )
+                    ]
+                )
+            ],
+        )
+        warnings_delta = webhook_receiver.handled_event("projects_v2_item", _payload("projects_v2_item_edited"))
+    assert warnings_delta == ([], ["some warning"])
+
+
+def test_can_handle_deleted_projects_v2_item_event_without_query():
+    webhook_receiver = _webhook_receiver()
+    webhook_receiver.warnings_index.updated(_PROJECT_ID, _PROJECT_ITEM_ID, "some warning")
+    with requests_mock.Mocker() as mock:
+        warnings_delta = webhook_receiver.handled_event("projects_v2_item", _payload("projects_v2_item_deleted"))
+        assert mock.call_count == 0
+    assert warnings_delta == ([], ["some warning"])
+
+
+def test_can_ignore_projects_v2_item_event_of_other_project():
+    payload = _payload("projects_v2_item_edited")
+    payload["projects_v2_item"]["project_node_id"] = "other_project_id"
+    with requests_mock.Mocker() as mock:
+        warnings_delta = _webhook_receiver().handled_event("projects_v2_item", payload)
+        assert mock.call_count == 0
+    assert warnings_delta == ([], [])
+
+
+def test_can_handle_issues_event():
+    webhook_receiver = _webhook_receiver()
+    webhook_receiver.warnings_index.updated(_PROJECT_ID, _PROJECT_ITEM_ID, "some warning")
+    with requests_mock.Mocker() as mock:
+        mock.post(GRAPHQL_ENDPOINT, response_list=[_content_response("I_kwDOMCGoX86Uq6ez", closed=True)])
+        warnings_delta = webhook_receiver.handled_event("issues", _payload("issues_closed"))
+        assert mock.last_request.json()["variables"] == {"id": "I_kwDOMCGoX86Uq6ez"}
+    assert warnings_delta == ([], ["some warning"])
+
+
+def test_can_handle_pull_request_event():
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[_content_response("PR_kwDOMCGoX855VkZy", closed=True, typename="PullRequest")],
+        )
+        warnings_delta = _webhook_receiver().handled_event("pull_request", _payload("pull_request_edited"))
+        assert mock.last_request.json()["variables"] == {"id": "PR_kwDOMCGoX855VkZy"}
+    assert len(warnings_delta.appeared) == 1
+    assert "have a closing issue reference" in warnings_delta.appeared[0]
+
+
+def test_can_check_pull_requests_again_when_closing_issue_is_closed():
+    webhook_receiver = _webhook_receiver()
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                _content_response(_PULL_REQUEST_ID, closed=True, typename="PullRequest", closing_issue_ids=[_ISSUE_ID]),
+                new_fake_nodes_response([{"__typename": "Issue", "id": _ISSUE_ID, "closed": False}]),
+                _content_response(_ISSUE_ID, closed=True, project_item_id="PVTI_of_issue"),
+                _content_response(_PULL_REQUEST_ID, closed=True, typename="PullRequest", closing_issue_ids=[_ISSUE_ID]),
+                new_fake_nodes_response([{"__typename": "Issue", "id": _ISSUE_ID, "closed": True}]),
+            ],
+        )
+        pull_request_warnings_delta = webhook_receiver.handled_event("pull_request", _payload("pull_request_edited"))
+        issue_warnings_delta = webhook_receiver.handled_event("issues", _payload("issues_closed"))
+        assert mock.call_count == 5
+    assert len(pull_request_warnings_delta.appeared) == 1
+    assert "have all closing issues closed" in pull_request_warnings_delta.appeared[0]
+    assert issue_warnings_delta == ([], pull_request_warnings_delta.appeared)
+
+
+def test_can_handle_check_suite_event():
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                _pull_requests_by_commit_response([_PULL_REQUEST_ID]),
+                _content_response(
+                    _PULL_REQUEST_ID,
+                    closed=True,
+                    typename="PullRequest",
+                    closing_issue_ids=[],
+                    status_check_rollup_state="FAILURE",
+                ),
+            ],
+        )
+        warnings_delta = _webhook_receiver().handled_event("check_suite", _payload("check_suite_completed"))
+        assert mock.request_history[0].json()["variables"] == {
+            "owner": "dummy-organization",
+            "name": "check_done_demo",
+            "oid": _COMMIT_OID,
+        }
+        assert mock.last_request.json()["variables"] == {"id": _PULL_REQUEST_ID}
+    assert len(warnings_delta.appeared) == 1
+    assert "have all status checks passed" in warnings_delta.appeared[0]
+
+
+def test_can_ignore_check_suite_event_before_completion():
+    payload = _payload("check_suite_completed")
+    payload["action"] = "requested"
+    with requests_mock.Mocker() as mock:
+        warnings_delta = _webhook_receiver().handled_event("check_suite", payload)
+        assert mock.call_count == 0
+    assert warnings_delta == ([], [])
+
+
+def test_can_handle_status_event():
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                _pull_requests_by_commit_response([_PULL_REQUEST_ID]),
+                _content_response(
+                    _PULL_REQUEST_ID,
+                    closed=True,
+                    typename="PullRequest",
+                    closing_issue_ids=[],
+                    status_check_rollup_state="SUCCESS",
+                ),
+            ],
+        )
+        webhook_receiver = _webhook_receiver()
+        webhook_receiver.warnings_index.updated(_PROJECT_ID, _PROJECT_ITEM_ID, "some warning")
+        warnings_delta = webhook_receiver.handled_event("status", _payload("status"))
+        assert mock.request_history[0].json()["variables"]["oid"] == _COMMIT_OID
+    assert len(warnings_delta.appeared) == 1
+    assert "have a closing issue reference" in warnings_delta.appeared[0]
+    assert warnings_delta.resolved == ["some warning"]
+
+
+def test_can_ignore_ping_event():
+    with requests_mock.Mocker() as mock:
+        warnings_delta = _webhook_receiver().handled_event("ping", _payload("ping"))
+        assert mock.call_count == 0
+    assert warnings_delta == ([], [])
+
+
+def test_can_receive_webhooks_via_http():
+    webhook_receiver = _webhook_receiver()
+    webhook_server = started_webhook_http_server(webhook_receiver, _DUMMY_WEBHOOK_SECRET, 0)
+    webhook_url = f"http://127.0.0.1:{webhook_server.server_port}/"
+    try:
+        with requests_mock.Mocker(real_http=True) as mock:
+            mock.post(
+                GRAPHQL_ENDPOINT,
+                response_list=[
+                    new_fake_nodes_response([new_fake_project_item_map(_PROJECT_ITEM_ID, "t1", closed=False)])
+                ],
+            )
+            body = (_TEST_DATA_FOLDER / "projects_v2_item_edited.json").read_bytes()
+            unsigned_response = requests.post(
+                webhook_url, data=body, headers={"X-GitHub-Event": "projects_v2_item"}, timeout=5
+            )
+            signed_response = requests.post(
+                webhook_url,
+                data=body,
+                headers={"X-GitHub-Event": "projects_v2_item", "X-Hub-Signature-256": _signature(body)},
+                timeout=5,
+            )
+            warnings_response = requests.get(f"{webhook_url}warnings", timeout=5)
+    finally:
+        webhook_server.shutdown()
+        webhook_server.server_close()
+    assert unsigned_response.status_code == 401
+    assert signed_response.status_code == 204
+    assert warnings_response.status_code == 200
+    warnings = warnings_response.json()
+    assert len(warnings) == 1
+    assert "be closed" in warnings[0]
+
+
+def test_can_reject_too_large_webhook_via_http():
+    webhook_server = started_webhook_http_server(_webhook_receiver(), _DUMMY_WEBHOOK_SECRET, 0)
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", webhook_server.server_port, timeout=5)
+        try:
+            # NOTE: Only announce the large body without sending it, so the response shows it was not read.
+            connection.putrequest("POST", "/")
+            connection.putheader("Content-Length", str(1024 * 1024 * 1024))
+            connection.putheader("X-GitHub-Event", "projects_v2_item")
+            connection.endheaders()
+            response = connection.getresponse()
+        finally:
+            connection.close()
+    finally:
+        webhook_server.shutdown()
+        webhook_server.server_close()
+    assert response.status == 413
+
+
+def _webhook_receiver() -> WebhookReceiver:
+    return WebhookReceiver(requests.Session(), "dummy-organization", _PROJECT_ID, FAKE_DONE_OPTION_ID)
+
+
+def _payload(name: str) -> dict:
+    with (_TEST_DATA_FOLDER / f"{name}.json").open(encoding="utf-8") as payload_file:
+        return json.load(payload_file)
+
+
+def _signature(body: bytes) -> str:
+    return "sha256=" + hmac.new(_DUMMY_WEBHOOK_SECRET.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def _pull_requests_by_commit_response(pull_request_ids: list[str]) -> dict:
+    return {
+        "json": {
+            "data": {
+                "repository": {
+                    "object": {
+                        "associatedPullRequests": {
+                            "nodes": [{"id": pull_request_id} for pull_request_id in pull_request_ids]
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+
+def _content_response(
+    content_id: str,
+    closed: bool,
+    typename: str = "Issue",
+    project_item_id: str = _PROJECT_ITEM_ID,
+    closing_issue_ids: list[str] | None = None,
+    status_check_rollup_state: str | None = None,
+) -> dict:
+    content_map = {
+        **new_fake_project_item_map(project_item_id, "t2", closed=closed)["content"],
+        "__typename": typename,
+        "id": content_id,
+        "projectItems": {
+            "nodes": [
+                {
+                    "id": project_item_id,
+                    "project": {"id": _PROJECT_ID},
+                    "fieldValueByName": {"status": "Done", "optionId": FAKE_DONE_OPTION_ID},
+                },
+                {
+                    "id": "PVTI_of_other_project",
+                    "project": {"id": "other_project_id"},
+                    "fieldValueByName": {"status": "Done", "optionId": "other_done_option_id"},
+                },
+            ]
+        },
+    }
+    if typename == "PullRequest":
+        content_map["closingIssuesReferences"] = {
+            "nodes": [
+                {"id": closing_issue_id, "number": 100 + index, "title": f"dummy_closing_issue_{closing_issue_id}"}
+                for index, closing_issue_id in enumerate(closing_issue_ids or [])
+            ]
+        }
+        if status_check_rollup_state is not None:
+            content_map["statusCheckRollup"] = {"state": status_check_rollup_state}
+    return {"json": {"data": {"node": content_map}}}
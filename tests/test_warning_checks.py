@@ -1,13 +1,24 @@
 # Copyright (C) 2024-2025 by Siisurit e.U., Austria.
 # All rights reserved. Distributed under the MIT License.
-from check_done.info import GithubProjectItemType
+import tracemalloc
+
+from check_done.info import GithubProjectItemType, LinkedProjectItemNode, RepositoryInfo, StatusCheckRollupState
+from check_done.metrics import MetricName, Metrics
 from check_done.warning_checks import (
+    CompactProjectItem,
+    compact_project_item,
     sentence_from_project_item_warning_reasons,
+    violated_rule_id_to_warning_reason_map,
+    warning_for_project_item,
+    warning_reason_if_closing_issues_are_open,
     warning_reason_if_missing_closing_issue_reference_in_pull_request,
     warning_reason_if_missing_milestone,
     warning_reason_if_open,
+    warning_reason_if_pull_request_is_unmerged,
+    warning_reason_if_status_checks_are_unsuccessful,
     warning_reason_if_tasks_are_uncompleted,
     warning_reason_if_unassigned,
+    warning_rule_id,
     warnings_for_done_project_items,
 )
 from tests._common import new_fake_project_item_info
@@ -37,6 +48,39 @@ def test_can_resolve_warnings_for_done_project_items():
     )
 
 
+def test_can_add_warnings_for_done_project_items_to_metrics():
+    metrics = Metrics()
+    fake_done_project_items = [
+        new_fake_project_item_info(closed=False),
+        new_fake_project_item_info(closed=False, assignees_count=0),
+        new_fake_project_item_info(),
+    ]
+    warnings_for_done_project_items(fake_done_project_items, metrics)
+    assert metrics.value(MetricName.ITEMS_CHECKED) == 3
+    assert metrics.value(MetricName.WARNINGS, rule="open") == 2
+    assert metrics.value(MetricName.WARNINGS, rule="unassigned") == 1
+    assert metrics.value(MetricName.WARNINGS, rule="missing_milestone") is None
+
+
+def test_can_check_only_rules_of_project_item():
+    project_item_info = new_fake_project_item_info(closed=False, assignees_count=0, has_no_milestone=True)
+    assert list(violated_rule_id_to_warning_reason_map(project_item_info)) == [
+        "open",
+        "unassigned",
+        "missing_milestone",
+    ]
+    checked_project_item = compact_project_item(project_item_info, checked_rule_ids=("missing_milestone", "unassigned"))
+    assert list(violated_rule_id_to_warning_reason_map(checked_project_item)) == ["unassigned", "missing_milestone"]
+
+
+def test_can_resolve_warning_rule_id():
+    assert warning_rule_id(warning_reason_if_open) == "open"
+    assert (
+        warning_rule_id(warning_reason_if_missing_closing_issue_reference_in_pull_request)
+        == "missing_closing_issue_reference_in_pull_request"
+    )
+
+
 def test_warnings_for_done_project_items_with_empty_list_of_done_project_items():
     empty_fake_warnings = warnings_for_done_project_items([])
     assert len(empty_fake_warnings) == 0
@@ -147,3 +191,117 @@ def test_can_return_warning_reason_if_project_item_is_missing_closing_issue_refe
         warning_reason_if_missing_closing_issue_reference_in_pull_request(pull_request_with_closing_issue_reference)
         is None
     )
+
+
+def test_can_return_warning_reason_if_closing_issues_of_project_item_are_open():
+    pull_request = new_fake_project_item_info(
+        closing_issues_references=[
+            LinkedProjectItemNode(id="closed_issue_id", number=1, title="closed_issue"),
+            LinkedProjectItemNode(id="open_issue_id", number=2, title="open_issue"),
+        ]
+    )
+    assert (
+        warning_reason_if_closing_issues_are_open(
+            compact_project_item(
+                pull_request, closing_issue_id_to_is_closed_map={"closed_issue_id": True, "open_issue_id": False}
+            )
+        )
+        == "have all closing issues closed"
+    )
+    assert (
+        warning_reason_if_closing_issues_are_open(
+            compact_project_item(pull_request, closing_issue_id_to_is_closed_map={"closed_issue_id": True})
+        )
+        is None
+    )
+    assert warning_reason_if_closing_issues_are_open(pull_request) is None
+
+
+def test_can_return_warning_reason_if_pull_request_is_unmerged():
+    unmerged_pull_request = new_fake_project_item_info(merged=False)
+    assert warning_reason_if_pull_request_is_unmerged(unmerged_pull_request) == "be merged"
+
+    merged_pull_request = new_fake_project_item_info(merged=True)
+    assert warning_reason_if_pull_request_is_unmerged(merged_pull_request) is None
+
+    open_pull_request = new_fake_project_item_info(closed=False, merged=False)
+    assert warning_reason_if_pull_request_is_unmerged(open_pull_request) is None
+    assert list(violated_rule_id_to_warning_reason_map(open_pull_request)) == ["open"]
+
+    issue = new_fake_project_item_info(typename=GithubProjectItemType.issue)
+    assert warning_reason_if_pull_request_is_unmerged(issue) is None
+
+
+def test_can_return_warning_reason_if_status_checks_are_unsuccessful():
+    for status_check_rollup_state in (
+        StatusCheckRollupState.FAILURE,
+        StatusCheckRollupState.ERROR,
+        StatusCheckRollupState.PENDING,
+    ):
+        pull_request_with_unsuccessful_status_checks = new_fake_project_item_info(
+            status_check_rollup_state=status_check_rollup_state
+        )
+        assert (
+            warning_reason_if_status_checks_are_unsuccessful(pull_request_with_unsuccessful_status_checks)
+            == "have all status checks passed"
+        )
+
+    pull_request_with_successful_status_checks = new_fake_project_item_info(
+        status_check_rollup_state=StatusCheckRollupState.SUCCESS
+    )
+    assert warning_reason_if_status_checks_are_unsuccessful(pull_request_with_successful_status_checks) is None
+
+    pull_request_without_status_checks = new_fake_project_item_info()
+    assert warning_reason_if_status_checks_are_unsuccessful(pull_request_without_status_checks) is None
+
+
+def test_can_compact_project_item():
+    project_item = new_fake_project_item_info(
+        assignees_count=2, body_html='<input type="checkbox" class="task-list-item-checkbox">', closed=False
+    )
+    compact_item = compact_project_item(project_item)
+    assert compact_item == CompactProjectItem(
+        typename=GithubProjectItemType.pull_request,
+        number=1,
+        title="fake_title",
+        repository_name="fake_repository",
+        closed=False,
+        assignees_count=2,
+        has_milestone=True,
+        has_uncompleted_tasks=True,
+        closing_issues_reference_count=1,
+    )
+    assert not hasattr(compact_item, "__dict__")
+    assert compact_project_item(compact_item) is compact_item
+    assert warning_for_project_item(compact_item) == warning_for_project_item(project_item)
+
+
+def test_can_share_repository_name_between_compact_project_items():
+    first_compact_item = compact_project_item(new_fake_project_item_info(repository=RepositoryInfo(name="".join("ab"))))
+    second_compact_item = compact_project_item(
+        new_fake_project_item_info(repository=RepositoryInfo(name="".join("ab")))
+    )
+    assert first_compact_item.repository_name is second_compact_item.repository_name
+
+
+def test_can_keep_compact_project_items_in_less_memory():
+    full_size = _retained_memory_size(lambda project_item: project_item)
+    compact_size = _retained_memory_size(compact_project_item)
+    assert compact_size * 5 < full_size
+
+
+def _retained_memory_size(kept_project_item) -> int:
+    body_html = "<p>" + "Some description of what has been done. " * 25 + "</p>"
+    tracemalloc.start()
+    try:
+        project_items = [
+            kept_project_item(
+                new_fake_project_item_info(body_html=f"{body_html}{number}", number=number, title=f"Title {number}")
+            )
+            for number in range(1000)
+        ]
+        result, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(project_items) == 1000
+    return result
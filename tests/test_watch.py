@@ -0,0 +1,228 @@
+# Copyright (C) 2024-2025 by Siisurit e.U., Austria.
+# All rights reserved. Distributed under the MIT License.
+from unittest.mock import patch
+
+import pytest
+import requests
+import requests_mock
+
+from check_done.config import ConfigurationInfo
+from check_done.done_project_items_info import ProjectItemFilter
+from check_done.graphql import GRAPHQL_ENDPOINT
+from check_done.info import GithubProjectItemType
+from check_done.watch import ProjectItemsWatcher, watch_done_project_items
+from tests._common import (
+    FAKE_DONE_OPTION_ID,
+    FAKE_IN_PROGRESS_OPTION_ID,
+    new_fake_nodes_response,
+    new_fake_project_item_map,
+    new_fake_project_item_references_response,
+    new_fake_pull_request_map,
+)
+
+
+def test_can_check_warnings_delta():
+    with requests_mock.Mocker() as mock:
+        watcher = ProjectItemsWatcher(requests.Session(), "dummy_owner", "dummy_project_id", FAKE_DONE_OPTION_ID)
+
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_item_references_response(
+                    [
+                        new_fake_project_item_map("a", "t1", number=1),
+                        new_fake_project_item_map("b", "t1", number=2, closed=False),
+                        new_fake_project_item_map("c", "t1", number=3, option_id=FAKE_IN_PROGRESS_OPTION_ID),
+                    ]
+                ),
+                new_fake_nodes_response(
+                    [
+                        new_fake_project_item_map("a", "t1", number=1),
+                        new_fake_project_item_map("b", "t1", number=2, closed=False),
+                    ]
+                ),
+            ],
+        )
+        first_warnings_delta = watcher.checked_warnings_delta()
+        assert _requested_ids(mock) == ["a", "b"]
+        assert len(first_warnings_delta.appeared) == 1
+        assert "#2 " in first_warnings_delta.appeared[0]
+        assert first_warnings_delta.resolved == []
+
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_item_references_response(
+                    [
+                        new_fake_project_item_map("a", "t1", number=1),
+                        new_fake_project_item_map("b", "t2", number=2),
+                        new_fake_project_item_map("c", "t1", number=3, option_id=FAKE_IN_PROGRESS_OPTION_ID),
+                        new_fake_project_item_map("d", "t2", number=4, closed=False),
+                    ]
+                ),
+                new_fake_nodes_response(
+                    [
+                        new_fake_project_item_map("b", "t2", number=2),
+                        new_fake_project_item_map("d", "t2", number=4, closed=False),
+                    ]
+                ),
+            ],
+        )
+        second_warnings_delta = watcher.checked_warnings_delta()
+        assert _requested_ids(mock) == ["b", "d"]
+        assert len(second_warnings_delta.appeared) == 1
+        assert "#4 " in second_warnings_delta.appeared[0]
+        assert second_warnings_delta.resolved == first_warnings_delta.appeared
+
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_item_references_response(
+                    [
+                        new_fake_project_item_map("a", "t1", number=1),
+                        new_fake_project_item_map("b", "t2", number=2),
+                        new_fake_project_item_map("c", "t1", number=3, option_id=FAKE_IN_PROGRESS_OPTION_ID),
+                    ]
+                ),
+            ],
+        )
+        request_count_before_third_check = mock.call_count
+        third_warnings_delta = watcher.checked_warnings_delta()
+        assert mock.call_count == request_count_before_third_check + 1
+        assert third_warnings_delta.appeared == []
+        assert third_warnings_delta.resolved == second_warnings_delta.appeared
+        assert watcher.warnings == []
+
+
+def test_can_resolve_warning_when_project_item_leaves_project_status():
+    with requests_mock.Mocker() as mock:
+        watcher = ProjectItemsWatcher(requests.Session(), "dummy_owner", "dummy_project_id", FAKE_DONE_OPTION_ID)
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_item_references_response([new_fake_project_item_map("a", "t1", closed=False)]),
+                new_fake_nodes_response([new_fake_project_item_map("a", "t1", closed=False)]),
+                new_fake_project_item_references_response(
+                    [new_fake_project_item_map("a", "t2", closed=False, option_id=FAKE_IN_PROGRESS_OPTION_ID)]
+                ),
+            ],
+        )
+        first_warnings_delta = watcher.checked_warnings_delta()
+        second_warnings_delta = watcher.checked_warnings_delta()
+    assert len(first_warnings_delta.appeared) == 1
+    assert second_warnings_delta.resolved == first_warnings_delta.appeared
+    assert mock.call_count == 3
+
+
+def test_can_check_again_when_closing_issue_is_closed():
+    pull_request_map = new_fake_pull_request_map("a", 1, ["issue_id"])
+    with requests_mock.Mocker() as mock:
+        watcher = ProjectItemsWatcher(requests.Session(), "dummy_owner", "dummy_project_id", FAKE_DONE_OPTION_ID)
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_item_references_response([pull_request_map]),
+                new_fake_nodes_response([pull_request_map]),
+                new_fake_nodes_response([{"__typename": "Issue", "id": "issue_id", "closed": False}]),
+                new_fake_project_item_references_response([pull_request_map]),
+                new_fake_nodes_response([{"__typename": "Issue", "id": "issue_id", "closed": True}]),
+                new_fake_nodes_response([pull_request_map]),
+            ],
+        )
+        first_warnings_delta = watcher.checked_warnings_delta()
+        second_warnings_delta = watcher.checked_warnings_delta()
+        assert mock.call_count == 6
+    assert len(first_warnings_delta.appeared) == 1
+    assert "have all closing issues closed" in first_warnings_delta.appeared[0]
+    assert second_warnings_delta == ([], first_warnings_delta.appeared)
+
+
+def test_can_check_again_when_status_checks_change():
+    successful_pull_request_map = new_fake_pull_request_map("a", 1, [])
+    successful_pull_request_map["content"]["statusCheckRollup"] = {"state": "SUCCESS"}
+    failed_pull_request_map = new_fake_pull_request_map("a", 1, [])
+    failed_pull_request_map["content"]["statusCheckRollup"] = {"state": "FAILURE"}
+    with requests_mock.Mocker() as mock:
+        watcher = ProjectItemsWatcher(requests.Session(), "dummy_owner", "dummy_project_id", FAKE_DONE_OPTION_ID)
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_item_references_response([successful_pull_request_map]),
+                new_fake_nodes_response([successful_pull_request_map]),
+                new_fake_project_item_references_response([failed_pull_request_map]),
+                new_fake_nodes_response([failed_pull_request_map]),
+            ],
+        )
+        first_warnings_delta = watcher.checked_warnings_delta()
+        second_warnings_delta = watcher.checked_warnings_delta()
+        assert _requested_ids(mock) == ["a"]
+    assert "have a closing issue reference" in first_warnings_delta.appeared[0]
+    assert len(second_warnings_delta.appeared) == 1
+    assert "have all status checks passed" in second_warnings_delta.appeared[0]
+
+
+def test_can_skip_project_items_of_other_repositories_and_types():
+    included_issue_map = new_fake_project_item_map("a", "t1", number=1, closed=False)
+    excluded_repository_issue_map = new_fake_project_item_map("b", "t1", number=2, closed=False)
+    excluded_repository_issue_map["content"]["repository"]["name"] = "excluded_repository"
+    # NOTE: This reference cannot be validated, so it must be skipped before its model is built.
+    excluded_repository_issue_map["content"]["updatedAt"] = None
+    project_item_filter = ProjectItemFilter(
+        repository_names_to_exclude=["excluded_repository"],
+        project_item_types_to_exclude=[GithubProjectItemType.pull_request],
+    )
+    with requests_mock.Mocker() as mock:
+        watcher = ProjectItemsWatcher(
+            requests.Session(),
+            "dummy_owner",
+            "dummy_project_id",
+            FAKE_DONE_OPTION_ID,
+            project_item_filter=project_item_filter,
+        )
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_item_references_response([included_issue_map, excluded_repository_issue_map]),
+                new_fake_nodes_response([included_issue_map]),
+            ],
+        )
+        warnings_delta = watcher.checked_warnings_delta()
+        request_variables = mock.request_history[0].json()["variables"]
+        assert _requested_ids(mock) == ["a"]
+    assert request_variables["includeIssues"] is True
+    assert request_variables["includePullRequests"] is False
+    assert len(warnings_delta.appeared) == 1
+    assert "#1 " in warnings_delta.appeared[0]
+
+
+def test_can_watch_done_project_items(caplog):
+    configuration_info = ConfigurationInfo(
+        project_url="https://github.com/users/fake-username/projects/1",
+        personal_access_token="fake_personal_token",
+    )
+    with (
+        requests_mock.Mocker() as mock,
+        patch(
+            "check_done.watch.project_id_and_project_status_option_id_to_rule_ids_map",
+            return_value=("dummy_project_id", FAKE_DONE_OPTION_ID),
+        ),
+        patch("check_done.watch.time.sleep", side_effect=[None, KeyboardInterrupt]),
+        pytest.raises(KeyboardInterrupt),
+    ):
+        mock.post(
+            GRAPHQL_ENDPOINT,
+            response_list=[
+                new_fake_project_item_references_response(
+                    [new_fake_project_item_map("a", "t1", number=7, closed=False)]
+                ),
+                new_fake_nodes_response([new_fake_project_item_map("a", "t1", number=7, closed=False)]),
+                {"status_code": 502},
+            ],
+        )
+        watch_done_project_items(configuration_info, 1)
+    assert any("#7 " in message and "be closed" in message for message in caplog.messages)
+    assert any("trying again in the next cycle" in message for message in caplog.messages)
+
+
+def _requested_ids(mock: requests_mock.Mocker) -> list[str]:
+    return mock.request_history[-1].json()["variables"]["ids"]